@@ -6,4 +6,10 @@ from .order import router as order_router
 from .table import router as table_router
 from .payment import router as payment_router
 from .staff_schedule import router as staff_schedule_router
-from .auth import router as auth_router
\ No newline at end of file
+from .auth import router as auth_router
+from .internal import router as internal_router
+from .events import router as events_router
+from .analytics import router as analytics_router
+from .reservation import router as reservation_router
+from .imports import router as imports_router
+from .exports import router as exports_router
\ No newline at end of file
@@ -0,0 +1,59 @@
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from db import get_async_db
+from schemas import SummaryResponse, RevenueRow
+from services import RevenueService
+from services.analytics import analytics_service
+
+router = APIRouter()
+revenue_service = RevenueService()
+
+@router.get("/summary", response_model=SummaryResponse)
+async def get_summary(
+    period: str = "today",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    breakdown: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """
+    Revenue, order, payment and table figures for the admin dashboard.
+    period is today, 7d, 30d or all (since/until override it); repeat
+    `breakdown` for hour, payment_method and/or staff.
+    """
+    try:
+        return await analytics_service.summary(db, period, since, until, breakdown or ())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/revenue", response_model=List[RevenueRow], response_model_exclude_unset=True)
+async def get_revenue(
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    group_by: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """
+    Completed and refunded payment totals for days in [since, until), read
+    from the revenue_daily rollup. Repeat `group_by` for day, hour,
+    payment_method and/or staff (default day).
+    """
+    try:
+        return await revenue_service.revenue(db, since, until, group_by if group_by is not None else ["day"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/revenue/rebuild")
+async def rebuild_revenue(
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Recompute the revenue rollup for [since, until) (everything if omitted) from payments"""
+    try:
+        buckets = await revenue_service.rebuild(db, since, until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"buckets": buckets}
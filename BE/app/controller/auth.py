@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.security import create_access_token
-from db import get_db
+from db import get_async_db
 from schemas import LoginRequestDTO, LoginResponseDTO
 from services import AuthService
 
@@ -11,12 +11,12 @@ auth_service = AuthService()
 
 # auth.py (controller)
 @router.post("/login", response_model=LoginResponseDTO)
-def login(
+async def login(
     data: LoginRequestDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     try:
-        result = auth_service.login(db, data.username, data.password)
+        result = await auth_service.login(db, data.username, data.password)
         return result  # Now returns all required fields
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid credentials")
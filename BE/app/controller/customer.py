@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 
-from db import get_db
+from core.pagination import fetch_page
+from db import get_async_db
 from models import Customer,CustomerRole
-from schemas import CustomerCreateDTO, CustomerResponse, CustomerUpdateDTO
+from schemas import CustomerCreateDTO, CustomerResponse, CustomerUpdateDTO, PageResponse
 from services import CustomerService
 
 
@@ -14,20 +16,23 @@ router = APIRouter()
 # Initialize service
 customer_service = CustomerService()
 # Get all customers
-@router.get("/", response_model=List[CustomerResponse])
+@router.get("/", response_model=Union[List[CustomerResponse], PageResponse[CustomerResponse]])
 async def get_all_customers(
-        skip: int = 0,
-        limit: int = 100,
-        db: Session = Depends(get_db)
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_async_db, scope="function")
 ):
         """Get all customers"""
-        customers = customer_service.get_all(db, skip=skip, limit=limit)
+        if cursor is not None:
+            return await fetch_page(partial(customer_service.get_all, db), cursor, limit)
+        customers = await customer_service.get_all(db, skip=skip, limit=limit)
         return customers
 
 @router.get("/{customer_id}", response_model=CustomerResponse)
-async def get_customer(customer_id: int, db: Session = Depends(get_db)):
+async def get_customer(customer_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
     """Get customer by ID"""
-    customer = customer_service.get_by_id(db, customer_id)
+    customer = await customer_service.get_by_id(db, customer_id)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -38,11 +43,11 @@ async def get_customer(customer_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=CustomerResponse, status_code=status.HTTP_201_CREATED)
 async def create_customer(
     customer_data: CustomerCreateDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Create new customer"""
     try:
-        return customer_service.create(db, customer_data)
+        return await customer_service.create(db, customer_data)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -52,9 +57,9 @@ async def create_customer(
 
 
 @router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_customer(customer_id: int, db: Session = Depends(get_db)):
+async def delete_customer(customer_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
     """Delete customer"""
-    success = customer_service.delete(db, customer_id)
+    success = await customer_service.delete(db, customer_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -66,35 +71,38 @@ async def delete_customer(customer_id: int, db: Session = Depends(get_db)):
 async def update_customer(
     customer_id: int,
     customer_data: CustomerUpdateDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Update customer"""
-    customer = customer_service.get_by_id(db, customer_id)
-    if not customer:
+    try:
+        updated_customer = await customer_service.update(db, customer_id, customer_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if not updated_customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="customer not found"
         )
-    # Update fields
-
-    updated_customer = customer_service.update(db, customer_id, customer_data)
     return updated_customer
 
 @router.patch("/{customer_id}/role", response_model=CustomerResponse)
 async def update_customer_role(
     customer_id: int,
     new_role: CustomerRole,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Update customer role"""
-    customer = customer_service.get_by_id(db, customer_id)
+    customer = await customer_service.get_by_id(db, customer_id)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Customer not found"
         )
     try:
-        updated_customer = customer_service.update_customer_role(db, customer_id, new_role)
+        updated_customer = await customer_service.update_customer_role(db, customer_id, new_role)
         return updated_customer
     except ValueError as e:
         raise HTTPException(
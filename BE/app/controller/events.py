@@ -0,0 +1,47 @@
+import json
+from typing import List
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from core import config
+from core.events import event_bus
+
+router = APIRouter()
+
+HEARTBEAT = {"type": "ping"}
+
+# Server-sent events
+@router.get("/stream")
+async def stream_events(topic: List[str] = Query(..., description="kitchen, tables, table:<id> or customer:<id>")):
+    """Push order, payment and table changes for the given topics as they happen"""
+    async def events():
+        subscription = event_bus.subscribe(topic)
+        try:
+            while True:
+                event = await subscription.next(config.EVENT_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {json.dumps(event)}\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# WebSocket
+@router.websocket("/ws")
+async def event_socket(websocket: WebSocket, topic: List[str] = Query(...)):
+    """Same events as /stream over a WebSocket; a ping is sent while idle"""
+    await websocket.accept()
+    subscription = event_bus.subscribe(topic)
+    try:
+        while True:
+            event = await subscription.next(config.EVENT_HEARTBEAT_SECONDS)
+            await websocket.send_json(event or HEARTBEAT)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        event_bus.unsubscribe(subscription)
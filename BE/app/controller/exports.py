@@ -0,0 +1,56 @@
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from services import ExportService
+from services.exports import MEDIA_TYPES
+
+router = APIRouter()
+export_service = ExportService()
+
+def _export(name: str, since: Optional[datetime], until: Optional[datetime], fmt: str, compress: bool) -> StreamingResponse:
+    try:
+        stmt = export_service.query(name, fmt, since, until)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    headers = {"Content-Disposition": f'attachment; filename="{name}.{fmt}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_service.stream(stmt, fmt, compress),
+        media_type=MEDIA_TYPES[fmt],
+        headers=headers
+    )
+
+@router.get("/orders")
+async def export_orders(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    format: str = "csv",
+    compress: bool = Query(False, alias="gzip")
+):
+    """Orders placed in [since, until), oldest first, as CSV or NDJSON; gzip=true compresses the stream"""
+    return _export("orders", since, until, format, compress)
+
+@router.get("/order-items")
+async def export_order_items(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    format: str = "csv",
+    compress: bool = Query(False, alias="gzip")
+):
+    """Lines of the orders placed in [since, until), with item names and the order date"""
+    return _export("order_items", since, until, format, compress)
+
+@router.get("/payments")
+async def export_payments(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    format: str = "csv",
+    compress: bool = Query(False, alias="gzip")
+):
+    """Payments made in [since, until), oldest first"""
+    return _export("payments", since, until, format, compress)
@@ -0,0 +1,39 @@
+import io
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from typing import Optional
+from schemas import ImportResponse
+from services import BulkImportService
+from services.bulk_import import detect_format
+
+router = APIRouter()
+import_service = BulkImportService()
+
+@router.post("/{kind}", response_model=ImportResponse)
+async def import_rows(
+    kind: str,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or ndjson; taken from the file name when omitted"),
+    skip_invalid: bool = False
+):
+    """
+    Bulk-load menu_items, tables, staff or customers from a CSV (with a
+    header row) or NDJSON upload. Rows are validated like the single-row
+    POST; with any invalid row nothing is loaded and the report comes back
+    as a 400, unless skip_invalid is set. Existing usernames, emails and
+    table numbers are skipped, not updated. Staff and customer uploads are
+    capped at IMPORT_API_MAX_HASHED_ROWS rows (password hashing); 503 while
+    another import is running.
+    """
+    fmt = format or detect_format(file.filename)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="Cannot tell the file format, pass format=csv or format=ndjson")
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        result = await import_service.load(kind, stream, fmt, skip_invalid)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        stream.detach()
+    if result["invalid"] and not skip_invalid:
+        raise HTTPException(status_code=400, detail=result)
+    return result
@@ -0,0 +1,63 @@
+from fastapi import APIRouter
+from core import config
+from core.cache_sync import stats as cache_sync_stats
+from core.dependencies import token_cache
+from core.etag import collection_versions
+from core.events import event_bus
+from core.pool_metrics import pool_status
+from services.analytics import analytics_service
+from services.menu_catalog import menu_catalog
+from services.table_index import table_index
+from db import async_engine
+
+router = APIRouter()
+
+@router.get("/pool")
+async def get_pool_status():
+    """Connection pool occupancy, checkout wait times and churn for this worker"""
+    return {
+        "settings": {
+            "pool_size": config.DB_POOL_SIZE,
+            "max_overflow": config.DB_MAX_OVERFLOW,
+            "pool_timeout": config.DB_POOL_TIMEOUT,
+            "pool_pre_ping": config.DB_POOL_PRE_PING,
+            "pool_recycle": config.DB_POOL_RECYCLE,
+            "statement_timeout_ms": config.DB_STATEMENT_TIMEOUT_MS,
+        },
+        "pool": pool_status(async_engine),
+    }
+
+@router.get("/token-cache")
+async def get_token_cache_stats():
+    """Hit/miss/eviction counters of the verified-token cache for this worker"""
+    return token_cache.stats()
+
+@router.get("/events")
+async def get_event_stats():
+    """Open event streams and delivery/overflow counters for this worker"""
+    return event_bus.stats()
+
+@router.get("/etags")
+async def get_etag_stats():
+    """Collection versions and conditional-GET hit ratios for this worker"""
+    return collection_versions.stats()
+
+@router.get("/menu-catalog")
+async def get_menu_catalog_stats():
+    """Version and size of the in-memory menu catalog for this worker"""
+    return menu_catalog.stats()
+
+@router.get("/cache-sync")
+async def get_cache_sync_stats():
+    """State of this worker's LISTEN/NOTIFY cache invalidation listener"""
+    return cache_sync_stats
+
+@router.get("/analytics")
+async def get_analytics_cache_stats():
+    """Cached dashboard summaries and hit/miss counters for this worker"""
+    return analytics_service.stats()
+
+@router.get("/table-index")
+async def get_table_index_stats():
+    """Size, free count and reload counters of the table occupancy index for this worker"""
+    return table_index.stats()
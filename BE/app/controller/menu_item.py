@@ -1,48 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from db import get_db
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from core.etag import collection_versions
+from core.pagination import fetch_page
+from db import get_async_db
 from models import MenuItem,item_type
-from schemas import MenuItemCreateDTO, MenuItemResponse, MenuItemUpdateDTO
-from services import MenuItemService
+from schemas import MenuItemCreateDTO, MenuItemResponse, MenuItemUpdateDTO, PageResponse, ChangesResponse
+from services import MenuItemService, ChangeService
+from services.changes import ChangeTokenExpired
 
 router = APIRouter()
 # Initialize service
 menu_item_service = MenuItemService()
-@router.get("/", response_model=List[MenuItemResponse])
+change_service = ChangeService()
+@router.get("/", response_model=Union[List[MenuItemResponse], PageResponse[MenuItemResponse]])
 async def get_all_menu_items(
-        skip: int = 0,
-        limit: int = 100,
-        db: Session = Depends(get_db)
+        request: Request,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Get all menu items"""
-    menu_items = menu_item_service.get_all(db, skip=skip, limit=limit)
-    return menu_items
+    not_modified = collection_versions.check("menu_items", request, response)
+    if not_modified:
+        return not_modified
+    if cursor is not None:
+        return await fetch_page(partial(menu_item_service.get_all, db), cursor, limit)
+    # pre-serialized from the menu catalog; a returned Response doesn't pick up
+    # the ETag set on `response`, so carry it over
+    body = await menu_item_service.render_all(db, skip=skip, limit=limit)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": response.headers["etag"], "Cache-Control": response.headers["cache-control"]}
+    )
+
+@router.get("/available", response_model=List[MenuItemResponse])
+async def get_available_menu_items(
+        request: Request,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Menu items customers can order now (is_available)"""
+    not_modified = collection_versions.check("menu_items", request, response)
+    if not_modified:
+        return not_modified
+    body = await menu_item_service.render_available(db, skip=skip, limit=limit)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": response.headers["etag"], "Cache-Control": response.headers["cache-control"]}
+    )
+
+# Delta sync
+@router.get("/changes", response_model=ChangesResponse[MenuItemResponse])
+async def get_menu_items_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Menu items written or deleted since `since` (omit it for a full sync); pass back next_token"""
+    try:
+        return await change_service.changes(db, MenuItem, since, limit)
+    except ChangeTokenExpired as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 # Get menu items by item_type
 @router.get("/{item_type}", response_model=List[MenuItemResponse])
-async def get_menu_item_by_type(item_type: item_type, db: Session = Depends(get_db)):
+async def get_menu_item_by_type(item_type: item_type, db: AsyncSession = Depends(get_async_db, scope="function")):
     """Get menu item by type"""
-    menu_item = menu_item_service.get_all_by_type(db, item_type)
-    if not menu_item:
+    body = await menu_item_service.render_by_type(db, item_type)
+    if not body:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Menu item not found"
         )
-    return menu_item
+    return Response(content=body, media_type="application/json")
 
 @router.post("/", response_model=MenuItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_menu_item(   
     item_data: MenuItemCreateDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Create new menu item"""
-    return menu_item_service.create(db, item_data)
+    return await menu_item_service.create(db, item_data)
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_menu_item(item_id: int, db: Session = Depends(get_db)):
+async def delete_menu_item(item_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
     """Delete menu item"""
-    success = menu_item_service.delete(db, item_id)
+    success = await menu_item_service.delete(db, item_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -54,10 +107,10 @@ async def delete_menu_item(item_id: int, db: Session = Depends(get_db)):
 async def update_menu_item(
     item_id: int,
     item_data: MenuItemUpdateDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Update menu item"""
-    updated_item = menu_item_service.update(db, item_id, item_data)
+    updated_item = await menu_item_service.update(db, item_id, item_data)
     if not updated_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,34 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from db import get_db
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional, Union
+from core.pagination import fetch_page
+from db import get_async_db
 from models import Order, OrderStatus, PaymentMethod
-from schemas import OrderCreateDTO, OrderResponseDTO, OrderUpdateDTO
-from services import OrderService
+from schemas import OrderCreateDTO, OrderResponseDTO, OrderUpdateDTO, OrderWithItemsCreateDTO, OrderWithItemsResponseDTO, OrderItemBatchCreateDTO, PageResponse, ChangesResponse
+from services import OrderService, ChangeService
+from services.changes import ChangeTokenExpired
 
 router = APIRouter()
 
 # Initialize service
 order_service = OrderService()
+change_service = ChangeService()
 # Get all orders
-@router.get("/", response_model=List[OrderResponseDTO])
+@router.get("/", response_model=Union[List[OrderResponseDTO], PageResponse[OrderResponseDTO]])
 async def get_all_orders(
-        skip: int = 0,
-        limit: int = 100,
-        db: Session = Depends(get_db)
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_async_db, scope="function")
 ):
         """Get all orders"""
-        orders = order_service.get_all(db, skip=skip, limit=limit)
+        if cursor is not None:
+            return await fetch_page(partial(order_service.get_all, db), cursor, limit)
+        orders = await order_service.get_all(db, skip=skip, limit=limit)
         return orders
 
+# Delta sync
+@router.get("/changes", response_model=ChangesResponse[OrderResponseDTO])
+async def get_orders_changes(
+        since: Optional[str] = None,
+        limit: int = Query(500, ge=1, le=5000),
+        db: AsyncSession = Depends(get_async_db, scope="function")
+):
+        """Orders written or deleted since `since` (omit it for a full sync); pass back next_token"""
+        try:
+            return await change_service.changes(db, Order, since, limit)
+        except ChangeTokenExpired as e:
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+# Filter orders on the server
+@router.get("/query", response_model=List[OrderResponseDTO])
+async def query_orders(
+        status: Optional[List[OrderStatus]] = Query(None),
+        customer_id: Optional[int] = None,
+        table_id: Optional[int] = None,
+        staff_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = Query(100, ge=1, le=500),
+        db: AsyncSession = Depends(get_async_db, scope="function")
+):
+        """Newest orders matching all given filters; repeat `status` to match several"""
+        try:
+            return await order_service.query(db, status, customer_id, table_id, staff_id, since, until, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
 # Get order by ID
 @router.get("/{order_id}", response_model=OrderResponseDTO)
 async def get_order_by_id(
         order_id: int,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db, scope="function")
 ):
         """Get order by ID"""
-        order = order_service.get_by_id(db, order_id)
+        order = await order_service.get_by_id(db, order_id)
         if not order:
             raise HTTPException(status_code=404, detail="Order not found")
         return order
@@ -37,21 +78,64 @@ async def get_order_by_id(
 @router.post("/", response_model=OrderResponseDTO, status_code=201)
 async def create_order(
     order_data: OrderCreateDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Create a new order"""
-    order = order_service.create(db, order_data)
+    order = await order_service.create(db, order_data)
     return order
 
+def _with_items(order: Order, items: List[dict]) -> OrderWithItemsResponseDTO:
+    # built explicitly: validating the ORM object would lazy-load Order.items
+    return OrderWithItemsResponseDTO(
+        **OrderResponseDTO.model_validate(order).model_dump(),
+        items=items
+    )
+
+# Create order together with its items
+@router.post("/with-items", response_model=OrderWithItemsResponseDTO, status_code=201)
+async def create_order_with_items(
+    order_data: OrderWithItemsCreateDTO,
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Create an order and all of its items in one request"""
+    try:
+        order, items = await order_service.create_with_items(db, order_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _with_items(order, items)
+
+# Add a batch of items to an order
+@router.post("/{order_id}/items:batch", response_model=OrderWithItemsResponseDTO)
+async def add_order_items_batch(
+    order_id: int,
+    batch: OrderItemBatchCreateDTO,
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Add several items to an existing order; returns the order and the saved lines"""
+    try:
+        result = await order_service.add_items(db, order_id, batch.items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not result:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return _with_items(*result)
+
+# Repair drifted order totals
+@router.post("/reconcile-totals")
+async def reconcile_order_totals(db: AsyncSession = Depends(get_async_db, scope="function")):
+    """Recount totals of orders that no longer match their items"""
+    repaired = await order_service.reconcile_totals(db)
+    return {"repaired": len(repaired), "order_ids": repaired}
+
 # Update order
 @router.put("/{order_id}", response_model=OrderResponseDTO)
 async def update_order(
     order_id: int,
     order_data: OrderUpdateDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Update an existing order"""
-    order = order_service.update(db, order_id, order_data)
+    order = await order_service.update(db, order_id, order_data)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
@@ -60,10 +144,10 @@ async def update_order(
 @router.delete("/{order_id}", status_code=204)
 async def delete_order(
     order_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Delete an order"""
-    success = order_service.delete(db, order_id)
+    success = await order_service.delete(db, order_id)
     if not success:
         raise HTTPException(status_code=404, detail="Order not found")
     return None
@@ -72,18 +156,18 @@ async def delete_order(
 @router.get("/customer/{customer_id}", response_model=List[OrderResponseDTO])
 async def get_orders_by_customer_id(
         customer_id: int,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db, scope="function")
 ):
         """Get orders by customer ID"""
-        orders = order_service.find_by_customer_id(db, customer_id)
+        orders = await order_service.find_by_customer_id(db, customer_id)
         return orders
 
 
 @router.get("/status/{status}", response_model=List[OrderResponseDTO])
 async def get_orders_by_status(
         status: OrderStatus,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db, scope="function")
 ):
         """Get orders by status"""
-        orders = order_service.find_by_status(db, status)
+        orders = await order_service.find_by_status(db, status)
         return orders
\ No newline at end of file
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from db import get_db
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from core.pagination import fetch_page
+from db import get_async_db
 from models import OrderItem
-from schemas import OrderItemCreateDTO, OrderItemResponse, OrderItemUpdateDTO
+from schemas import OrderItemCreateDTO, OrderItemResponse, OrderItemUpdateDTO, PageResponse
 from services import OrderItemService
 
 router = APIRouter()
@@ -11,33 +13,36 @@ router = APIRouter()
 order_item_service = OrderItemService()
 
 #get all order items
-@router.get("/", response_model=List[OrderItemResponse])
+@router.get("/", response_model=Union[List[OrderItemResponse], PageResponse[OrderItemResponse]])
 async def get_all_order_items(
-        skip: int = 0,
-        limit: int = 100,
-        db: Session = Depends(get_db)
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_async_db, scope="function")
 ):
         """Get all order items"""
-        order_items = order_item_service.get_all(db, skip=skip, limit=limit)
+        if cursor is not None:
+            return await fetch_page(partial(order_item_service.get_all, db), cursor, limit)
+        order_items = await order_item_service.get_all(db, skip=skip, limit=limit)
         return order_items
 
 #get all order items by order id
 @router.get("/order/{order_id}", response_model=List[OrderItemResponse])
 async def get_order_items_by_order_id(
         order_id: int,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db, scope="function")
 ):
         """Get all order items by order id"""
-        order_items = order_item_service.find_by_order_id(db, order_id)
+        order_items = await order_item_service.find_by_order_id(db, order_id)
         return order_items
 
 #create order item
 @router.post("/", response_model=OrderItemResponse, status_code=201)
 async def create_order_item(
         order_item_data: OrderItemCreateDTO,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db, scope="function")
 ):
-        return order_item_service.create(db, order_item_data)
+        return await order_item_service.create(db, order_item_data)
     
 
 
@@ -1,30 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from db import get_db
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from core.pagination import fetch_page
+from db import get_async_db
 from models import Payment, PaymentStatus,PaymentMethod
-from schemas import PaymentCreateDTO, PaymentResponse
-from services import PaymentService
+from schemas import PaymentCreateDTO, PaymentResponse, PageResponse, ChangesResponse
+from services import PaymentService, ChangeService
+from services.changes import ChangeTokenExpired
 
 
 router = APIRouter()
 # Initialize service
 payment_service = PaymentService()
+change_service = ChangeService()
 
-@router.get("/", response_model=list[PaymentResponse])
+@router.get("/", response_model=Union[List[PaymentResponse], PageResponse[PaymentResponse]])
 async def get_all_payments(
-    skip:int = 0,
-    limit:int = 100,
-    db: Session = Depends(get_db)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db, scope="function")
 
 ):
     """Get all payments"""
-    payments = payment_service.get_all(db, skip=skip, limit=limit)
+    if cursor is not None:
+        return await fetch_page(partial(payment_service.get_all, db), cursor, limit)
+    payments = await payment_service.get_all(db, skip=skip, limit=limit)
     return payments
 
+# Delta sync
+@router.get("/changes", response_model=ChangesResponse[PaymentResponse])
+async def get_payments_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Payments written or deleted since `since` (omit it for a full sync); pass back next_token"""
+    try:
+        return await change_service.changes(db, Payment, since, limit)
+    except ChangeTokenExpired as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{payment_id}", response_model=PaymentResponse)
-async def get_payment(payment_id : int , db: Session = Depends(get_db)):
+async def get_payment(payment_id : int , db: AsyncSession = Depends(get_async_db, scope="function")):
     """Get payment by ID"""
-    payment = payment_service.get_by_id(db, payment_id)
+    payment = await payment_service.get_by_id(db, payment_id)
     if not payment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -35,11 +58,11 @@ async def get_payment(payment_id : int , db: Session = Depends(get_db)):
 @router.post("/", response_model=PaymentResponse, status_code=status.HTTP_201_CREATED)
 async def create_payment(
     payment_data: PaymentCreateDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Create new payment"""
     try:
-        return payment_service.create(db, payment_data)
+        return await payment_service.create(db, payment_data)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -50,10 +73,10 @@ async def create_payment(
 async def update_payment_status(
     payment_id: int,
     payment_status: PaymentStatus,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Update payment status"""
-    payment = payment_service.update_payment_status(db, payment_id,payment_status)
+    payment = await payment_service.update_payment_status(db, payment_id,payment_status)
     if not payment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -65,10 +88,10 @@ async def update_payment_status(
 async def update_payment_method(
     payment_id: int,
     payment_method: PaymentMethod,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Update payment method"""
-    payment = payment_service.update_payment_method(db, payment_id, payment_method)
+    payment = await payment_service.update_payment_method(db, payment_id, payment_method)
     if not payment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -79,8 +102,8 @@ async def update_payment_method(
 @router.get("/order/{order_id}", response_model=list[PaymentResponse])
 async def get_payments_by_order_id(
     order_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Get payments by order ID"""
-    payments = payment_service.get_by_order_id(db, order_id)
+    payments = await payment_service.get_by_order_id(db, order_id)
     return payments
\ No newline at end of file
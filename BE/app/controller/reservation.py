@@ -0,0 +1,107 @@
+from datetime import date, datetime
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from core.pagination import fetch_page
+from db import get_async_db
+from schemas import ReservationCreateDTO, ReservationUpdateDTO, ReservationResponse, TableResponse, PageResponse
+from services import ReservationService
+
+
+router = APIRouter()
+# Initialize service
+reservation_service = ReservationService()
+
+@router.get("/", response_model=Union[List[ReservationResponse], PageResponse[ReservationResponse]])
+async def get_all_reservations(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Get all reservations"""
+    if cursor is not None:
+        return await fetch_page(partial(reservation_service.get_all, db), cursor, limit)
+    return await reservation_service.get_all(db, skip=skip, limit=limit)
+
+# Free tables for a time slot
+@router.get("/availability", response_model=List[TableResponse])
+async def get_availability(
+    start: datetime,
+    duration: int = Query(2, ge=1, le=12),
+    guests: int = Query(..., ge=1),
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Tables seating `guests` with no pending/confirmed reservation during [start, start + duration hours), smallest first"""
+    try:
+        return await reservation_service.find_available_tables(db, start, duration, guests)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/date/{day}", response_model=List[ReservationResponse])
+async def get_reservations_by_date(day: date, db: AsyncSession = Depends(get_async_db, scope="function")):
+    """Reservations overlapping the given day"""
+    return await reservation_service.find_by_date(db, day)
+
+@router.get("/customer/{customer_id}", response_model=List[ReservationResponse])
+async def get_reservations_by_customer(customer_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
+    """Get reservations of a customer"""
+    return await reservation_service.find_by_customer_id(db, customer_id)
+
+@router.get("/{reservation_id}", response_model=ReservationResponse)
+async def get_reservation(reservation_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
+    """Get reservation by ID"""
+    reservation = await reservation_service.get_by_id(db, reservation_id)
+    if not reservation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reservation not found"
+        )
+    return reservation
+
+@router.post("/", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
+async def create_reservation(
+    reservation_data: ReservationCreateDTO,
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Create new reservation; 400 when the table is already reserved for an overlapping slot"""
+    try:
+        return await reservation_service.create(db, reservation_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.put("/{reservation_id}", response_model=ReservationResponse)
+async def update_reservation(
+    reservation_id: int,
+    reservation_data: ReservationUpdateDTO,
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Update reservation"""
+    try:
+        reservation = await reservation_service.update(db, reservation_id, reservation_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if not reservation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reservation not found"
+        )
+    return reservation
+
+@router.delete("/{reservation_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_reservation(reservation_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
+    """Delete reservation"""
+    success = await reservation_service.delete(db, reservation_id)
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reservation not found"
+        )
+    return None
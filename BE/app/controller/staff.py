@@ -1,29 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from db import get_db
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from core.etag import collection_versions
+from core.pagination import fetch_page
+from db import get_async_db
 from models import Staff
-from schemas import StaffCreateDTO, StaffResponse, StaffUpdateDTO
+from schemas import StaffCreateDTO, StaffResponse, StaffUpdateDTO, PageResponse
 from services import StaffService
 
 router = APIRouter()
 # Initialize service
 staff_service = StaffService()
 
-@router.get("/", response_model=List[StaffResponse])
+@router.get("/", response_model=Union[List[StaffResponse], PageResponse[StaffResponse]])
 async def get_all_staff(
-        skip: int = 0,
-        limit: int = 100,
-        db: Session = Depends(get_db)
+        request: Request,
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Get all staff members"""
-    staff_members = staff_service.get_all(db, skip=skip, limit=limit)
+    not_modified = collection_versions.check("staff", request, response)
+    if not_modified:
+        return not_modified
+    if cursor is not None:
+        return await fetch_page(partial(staff_service.get_all, db), cursor, limit)
+    staff_members = await staff_service.get_all(db, skip=skip, limit=limit)
     return staff_members
 
 @router.get("/{staff_id}", response_model=StaffResponse)
-async def get_staff(staff_id: int, db: Session = Depends(get_db)):
+async def get_staff(staff_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
     """Get staff member by ID"""
-    staff = staff_service.get_by_id(db, staff_id)
+    staff = await staff_service.get_by_id(db, staff_id)
     if not staff:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -34,11 +45,11 @@ async def get_staff(staff_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=StaffResponse, status_code=status.HTTP_201_CREATED)
 async def create_staff(   
     staff_data: StaffCreateDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Create new staff member"""
     try:
-        return staff_service.create(db, staff_data)
+        return await staff_service.create(db, staff_data)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -46,9 +57,9 @@ async def create_staff(
         )
     
 @router.delete("/{staff_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_staff(staff_id: int, db: Session = Depends(get_db)):
+async def delete_staff(staff_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
     """Delete staff member"""
-    success = staff_service.delete(db, staff_id)
+    success = await staff_service.delete(db, staff_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -60,16 +71,20 @@ async def delete_staff(staff_id: int, db: Session = Depends(get_db)):
 async def update_staff(
     staff_id: int,
     staff_data: StaffUpdateDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Update staff member"""
-    staff = staff_service.get_by_id(db, staff_id)
+    staff = await staff_service.get_by_id(db, staff_id)
     if not staff:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Staff member not found"
         )
     # Update fields
-
-    updated_staff = staff_service.update(db, staff_id, staff_data)
-    return updated_staff
\ No newline at end of file
+    try:
+        return await staff_service.update(db, staff_id, staff_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
\ No newline at end of file
@@ -1,73 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 from services import StaffScheduleService
-from schemas import StaffScheduleCreateDTO, StaffScheduleUpdateDTO, StaffScheduleResponse
-from db import get_db
-from models import StaffSchedule, workDay, workShift
+from schemas import StaffScheduleCreateDTO, StaffScheduleUpdateDTO, StaffScheduleResponse, PageResponse, CoverageCell, StaffScheduleBulkDTO, StaffScheduleWeekDTO, StaffScheduleBulkResponse, StaffScheduleWeekResponse
+from core.etag import collection_versions
+from core.pagination import fetch_page
+from db import get_async_db
+from models import StaffSchedule, StaffRole, workDay, workShift
 from services import StaffScheduleService
 
 router = APIRouter()
 service = StaffScheduleService()
 
-@router.get("/", response_model=List[StaffScheduleResponse])
-async def get_all_schedules(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    schedules = service.get_all(db, skip, limit)
+@router.get("/", response_model=Union[List[StaffScheduleResponse], PageResponse[StaffScheduleResponse]])
+async def get_all_schedules(request: Request, response: Response, skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000), cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db, scope="function")):
+    not_modified = collection_versions.check("staff_schedules", request, response)
+    if not_modified:
+        return not_modified
+    if cursor is not None:
+        return await fetch_page(partial(service.get_all, db), cursor, limit)
+    schedules = await service.get_all(db, skip, limit)
     return schedules
 
+@router.get("/matrix", response_model=List[CoverageCell])
+async def get_coverage_matrix(
+    role: Optional[StaffRole] = None,
+    min_staff: int = Query(1, ge=0),
+    understaffed_only: bool = False,
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Week coverage grid (7 days x 4 shifts) with the staff in each cell; role/min_staff flag understaffed cells"""
+    return await service.coverage_matrix(db, role, min_staff, understaffed_only)
+
 @router.get("/{schedule_id}", response_model=StaffScheduleResponse)
-async def get_schedule_by_id(schedule_id: int, db: Session = Depends(get_db)):
-    schedule = service.get_by_id(db, schedule_id)
+async def get_schedule_by_id(schedule_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
+    schedule = await service.get_by_id(db, schedule_id)
     if not schedule:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
     return schedule
 
 @router.post("/", response_model=StaffScheduleResponse, status_code=status.HTTP_201_CREATED)
-async def create_schedule(schedule_data: StaffScheduleCreateDTO, db: Session = Depends(get_db)):
-    schedule = service.create(db, schedule_data)
+async def create_schedule(schedule_data: StaffScheduleCreateDTO, db: AsyncSession = Depends(get_async_db, scope="function")):
+    schedule = await service.create(db, schedule_data)
     return schedule
 
+@router.post("/bulk", response_model=StaffScheduleBulkResponse)
+async def create_schedules_bulk(data: StaffScheduleBulkDTO, db: AsyncSession = Depends(get_async_db, scope="function")):
+    """Add many assignments at once; existing ones are skipped and each entry reports its outcome"""
+    return await service.bulk_create(db, data.entries)
+
+@router.put("/week", response_model=StaffScheduleWeekResponse)
+async def replace_week_schedule(data: StaffScheduleWeekDTO, db: AsyncSession = Depends(get_async_db, scope="function")):
+    """Replace the weekly rota (or only that of staff_ids) with entries, in one transaction"""
+    return await service.replace_week(db, data.entries, data.staff_ids)
+
 @router.put("/{schedule_id}", response_model=StaffScheduleResponse)
-async def update_schedule(schedule_id: int, updated_schedule: StaffScheduleUpdateDTO, db: Session = Depends(get_db)):
-    schedule = service.update_by_id(db, schedule_id, updated_schedule)
+async def update_schedule(schedule_id: int, updated_schedule: StaffScheduleUpdateDTO, db: AsyncSession = Depends(get_async_db, scope="function")):
+    schedule = await service.update_by_id(db, schedule_id, updated_schedule)
     if not schedule:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
     return schedule
 
 @router.delete("/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_schedule(schedule_id: int, db: Session = Depends(get_db)):
-    success = service.delete(db, schedule_id)
+async def delete_schedule(schedule_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
+    success = await service.delete(db, schedule_id)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
     return
 
 @router.get("/staff/{staff_id}", response_model=List[StaffScheduleResponse])
-async def get_schedules_by_staff_id(staff_id: int, db: Session = Depends(get_db)):
-    schedules = service.find_by_staff_id(db, staff_id)
+async def get_schedules_by_staff_id(staff_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
+    schedules = await service.find_by_staff_id(db, staff_id)
     return schedules
 
 @router.get("/day/{work_day}/shift/{work_shift}", response_model=List[StaffScheduleResponse])
-async def get_schedules_by_day_and_shift(work_day: workDay, work_shift: workShift, db: Session = Depends(get_db)):
-    schedules = service.find_by_day_and_shift(db, work_day, work_shift)
+async def get_schedules_by_day_and_shift(work_day: workDay, work_shift: workShift, db: AsyncSession = Depends(get_async_db, scope="function")):
+    schedules = await service.find_by_day_and_shift(db, work_day, work_shift)
     return schedules
 
 @router.get("/day/{work_day}", response_model=List[StaffScheduleResponse])
-async def get_schedules_by_day(work_day: workDay, db: Session = Depends(get_db)):
-    schedules = service.find_by_day(db, work_day)
+async def get_schedules_by_day(work_day: workDay, db: AsyncSession = Depends(get_async_db, scope="function")):
+    schedules = await service.find_by_day(db, work_day)
     return schedules
 
 @router.get("/shift/{work_shift}", response_model=List[StaffScheduleResponse])
-async def get_schedules_by_shift(work_shift: workShift, db: Session = Depends(get_db)):
-    schedules = service.find_by_shift(db, work_shift)
+async def get_schedules_by_shift(work_shift: workShift, db: AsyncSession = Depends(get_async_db, scope="function")):
+    schedules = await service.find_by_shift(db, work_shift)
     return schedules
 
 @router.get("/staff/{staff_id}/day/{work_day}", response_model=List[StaffScheduleResponse])
-async def get_schedules_by_staff_and_day(staff_id: int, work_day: workDay, db: Session = Depends(get_db)):
-    schedules = service.find_by_staff_and_day(db, staff_id, work_day)
+async def get_schedules_by_staff_and_day(staff_id: int, work_day: workDay, db: AsyncSession = Depends(get_async_db, scope="function")):
+    schedules = await service.find_by_staff_and_day(db, staff_id, work_day)
     return schedules
 
 @router.get("/staff/{staff_id}/shift/{work_shift}", response_model=List[StaffScheduleResponse])
-async def get_schedules_by_staff_and_shift(staff_id: int, work_shift: workShift, db: Session = Depends(get_db)):
-    schedules = service.find_by_staff_and_shift(db, staff_id, work_shift)
+async def get_schedules_by_staff_and_shift(staff_id: int, work_shift: workShift, db: AsyncSession = Depends(get_async_db, scope="function")):
+    schedules = await service.find_by_staff_and_shift(db, staff_id, work_shift)
     return schedules
 
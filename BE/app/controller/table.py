@@ -1,30 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from db import get_db
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from core.etag import collection_versions
+from core.pagination import fetch_page
+from db import get_async_db
 from models import Table
-from schemas import TableCreateDTO, TableUpdateDTO, TableResponse, TableStatusUpdateDTO
-from services import TableService
+from schemas import TableCreateDTO, TableUpdateDTO, TableResponse, TableStatusUpdateDTO, PageResponse, ChangesResponse
+from services import TableService, ChangeService
+from services.changes import ChangeTokenExpired
 
 
 router = APIRouter()
 # Initialize service
 table_service = TableService()
+change_service = ChangeService()
 
-@router.get("/", response_model=list[TableResponse])
+@router.get("/", response_model=Union[List[TableResponse], PageResponse[TableResponse]])
 async def get_all_tables(
-    skip:int = 0,
-    limit:int = 100,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Get all tables"""
-    tables = table_service.get_all(db, skip=skip, limit=limit)
+    not_modified = collection_versions.check("tables", request, response)
+    if not_modified:
+        return not_modified
+    if cursor is not None:
+        return await fetch_page(partial(table_service.get_all, db), cursor, limit)
+    tables = await table_service.get_all(db, skip=skip, limit=limit)
     return tables
 
 
+# Delta sync
+@router.get("/changes", response_model=ChangesResponse[TableResponse])
+async def get_tables_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Tables written or deleted since `since` (omit it for a full sync); pass back next_token"""
+    try:
+        return await change_service.changes(db, Table, since, limit)
+    except ChangeTokenExpired as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{table_id}", response_model=TableResponse)
-async def get_table(table_id : int , db: Session = Depends(get_db)):
+async def get_table(table_id : int , db: AsyncSession = Depends(get_async_db, scope="function")):
     """Get table by ID"""
-    table = table_service.get_by_id(db, table_id)
+    table = await table_service.get_by_id(db, table_id)
     if not table:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -35,11 +64,11 @@ async def get_table(table_id : int , db: Session = Depends(get_db)):
 @router.post("/", response_model=TableResponse, status_code=status.HTTP_201_CREATED)
 async def create_table(
     table_data: TableCreateDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Create new table"""
     try:
-        return table_service.create(db, table_data)
+        return await table_service.create(db, table_data)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -50,10 +79,10 @@ async def create_table(
 async def update_table(
     table_id: int,
     table_data: TableUpdateDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Update table"""
-    table = table_service.update(db, table_id,  table_data)
+    table = await table_service.update(db, table_id,  table_data)
     if not table:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,9 +91,9 @@ async def update_table(
     return table
 
 @router.delete("/{table_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_table(table_id: int, db: Session = Depends(get_db)):
+async def delete_table(table_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
     """Delete table"""
-    success = table_service.delete(db, table_id)
+    success = await table_service.delete(db, table_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -73,21 +102,35 @@ async def delete_table(table_id: int, db: Session = Depends(get_db)):
     return None
 
 @router.get("/available/", response_model=list[TableResponse])
-async def get_available_tables(db: Session = Depends(get_db)):
-    """Get all available (not occupied) tables"""
-    tables = table_service.get_available_tables(db)
+async def get_available_tables(
+    min_size: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_async_db, scope="function")
+):
+    """Get all available (not occupied) tables, smallest first; min_size keeps those seating at least that many"""
+    tables = await table_service.get_available_tables(db, min_size)
     return tables
 
+@router.get("/available/best-fit/{party_size}", response_model=TableResponse)
+async def get_best_fit_table(party_size: int, db: AsyncSession = Depends(get_async_db, scope="function")):
+    """Smallest available table that seats party_size"""
+    table = await table_service.find_best_fit(db, party_size)
+    if not table:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No available table seats {party_size}"
+        )
+    return table
+
 @router.get("/available/size/{size}", response_model=list[TableResponse])
-async def get_sized_available_tables(size: int, db: Session = Depends(get_db)):
+async def get_sized_available_tables(size: int, db: AsyncSession = Depends(get_async_db, scope="function")):
     """Get all available (not occupied) tables of a specific size"""
-    tables = table_service.get_sized_available_tables(db, size)
+    tables = await table_service.get_sized_available_tables(db, size)
     return tables
 
 @router.get("/unavailable/", response_model=list[TableResponse])
-async def get_unavailable_tables(db: Session = Depends(get_db)):
+async def get_unavailable_tables(db: AsyncSession = Depends(get_async_db, scope="function")):
     """Get all unavailable (occupied) tables"""
-    tables = table_service.get_unavailable_tables(db)
+    tables = await table_service.get_unavailable_tables(db)
     return tables
 
 
@@ -95,13 +138,19 @@ async def get_unavailable_tables(db: Session = Depends(get_db)):
 async def update_table_status(
     table_id: int,
     data: TableStatusUpdateDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     if data.is_occupied is None:
         raise HTTPException(400, "is_occupied is required")
 
-    return table_service.update_table_status(
+    table = await table_service.update_table_status(
         db,
         table_id,
         data.is_occupied
-    )
\ No newline at end of file
+    )
+    if not table:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Table not found"
+        )
+    return table
\ No newline at end of file
@@ -1,23 +1,23 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from db import get_db
+from db import get_async_db
 from schemas.vip_requestDTO import VipRequestCreate, VipRequestResponse, VipRequestUpdate
 from services.vip_request_service import VipRequestService
 
 router = APIRouter()
 
 @router.post("/", response_model=VipRequestResponse)
-def create_vip_request(request: VipRequestCreate, db: Session = Depends(get_db)):
+async def create_vip_request(request: VipRequestCreate, db: AsyncSession = Depends(get_async_db, scope="function")):
     service = VipRequestService(db)
-    return service.create_request(request)
+    return await service.create_request(request)
 
 @router.get("/", response_model=List[VipRequestResponse])
-def get_vip_requests(status: str = None, db: Session = Depends(get_db)):
+async def get_vip_requests(status: str = None, db: AsyncSession = Depends(get_async_db, scope="function")):
     service = VipRequestService(db)
-    return service.get_requests(status)
+    return await service.get_requests(status)
 
 @router.put("/{request_id}", response_model=VipRequestResponse)
-def update_vip_request_status(request_id: int, update_data: VipRequestUpdate, db: Session = Depends(get_db)):
+async def update_vip_request_status(request_id: int, update_data: VipRequestUpdate, db: AsyncSession = Depends(get_async_db, scope="function")):
     service = VipRequestService(db)
-    return service.update_status(request_id, update_data)
+    return await service.update_status(request_id, update_data)
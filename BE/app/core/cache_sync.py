@@ -0,0 +1,117 @@
+import asyncio
+import json
+import time
+from typing import Callable, Dict, List, Optional
+import asyncpg
+from core import config
+
+CHANNEL = "cache_changes"
+WATCHED_TABLES = ("menu_items", "tables", "staff", "staff_schedules")
+
+# Statement triggers (sqlScript.sql) announce every committed change to the
+# watched tables, whoever made it (any worker, a script, psql): one
+# notification per statement with the ids it touched, or ids null when it
+# touched more than the trigger lists. Workers only LISTEN; they need no DDL
+# rights, but warn at connect if the triggers are missing.
+MISSING_TRIGGERS_SQL = """
+SELECT name FROM unnest($1::text[]) AS name
+WHERE NOT EXISTS (
+    SELECT 1 FROM pg_trigger
+    WHERE tgname = 'cache_changes_update' AND tgrelid = to_regclass('restaurant.' || name)
+)
+"""
+
+_handlers: Dict[str, List[Callable[[Optional[int]], None]]] = {}
+
+stats = {
+    "connected": False,
+    "notifications": 0,
+    "resyncs": 0,
+    "reconnects": 0,
+    "last_error": None,
+    "last_notification_at": None,
+    "missing_triggers": [],
+}
+
+
+def on_change(table: str, handler: Callable[[Optional[int]], None]) -> None:
+    """
+    Call `handler(row_id)` when a row of `table` changes, in any worker.
+    row_id is None when the rows are not known (a resync, or one statement
+    changing many rows): every key of `table` must be dropped.
+    """
+    _handlers.setdefault(table, []).append(handler)
+
+
+def _dispatch(table: str, row_id: Optional[int]) -> None:
+    for handler in _handlers.get(table, ()):
+        try:
+            handler(row_id)
+        except Exception as e:
+            print(f"❌ Cache invalidation for {table} failed:", e)
+
+
+def resync() -> None:
+    """Drop everything: changes made while nobody was listening are unknown"""
+    stats["resyncs"] += 1
+    for table in list(_handlers):
+        _dispatch(table, None)
+
+
+def _on_notify(connection, pid, channel, payload) -> None:
+    stats["notifications"] += 1
+    stats["last_notification_at"] = time.time()
+    try:
+        change = json.loads(payload)
+        table, row_ids = change["table"], change.get("ids")
+    except (ValueError, KeyError, TypeError):
+        resync()
+        return
+    if row_ids is None:
+        _dispatch(table, None)
+        return
+    for row_id in row_ids:
+        _dispatch(table, row_id)
+
+
+async def listen_for_changes():
+    """
+    Keep a dedicated LISTEN connection up for the life of the worker.
+    Every (re)connect starts with a full resync; a ping every
+    CACHE_SYNC_PING_SECONDS notices a dead connection.
+    """
+    backoff = 1.0
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(
+                user=config.DB_USER,
+                password=config.DB_PASSWORD,
+                host=config.DB_HOST,
+                port=config.DB_PORT,
+                database=config.DB_NAME,
+            )
+            missing = [row["name"] for row in await conn.fetch(MISSING_TRIGGERS_SQL, list(WATCHED_TABLES))]
+            stats["missing_triggers"] = missing
+            if missing:
+                print(f"❌ No cache_changes triggers on {', '.join(missing)}: run sqlScript.sql, other workers' writes will go unnoticed")
+            await conn.add_listener(CHANNEL, _on_notify)
+            stats["connected"] = True
+            resync()
+            print("✅ Listening for cache changes")
+            backoff = 1.0
+            while True:
+                await asyncio.sleep(config.CACHE_SYNC_PING_SECONDS)
+                await conn.execute("SELECT 1")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            stats["last_error"] = str(e)
+            stats["reconnects"] += 1
+            print(f"❌ Cache change listener lost, retrying in {backoff:.0f}s:", e)
+        finally:
+            stats["connected"] = False
+            if conn is not None and not conn.is_closed():
+                conn.terminate()
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, config.CACHE_SYNC_MAX_BACKOFF_SECONDS)
@@ -0,0 +1,72 @@
+import os
+from dotenv import load_dotenv
+
+# values come from the environment (or a .env file next to main.py);
+# defaults match the local development database
+load_dotenv()
+
+
+def _bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+DB_USER = os.getenv("DB_USER", "postgres")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "Nam30072003")
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = int(os.getenv("DB_PORT", "5432"))
+DB_NAME = os.getenv("DB_NAME", "restaurant")
+
+# connection pool, per worker process: keep
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below Postgres max_connections
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_PRE_PING = _bool("DB_POOL_PRE_PING", True)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# milliseconds, 0 disables the limit
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+DB_ECHO = _bool("DB_ECHO", False)
+
+# bcrypt runs on its own thread pool; callers beyond the pending limit get a 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+# verified JWT payloads kept per worker by core.dependencies.get_current_user
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+# seconds between background order-total reconciliation runs, 0 disables it
+# (POST /orders/reconcile-totals runs it on demand)
+ORDER_TOTAL_RECONCILE_SECONDS = int(os.getenv("ORDER_TOTAL_RECONCILE_SECONDS", "0"))
+
+# in-process event stream (/events): per-subscriber queue bound and the idle
+# keep-alive interval; a subscriber whose queue fills is told to resync
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+
+# /changes delta sync: a token older than CHANGE_TOKEN_MAX_AGE_DAYS is refused
+# (410, the client syncs from scratch), which lets tombstones past that age be
+# pruned every CHANGE_TOMBSTONE_PRUNE_SECONDS (0 disables the job)
+CHANGE_TOKEN_MAX_AGE_DAYS = float(os.getenv("CHANGE_TOKEN_MAX_AGE_DAYS", "30"))
+CHANGE_TOMBSTONE_PRUNE_SECONDS = int(os.getenv("CHANGE_TOMBSTONE_PRUNE_SECONDS", "3600"))
+
+# LISTEN/NOTIFY cache coherence between workers: each worker keeps one extra
+# connection open and drops its caches when another worker changes the data
+CACHE_SYNC_ENABLED = _bool("CACHE_SYNC_ENABLED", True)
+CACHE_SYNC_PING_SECONDS = float(os.getenv("CACHE_SYNC_PING_SECONDS", "10"))
+CACHE_SYNC_MAX_BACKOFF_SECONDS = float(os.getenv("CACHE_SYNC_MAX_BACKOFF_SECONDS", "30"))
+
+# /analytics/summary results are reused for this many seconds per worker
+# (and per period/breakdown), 0 computes every request
+ANALYTICS_SUMMARY_TTL_SECONDS = float(os.getenv("ANALYTICS_SUMMARY_TTL_SECONDS", "10"))
+
+# bulk imports hash staff/customer passwords in worker processes, apart from
+# the sign-in pool; bcrypt at cost 12 is ~4 rows/s per process. Through the
+# API: at most IMPORT_MAX_CONCURRENT loads per worker (more get a 503), each
+# with IMPORT_HASH_WORKERS processes and at most IMPORT_API_MAX_HASHED_ROWS
+# rows; larger loads go through scripts.bulk_import, which uses every core
+IMPORT_HASH_WORKERS = int(os.getenv("IMPORT_HASH_WORKERS", "1"))
+IMPORT_MAX_CONCURRENT = int(os.getenv("IMPORT_MAX_CONCURRENT", "1"))
+IMPORT_API_MAX_HASHED_ROWS = int(os.getenv("IMPORT_API_MAX_HASHED_ROWS", "500"))
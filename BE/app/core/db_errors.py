@@ -0,0 +1,23 @@
+import re
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+
+_CONSTRAINT = re.compile(r'constraint "([^"]+)"')
+
+
+def violated_constraint(error: IntegrityError) -> Optional[str]:
+    """Name of the constraint a failed INSERT/UPDATE ran into, when the driver says"""
+    # asyncpg keeps it on the original exception; the message carries it either way
+    name = getattr(error.orig.__cause__, "constraint_name", None)
+    if name:
+        return name
+    match = _CONSTRAINT.search(str(error.orig))
+    return match.group(1) if match else None
+
+
+def raise_duplicate(error: IntegrityError, messages: dict) -> None:
+    """Re-raise a violation of one of `messages`' constraints as ValueError(message), anything else unchanged"""
+    message = messages.get(violated_constraint(error))
+    if message is None:
+        raise error
+    raise ValueError(message) from None
@@ -0,0 +1,75 @@
+import hashlib
+import secrets
+from typing import Iterable, Optional
+from fastapi import Request, Response
+from core.cache_sync import WATCHED_TABLES, on_change
+
+
+def _parse_if_none_match(header: Optional[str]) -> set:
+    if not header:
+        return set()
+    tags = set()
+    for tag in header.split(","):
+        tag = tag.strip()
+        tags.add(tag[2:] if tag.startswith("W/") else tag)
+    return tags
+
+
+class CollectionVersions:
+    """
+    Change counters for rarely-changing collections, used as list ETags.
+
+    Services bump a collection after committing a write to it. A GET whose
+    If-None-Match still carries the current tag is answered with 304 before
+    the database or any serialization is touched. Counters live in this
+    worker; the epoch keeps tags from a previous process from matching.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self._epoch = secrets.token_hex(4)
+        self._versions = dict.fromkeys(names, 0)
+        self._hits = dict.fromkeys(self._versions, 0)
+        self._misses = dict.fromkeys(self._versions, 0)
+
+    def bump(self, name: str) -> None:
+        self._versions[name] += 1
+
+    def version(self, name: str) -> str:
+        """Opaque token that changes whenever `name` is bumped; for keying derived caches"""
+        return f"{self._epoch}-{self._versions[name]}"
+
+    def etag(self, name: str, request: Request) -> str:
+        # one tag per path and query string: each page/filter is its own variant
+        variant = hashlib.sha1(f"{request.url.path}?{request.url.query}".encode()).hexdigest()[:12]
+        return f'"{name}-{self._epoch}-{self._versions[name]}-{variant}"'
+
+    def check(self, name: str, request: Request, response: Response) -> Optional[Response]:
+        """A 304 when the client's copy is current; otherwise tags `response` and returns None"""
+        etag = self.etag(name, request)
+        sent = _parse_if_none_match(request.headers.get("if-none-match"))
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in sent or "*" in sent:
+            self._hits[name] += 1
+            return Response(status_code=304, headers=headers)
+        self._misses[name] += 1
+        response.headers.update(headers)
+        return None
+
+    def stats(self) -> dict:
+        stats = {}
+        for name, version in self._versions.items():
+            hits, misses = self._hits[name], self._misses[name]
+            stats[name] = {
+                "version": version,
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            }
+        return stats
+
+
+collection_versions = CollectionVersions(WATCHED_TABLES)
+
+# other workers' writes reach this worker's counters through LISTEN/NOTIFY
+for _name in WATCHED_TABLES:
+    on_change(_name, lambda row_id, name=_name: collection_versions.bump(name))
@@ -0,0 +1,100 @@
+import asyncio
+from typing import Iterable, Optional, Set
+from core import config
+
+# Topics a client can subscribe to:
+#   kitchen         every order change (chef and waiter screens)
+#   tables          every table status change
+#   table:<id>      orders, payments and status of one table
+#   customer:<id>   orders and payments of one customer
+RESYNC = {"type": "resync"}
+
+
+class Subscription:
+    def __init__(self, topics: Iterable[str], maxsize: int):
+        self.topics = frozenset(topics)
+        self.queue = asyncio.Queue(maxsize)
+
+    def offer(self, event: dict) -> bool:
+        """
+        Never blocks the publisher. A consumer too slow to keep up has its
+        backlog dropped and replaced by one resync marker; returns False then.
+        """
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            return False
+
+    async def next(self, timeout: float) -> Optional[dict]:
+        """Next event, or None when nothing arrived within `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """Fan-out of change notifications to the streams open on this worker"""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(topics, self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, event_type: str, topics: Set[str], **data) -> None:
+        event = {"type": event_type, **data}
+        self.published += 1
+        for subscription in list(self._subscribers):
+            if subscription.topics & topics:
+                if subscription.offer(event):
+                    self.delivered += 1
+                else:
+                    self.overflows += 1
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "queue_size": self.queue_size,
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+        }
+
+
+event_bus = EventBus(config.EVENT_QUEUE_SIZE)
+
+
+def publish_order(event_type: str, order, **extra) -> None:
+    topics = {"kitchen", f"table:{order.table_id}"}
+    if order.customer_id is not None:
+        topics.add(f"customer:{order.customer_id}")
+    event_bus.publish(
+        event_type, topics,
+        order_id=order.id,
+        table_id=order.table_id,
+        customer_id=order.customer_id,
+        status=getattr(order.status, "value", order.status),
+        **extra,
+    )
+
+
+def publish_table(table) -> None:
+    event_bus.publish(
+        "table.updated", {"tables", f"table:{table.id}"},
+        table_id=table.id,
+        is_occupied=table.is_occupied,
+    )
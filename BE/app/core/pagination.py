@@ -0,0 +1,63 @@
+import base64
+import json
+from typing import Awaitable, Callable, List, Optional
+from fastapi import HTTPException, status
+
+
+def encode_token(position: dict) -> str:
+    """Opaque url-safe token for a position clients should hand back unchanged"""
+    raw = json.dumps(position).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_token(token: str) -> dict:
+    """Inverse of encode_token; raises ValueError for anything it did not produce"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid token")
+    if not isinstance(position, dict):
+        raise ValueError("Invalid token")
+    return position
+
+
+def encode_cursor(last_id: int) -> str:
+    return encode_token({"id": last_id})
+
+
+def decode_cursor(cursor: str) -> Optional[int]:
+    """Id to seek past; an empty cursor means the first page"""
+    if not cursor:
+        return None
+    try:
+        return int(decode_token(cursor)["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def apply_page(stmt, key, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    """
+    Order by `key` and either seek past `after_id` (keyset, stays fast on deep
+    pages because it walks the primary key index) or skip rows (legacy offset).
+    """
+    stmt = stmt.order_by(key)
+    if after_id is not None:
+        stmt = stmt.where(key > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit)
+
+
+async def fetch_page(get_all: Callable[..., Awaitable[List]], cursor: str, limit: int) -> dict:
+    """
+    Run a `get_all(limit=..., after_id=...)` in cursor mode. One extra row is
+    fetched to tell whether another page exists.
+    """
+    rows = await get_all(limit=limit + 1, after_id=decode_cursor(cursor))
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].id) if items and len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,13 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import and_, true
+
+
+def in_period(column, since: Optional[datetime], until: Optional[datetime]):
+    """`column` in [since, until); a missing bound leaves that side open"""
+    conditions = []
+    if since is not None:
+        conditions.append(column >= since)
+    if until is not None:
+        conditions.append(column < until)
+    return and_(true(), *conditions)
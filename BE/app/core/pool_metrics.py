@@ -0,0 +1,128 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# upper bounds (ms) of the checkout wait-time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolStats:
+    """Counters for one engine's pool: checkout waits and connection churn"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+
+    def observe_wait(self, seconds: float, timed_out: bool = False):
+        ms = seconds * 1000
+        index = len(WAIT_BUCKETS_MS)
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if ms <= bound:
+                index = i
+                break
+        with self._lock:
+            self.wait_buckets[index] += 1
+            self.wait_total_ms += ms
+            self.wait_max_ms = max(self.wait_max_ms, ms)
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkouts += 1
+
+    def count(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            observed = self.checkouts + self.checkout_timeouts
+            labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["gt_5000ms"]
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "wait_ms": {
+                    "avg": round(self.wait_total_ms / observed, 3) if observed else 0.0,
+                    "max": round(self.wait_max_ms, 3),
+                    "histogram": dict(zip(labels, self.wait_buckets)),
+                },
+                "churn": {
+                    "connects": self.connects,
+                    "closes": self.closes,
+                    "invalidations": self.invalidations,
+                },
+            }
+
+
+class _TimedCheckout:
+    """Mixin timing how long a caller waits in _do_get for a connection"""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.observe_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.observe_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # pre-ping / recycle may rebuild the pool; keep the same counters
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument(engine) -> PoolStats:
+    """Attach a PoolStats to an engine built with one of the pools above"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    stats = PoolStats()
+    sync_engine.pool.stats = stats
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.count("connects")
+
+    @event.listens_for(sync_engine, "close")
+    def _on_close(dbapi_connection, connection_record):
+        stats.count("closes")
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        stats.count("invalidations")
+
+    return stats
+
+
+def pool_status(engine) -> dict:
+    """Live pool occupancy plus the counters collected by instrument()"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    status = {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # overflow() goes negative while the pool is still filling up
+        "overflow_in_use": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+    }
+    status.update(pool.stats.snapshot())
+    return status
@@ -1,6 +1,10 @@
+import asyncio
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
 from jose import jwt
 from datetime import datetime, timedelta
+from . import config
 
 def hash_password(password: str) -> str:
     """
@@ -20,10 +24,46 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     hashed_bytes = hashed_password.encode("utf-8")
     return bcrypt.checkpw(plain_bytes, hashed_bytes)
 
+# bcrypt is ~250 ms of CPU per call and releases the GIL, so it runs on a
+# small dedicated pool instead of the event loop or the shared threadpool
+_hash_executor = ThreadPoolExecutor(
+    max_workers=config.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+_hash_pending = 0
+
+async def _run_hasher(func, *args):
+    global _hash_pending
+    if _hash_pending >= config.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many sign-ins in progress, please retry",
+            headers={"Retry-After": "1"}
+        )
+    _hash_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_pending -= 1
+
+async def hash_password_async(password: str) -> str:
+    """
+    hash_password on the bcrypt pool; 503 when too many are queued
+    """
+    return await _run_hasher(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    verify_password on the bcrypt pool; 503 when too many are queued
+    """
+    return await _run_hasher(verify_password, plain_password, hashed_password)
+
 SECRET_KEY = "THISSHOULDBEENOUGHFORASECRETKEY"
 ALGORITHM = "HS256"
 
 def create_access_token(data: dict, expires_minutes: int = 60):
     to_encode = data.copy()
+    # JWT requires "sub" to be a string; jose rejects the token otherwise
+    to_encode["sub"] = str(to_encode["sub"])
     to_encode["exp"] = datetime.utcnow() + timedelta(minutes=expires_minutes)
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
\ No newline at end of file
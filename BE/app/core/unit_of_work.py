@@ -0,0 +1,59 @@
+"""
+Request-scoped unit of work.
+
+Every request gets one session from get_async_db and one commit, made after
+the endpoint returns and before the response is sent; an exception anywhere
+in the request rolls the whole of it back. Repositories and services only
+flush, so a write that touches several tables (an order and its table, a
+payment and the revenue rollup) is all-or-nothing without each of them
+having to know who else is writing.
+
+Work that must not happen before the data is visible to other connections
+(cache invalidations, occupancy marks, pushed events) is registered with
+after_commit() and runs once the commit has succeeded. A rollback drops it.
+"""
+import inspect
+from contextlib import asynccontextmanager
+from typing import Any, Callable
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_HOOKS = "after_commit"
+
+
+def after_commit(db: AsyncSession, callback: Callable[..., Any], *args, **kwargs) -> None:
+    """Run callback(*args, **kwargs) (sync or async) after `db` next commits"""
+    db.info.setdefault(_HOOKS, []).append((callback, args, kwargs))
+
+
+async def commit(db: AsyncSession) -> None:
+    await db.commit()
+    for callback, args, kwargs in db.info.pop(_HOOKS, []):
+        try:
+            result = callback(*args, **kwargs)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            # the data is committed; a failed side effect must not turn it into an error
+            print(f"❌ After-commit hook {getattr(callback, '__qualname__', callback)} failed:", e)
+
+
+async def rollback(db: AsyncSession) -> None:
+    db.info.pop(_HOOKS, None)
+    await db.rollback()
+
+
+@asynccontextmanager
+async def savepoint(db: AsyncSession):
+    """
+    SAVEPOINT around work that may fail without spoiling the rest of the
+    request, typically a flush that can hit a constraint. On an exception the
+    savepoint is rolled back, hooks registered inside it are dropped, and the
+    exception is re-raised for the caller to translate.
+    """
+    hooks = list(db.info.get(_HOOKS, ()))
+    try:
+        async with db.begin_nested():
+            yield db
+    except BaseException:
+        db.info[_HOOKS] = hooks
+        raise
@@ -1,12 +1,17 @@
+import asyncio
 from fastapi import FastAPI
 from sqlalchemy import text
-from db import engine, Base
-from controller import customer,staff,menu_item,order_item,order,table,payment,staff_schedule,auth,vip_request
+from db import async_engine, Base, unit_of_work
+from controller import customer,staff,menu_item,order_item,order,table,payment,staff_schedule,auth,vip_request,internal,events,analytics,reservation,imports,exports
 
 app = FastAPI(title="Restaurant API")
 
 from fastapi.middleware.cors import CORSMiddleware
-from repository import staffRepository
+from repository import StaffRepository
+from services import OrderService, ChangeService
+from services.table_index import table_index
+from core import config
+from core.cache_sync import listen_for_changes
 
 
 # Configure CORS
@@ -68,6 +73,12 @@ app.include_router(
     tags=["Staff Schedules"]
 )
 
+app.include_router(
+    reservation.router,
+    prefix="/reservations",
+    tags=["Reservations"]
+)
+
 app.include_router(
     auth.router,
     prefix="/auth",
@@ -80,15 +91,88 @@ app.include_router(
     tags=["VIP Requests"]
 )
 
+app.include_router(
+    events.router,
+    prefix="/events",
+    tags=["Events"]
+)
+
+app.include_router(
+    analytics.router,
+    prefix="/analytics",
+    tags=["Analytics"]
+)
+
+app.include_router(
+    imports.router,
+    prefix="/imports",
+    tags=["Imports"]
+)
+
+app.include_router(
+    exports.router,
+    prefix="/exports",
+    tags=["Exports"]
+)
+
+app.include_router(
+    internal.router,
+    prefix="/internal",
+    tags=["Internal"]
+)
+
 # startup event
 @app.on_event("startup")
-def test_db_connection():
+async def test_db_connection():
     # Create tables if they don't exist
-    Base.metadata.create_all(bind=engine)
-    staffRepository.init_admin(engine)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with unit_of_work() as db:
+        await StaffRepository().init_admin(db)
+        await table_index.get(db)
     try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         print("✅ Database connection successful")
     except Exception as e:
         print("❌ Database connection failed:", e)
+
+# background jobs
+background_tasks = []
+
+async def reconcile_order_totals_periodically():
+    while True:
+        await asyncio.sleep(config.ORDER_TOTAL_RECONCILE_SECONDS)
+        try:
+            async with unit_of_work() as db:
+                repaired = await OrderService().reconcile_totals(db)
+            if repaired:
+                print(f"🔧 Repaired totals of {len(repaired)} orders")
+        except Exception as e:
+            print("❌ Order total reconciliation failed:", e)
+
+async def prune_tombstones_periodically():
+    while True:
+        await asyncio.sleep(config.CHANGE_TOMBSTONE_PRUNE_SECONDS)
+        try:
+            async with unit_of_work() as db:
+                pruned = await ChangeService().prune(db)
+            if pruned:
+                print(f"🧹 Pruned {pruned} delta-sync tombstones")
+        except Exception as e:
+            print("❌ Tombstone pruning failed:", e)
+
+@app.on_event("startup")
+async def start_background_jobs():
+    if config.ORDER_TOTAL_RECONCILE_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(reconcile_order_totals_periodically()))
+    if config.CHANGE_TOMBSTONE_PRUNE_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(prune_tombstones_periodically()))
+    if config.CACHE_SYNC_ENABLED:
+        background_tasks.append(asyncio.create_task(listen_for_changes()))
+
+@app.on_event("shutdown")
+async def close_db_connection():
+    for task in background_tasks:
+        task.cancel()
+    await async_engine.dispose()
@@ -3,11 +3,17 @@ from .staff import Staff, StaffRole
 from .staff_schedule import StaffSchedule, workDay, workShift
 from .menu_item import MenuItem, item_type
 from .table import Table
-from .reservation import Reservation
+from .reservation import Reservation, ReservationStatus, HOLDING_STATUSES
 from .order import Order, OrderStatus, PaymentMethod
 from .order_item import OrderItem
 from .payment import Payment, PaymentMethod, PaymentStatus
 from .payment import Payment, PaymentMethod, PaymentStatus
 from .review import Review
 from .vip_request import VipRequest, VipRequestStatus
+from .revenue_daily import RevenueDaily
 
+from .deleted_row import DeletedRow, record_deletes
+
+# tables served by the /changes delta-sync endpoints
+for _model in (Order, Table, Payment, MenuItem):
+    record_deletes(_model)
@@ -0,0 +1,34 @@
+from db import Base
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index, event, insert, text
+from sqlalchemy.sql import func
+
+
+def change_xid_column() -> Column:
+    """
+    Id of the transaction that last wrote the row. /changes pages by it,
+    not by a timestamp, because it can tell which writes have committed.
+    """
+    return Column(BigInteger, nullable=False, server_default=text("txid_current()"), onupdate=func.txid_current())
+
+
+class DeletedRow(Base):
+    """Tombstone left by a delete so delta-sync clients can drop the row too"""
+    __tablename__ = "deleted_rows"
+    __table_args__ = (
+        Index("idx_deleted_rows_table_name_change_xid", "table_name", "change_xid", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String(50), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, server_default=func.now())
+    change_xid = change_xid_column()
+
+
+def record_deletes(model):
+    """Write a DeletedRow in the same flush whenever the ORM deletes a `model` row"""
+    @event.listens_for(model, "after_delete")
+    def _tombstone(mapper, connection, target):
+        connection.execute(
+            insert(DeletedRow).values(table_name=model.__tablename__, row_id=target.id)
+        )
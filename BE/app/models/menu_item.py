@@ -1,6 +1,7 @@
-from sqlalchemy import Boolean, Column, Integer, Numeric, String, DateTime, Enum, Text
+from sqlalchemy import Boolean, Column, Integer, Numeric, String, DateTime, Enum, Text, Index
 from sqlalchemy.sql import func
 from db import Base
+from .deleted_row import change_xid_column
 import enum
 from sqlalchemy.orm import relationship
 
@@ -24,5 +25,10 @@ class MenuItem(Base):
     is_available = Column(Boolean, default=True)
     created_at = Column(DateTime,server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    change_xid = change_xid_column()
+
+    __table_args__ = (
+        Index("idx_menu_items_change_xid", "change_xid", "id"),
+    )
 
     order_items = relationship("OrderItem", back_populates="menu_item")
\ No newline at end of file
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, ForeignKey, Numeric, DateTime, Enum, Text, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, DateTime, Enum, Text, Boolean, Index
 from db import Base
+from .deleted_row import change_xid_column
 from sqlalchemy.sql import func
 import enum
 from sqlalchemy.orm import relationship
@@ -38,6 +39,16 @@ class Order(Base):
     notes = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    change_xid = change_xid_column()
+
+    # kitchen/waiter screens filter by status, customer pages by customer;
+    # both read newest orders first
+    __table_args__ = (
+        Index("idx_orders_status_order_date", status, order_date),
+        Index("idx_orders_customer_order_date", customer_id, order_date.desc()),
+        Index("idx_orders_change_xid", change_xid, id),
+        Index("idx_orders_order_date", order_date),
+    )
 
     customer = relationship("Customer", back_populates="orders")
     staff = relationship("Staff", back_populates="orders")
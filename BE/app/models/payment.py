@@ -1,5 +1,6 @@
 from db import Base
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Numeric, ForeignKey
+from .deleted_row import change_xid_column
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Numeric, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 import enum
@@ -31,5 +32,12 @@ class Payment(Base):
     payment_status : Mapped[PaymentStatus] = mapped_column(Enum(PaymentStatus),default= PaymentStatus.pending)
     transaction_id = Column(String(100))
     created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    change_xid = change_xid_column()
+
+    __table_args__ = (
+        Index("idx_payments_change_xid", "change_xid", "id"),
+        Index("idx_payments_payment_date", "payment_date"),
+    )
 
     order = relationship("Order", back_populates="payments")
\ No newline at end of file
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum, Text
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum, Text, Computed, DDL, event, text
+from sqlalchemy.dialects.postgresql import TSRANGE, ExcludeConstraint
 from sqlalchemy.sql import func
 from db import Base
 import enum
@@ -11,6 +12,9 @@ class ReservationStatus(str, enum.Enum):
     cancelled = "cancelled"
     completed = "completed"
 
+# reservations that still hold their table for their time slot
+HOLDING_STATUSES = (ReservationStatus.pending, ReservationStatus.confirmed)
+
 
 class Reservation(Base):
     __tablename__ = "reservations"
@@ -26,6 +30,28 @@ class Reservation(Base):
     special_requests = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # [reservation_date, reservation_date + duration), kept by Postgres
+    slot = Column(TSRANGE, Computed("tsrange(reservation_date, reservation_date + duration_hours * interval '1 hour')", persisted=True))
+
+    # two holding reservations of one table can't overlap; the GiST index
+    # behind the constraint also serves the availability search
+    __table_args__ = (
+        ExcludeConstraint(
+            (table_id, "="),
+            (slot, "&&"),
+            name="reservations_no_overlap",
+            using="gist",
+            where=text("status IN ('pending', 'confirmed')"),
+        ),
+    )
 
     customer = relationship("Customer", back_populates="reservations")
-    table = relationship("Table", back_populates="reservations")
\ No newline at end of file
+    table = relationship("Table", back_populates="reservations")
+
+
+# integer equality inside a GiST index needs btree_gist
+event.listen(
+    Reservation.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql")
+)
@@ -0,0 +1,23 @@
+from db import Base
+from sqlalchemy import Column, Integer, SmallInteger, Date, DateTime, Enum, Numeric
+from sqlalchemy.sql import func
+from .payment import PaymentMethod
+
+
+class RevenueDaily(Base):
+    """
+    Payments rolled up per day, hour, method and order staff. Kept in step by
+    PaymentService in the same transaction as the payment change; rebuild it
+    from payments with RevenueService.rebuild. staff_id 0 means no staff.
+    """
+    __tablename__ = "revenue_daily"
+
+    day = Column(Date, primary_key=True)
+    hour = Column(SmallInteger, primary_key=True)
+    payment_method = Column(Enum(PaymentMethod), primary_key=True)
+    staff_id = Column(Integer, primary_key=True, default=0)
+    completed_count = Column(Integer, nullable=False, default=0)
+    completed_amount = Column(Numeric(12, 2), nullable=False, default=0)
+    refunded_count = Column(Integer, nullable=False, default=0)
+    refunded_amount = Column(Numeric(12, 2), nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
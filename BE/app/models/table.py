@@ -1,5 +1,6 @@
 from db import Base
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from .deleted_row import change_xid_column
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 import enum
@@ -15,6 +16,12 @@ class Table(Base):
     table_size: Mapped[int] = mapped_column(Integer, nullable=False)
     is_occupied: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    change_xid = change_xid_column()
+
+    __table_args__ = (
+        Index("idx_tables_change_xid", "change_xid", "id"),
+    )
     
     orders = relationship("Order", back_populates="table")
     reservations = relationship("Reservation", back_populates="table")
\ No newline at end of file
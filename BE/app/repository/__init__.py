@@ -8,6 +8,11 @@ from .reservationRepository import ReservationRepository
 from .paymentRepository import PaymentRepository
 from .reviewRepository import ReviewRepository
 from .staff_scheduleRepository import StaffScheduleRepository
+from .changeRepository import ChangeRepository
+from .analyticsRepository import AnalyticsRepository
+from .revenueRepository import RevenueRepository
+from .importRepository import ImportRepository
+from .exportRepository import ExportRepository
 __all__ = [
     "CustomerRepository",
     "StaffRepository",
@@ -19,4 +24,9 @@ __all__ = [
     "PaymentRepository",
     "ReviewRepository",
     "StaffScheduleRepository",
+    "ChangeRepository",
+    "AnalyticsRepository",
+    "RevenueRepository",
+    "ImportRepository",
+    "ExportRepository",
 ]
\ No newline at end of file
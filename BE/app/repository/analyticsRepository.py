@@ -0,0 +1,106 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.periods import in_period
+from models import Order, OrderStatus, Payment, PaymentStatus, Table, Staff
+
+# orders still being worked on, whatever day they were placed
+ACTIVE_ORDER_STATUSES = (
+    OrderStatus.pending,
+    OrderStatus.preparing,
+    OrderStatus.ready,
+    OrderStatus.served,
+)
+
+
+class AnalyticsRepository:
+    """
+    Dashboard figures computed in SQL. Each method is one aggregate statement
+    whose WHERE clause is served by an index (status / order_date on orders,
+    payment_date on payments), so the cost follows the period, not the history.
+    """
+
+    async def order_counts(self, db: AsyncSession, since: Optional[datetime], until: Optional[datetime]) -> dict:
+        placed = in_period(Order.order_date, since, until)
+        active = Order.status.in_(ACTIVE_ORDER_STATUSES)
+        row = (await db.execute(
+            select(
+                func.count().filter(active).label("active_orders"),
+                func.count().filter(placed).label("orders"),
+                func.count().filter(placed, Order.status == OrderStatus.paid).label("paid_orders"),
+                func.count().filter(placed, Order.status == OrderStatus.cancelled).label("cancelled_orders"),
+            ).where(or_(active, placed))
+        )).mappings().one()
+        return dict(row)
+
+    async def table_counts(self, db: AsyncSession) -> dict:
+        row = (await db.execute(
+            select(
+                func.count().label("tables"),
+                func.count().filter(Table.is_occupied.is_(True)).label("occupied_tables"),
+            )
+        )).mappings().one()
+        return dict(row)
+
+    async def payment_totals(self, db: AsyncSession, since: Optional[datetime], until: Optional[datetime]) -> dict:
+        completed = Payment.payment_status == PaymentStatus.completed
+        refunded = Payment.payment_status == PaymentStatus.refunded
+        row = (await db.execute(
+            select(
+                func.coalesce(func.sum(Payment.amount_paid).filter(completed), 0).label("revenue"),
+                func.count().filter(completed).label("completed_payments"),
+                func.coalesce(func.sum(Payment.amount_paid).filter(refunded), 0).label("refunded"),
+                func.count().filter(Payment.payment_status == PaymentStatus.pending).label("pending_payments"),
+            ).where(in_period(Payment.payment_date, since, until))
+        )).mappings().one()
+        return dict(row)
+
+    async def orders_by_hour(self, db: AsyncSession, since: Optional[datetime], until: Optional[datetime]) -> List[dict]:
+        hour = func.extract("hour", Order.order_date)
+        result = await db.execute(
+            select(hour.label("hour"), func.count().label("orders"))
+            .where(in_period(Order.order_date, since, until))
+            .group_by(hour)
+        )
+        return [dict(row) for row in result.mappings()]
+
+    async def revenue_by_hour(self, db: AsyncSession, since: Optional[datetime], until: Optional[datetime]) -> List[dict]:
+        hour = func.extract("hour", Payment.payment_date)
+        result = await db.execute(
+            select(hour.label("hour"), func.sum(Payment.amount_paid).label("revenue"))
+            .where(in_period(Payment.payment_date, since, until), Payment.payment_status == PaymentStatus.completed)
+            .group_by(hour)
+        )
+        return [dict(row) for row in result.mappings()]
+
+    async def revenue_by_payment_method(self, db: AsyncSession, since: Optional[datetime], until: Optional[datetime]) -> List[dict]:
+        result = await db.execute(
+            select(
+                Payment.payment_method,
+                func.count().label("payments"),
+                func.sum(Payment.amount_paid).label("revenue"),
+            )
+            .where(in_period(Payment.payment_date, since, until), Payment.payment_status == PaymentStatus.completed)
+            .group_by(Payment.payment_method)
+            .order_by(Payment.payment_method)
+        )
+        return [dict(row) for row in result.mappings()]
+
+    async def orders_by_staff(self, db: AsyncSession, since: Optional[datetime], until: Optional[datetime]) -> List[dict]:
+        per_staff = (
+            select(
+                Order.staff_id,
+                func.count().label("orders"),
+                func.coalesce(func.sum(Order.final_amount).filter(Order.status == OrderStatus.paid), 0).label("revenue"),
+            )
+            .where(in_period(Order.order_date, since, until))
+            .group_by(Order.staff_id)
+            .subquery()
+        )
+        result = await db.execute(
+            select(per_staff.c.staff_id, Staff.full_name, per_staff.c.orders, per_staff.c.revenue)
+            .outerjoin(Staff, Staff.id == per_staff.c.staff_id)
+            .order_by(per_staff.c.orders.desc(), per_staff.c.staff_id)
+        )
+        return [dict(row) for row in result.mappings()]
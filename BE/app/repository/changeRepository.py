@@ -0,0 +1,44 @@
+from datetime import timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+from models import DeletedRow
+
+# every transaction with a lower id has finished: rows written below it can't
+# still appear behind a position already handed out
+_committed_below = func.txid_snapshot_xmin(func.txid_current_snapshot())
+
+
+class ChangeRepository:
+    async def changed_since(
+        self,
+        db: AsyncSession,
+        model,
+        after: Optional[Tuple[int, int]],
+        limit: int
+    ) -> List:
+        """Rows of `model` past the (change_xid, id) position, in transaction order"""
+        stmt = select(model).where(model.change_xid < _committed_below)
+        if after is not None:
+            stmt = stmt.where(tuple_(model.change_xid, model.id) > tuple_(*after))
+        result = await db.scalars(stmt.order_by(model.change_xid, model.id).limit(limit))
+        return result.all()
+
+    async def deleted_since(
+        self,
+        db: AsyncSession,
+        table_name: str,
+        after: Optional[Tuple[int, int]],
+        limit: int
+    ) -> List[DeletedRow]:
+        stmt = select(DeletedRow).where(DeletedRow.table_name == table_name, DeletedRow.change_xid < _committed_below)
+        if after is not None:
+            stmt = stmt.where(tuple_(DeletedRow.change_xid, DeletedRow.id) > tuple_(*after))
+        result = await db.scalars(stmt.order_by(DeletedRow.change_xid, DeletedRow.id).limit(limit))
+        return result.all()
+
+    async def prune_deleted(self, db: AsyncSession, older_than: timedelta) -> int:
+        """Drop tombstones older than `older_than` by the database clock; returns how many"""
+        result = await db.execute(delete(DeletedRow).where(DeletedRow.deleted_at < func.now() - older_than))
+        return result.rowcount
@@ -1,55 +1,62 @@
-from typing import List
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from sqlalchemy import exists, select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import apply_page
 from models import Customer,CustomerRole
 
 class CustomerRepository:
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100):
-        return db.query(Customer).offset(skip).limit(limit).all()
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+        result = await db.scalars(apply_page(select(Customer), Customer.id, skip, limit, after_id))
+        return result.all()
 
-    def get_by_id(self, db: Session, customer_id: int):
-        return db.query(Customer).filter(Customer.id == customer_id).first()
+    async def get_by_id(self, db: AsyncSession, customer_id: int):
+        return await db.get(Customer, customer_id)
 
-    def create(self, db: Session, customer: Customer):
+    async def create(self, db: AsyncSession, customer: Customer):
         db.add(customer)
-        db.commit()
-        db.refresh(customer)
+        # INSERT ... RETURNING already brings back the server defaults
+        await db.flush()
         return customer
 
-    def update(self, db: Session, customer: Customer):
-        db.merge(customer)
-        db.commit()
-        db.refresh(customer)
-        return customer
+    async def update_fields(self, db: AsyncSession, customer_id: int, values: dict) -> Optional[Customer]:
+        """Set just `values` in one UPDATE ... RETURNING; None when the customer doesn't exist"""
+        if not values:
+            return await self.get_by_id(db, customer_id)
+        return await db.scalar(
+            update(Customer).where(Customer.id == customer_id).values(**values).returning(Customer),
+            execution_options={"populate_existing": True}
+        )
+
+    async def delete(self, db: AsyncSession, customer: Customer):
+        await db.delete(customer)
+        await db.flush()
+
+    async def find_by_username(self, db: AsyncSession, username: str):
+        return await db.scalar(select(Customer).where(Customer.username == username))
+
+    async def find_by_email(self, db: AsyncSession, email: str):
+        return await db.scalar(select(Customer).where(Customer.email == email))
+
+    async def exists_by_username(self, db: AsyncSession, username: str) -> bool:
+        return await db.scalar(select(exists().where(Customer.username == username)))
 
-    def delete(self, db: Session, customer: Customer):
-        db.delete(customer)
-        db.commit()
-    
-    def find_by_username(self, db: Session, username: str):
-        return db.query(Customer).filter(Customer.username == username).first()
-    
-    def find_by_email(self, db: Session, email: str):
-        return db.query(Customer).filter(Customer.email == email).first()
-
-    def exists_by_username(self, db: Session, username: str) -> bool:
-        return db.query(Customer).filter(Customer.username == username).count() > 0
-    
-    def exists_by_email(self, db: Session, email: str) -> bool:
-        return db.query(Customer).filter(Customer.email == email).count() > 0
-
-    def find_by_id(self, db: Session, customer_id: int):
-        return db.query(Customer).filter(Customer.id == customer_id).first()
-    
-    def search_by_name(self, db: Session, full_name: str):
-        return db.query(Customer).filter(Customer.full_name.ilike(f"%{full_name}%")).all()
-
-    def count(self, db: Session) -> int:
-        return db.query(Customer).count()
-    
-    def update_role(self, db: Session, customer_id: int, new_role: CustomerRole) -> Customer:
-        customer = self.find_by_id(db, customer_id)
+    async def exists_by_email(self, db: AsyncSession, email: str) -> bool:
+        return await db.scalar(select(exists().where(Customer.email == email)))
+
+    async def find_by_id(self, db: AsyncSession, customer_id: int):
+        return await db.get(Customer, customer_id)
+
+    async def search_by_name(self, db: AsyncSession, full_name: str):
+        result = await db.scalars(select(Customer).where(Customer.full_name.ilike(f"%{full_name}%")))
+        return result.all()
+
+    async def count(self, db: AsyncSession) -> int:
+        return await db.scalar(select(func.count()).select_from(Customer))
+
+    async def update_role(self, db: AsyncSession, customer_id: int, new_role: CustomerRole) -> Customer:
+        customer = await self.find_by_id(db, customer_id)
         if customer:
             customer.role = new_role
-            db.commit()
-            db.refresh(customer)
-        return customer
\ No newline at end of file
+            await db.flush()
+            await db.refresh(customer)
+        return customer
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import Select, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.periods import in_period
+from models import MenuItem, Order, OrderItem, Payment
+
+
+def _exported(model) -> list:
+    # change_xid is delta-sync bookkeeping, not something accounting reads
+    return [column for column in model.__table__.c if column.name != "change_xid"]
+
+
+class ExportRepository:
+    """Plain column rows for accounting exports; no ORM objects are built"""
+
+    def orders(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Select:
+        return (
+            select(*_exported(Order))
+            .where(in_period(Order.order_date, since, until))
+            .order_by(Order.order_date, Order.id)
+        )
+
+    def order_items(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Select:
+        """Lines of the orders placed in [since, until), with the menu item's name"""
+        return (
+            select(*OrderItem.__table__.c, MenuItem.item_name, Order.order_date)
+            .join(Order, Order.id == OrderItem.order_id)
+            .join(MenuItem, MenuItem.id == OrderItem.menu_item_id)
+            .where(in_period(Order.order_date, since, until))
+            .order_by(Order.order_date, OrderItem.order_id, OrderItem.id)
+        )
+
+    def payments(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Select:
+        return (
+            select(*_exported(Payment))
+            .where(in_period(Payment.payment_date, since, until))
+            .order_by(Payment.payment_date, Payment.id)
+        )
+
+    async def stream(self, db: AsyncSession, stmt: Select, batch_rows: int) -> AsyncIterator[List[Row]]:
+        """Run `stmt` on a server-side cursor, `batch_rows` rows at a time"""
+        result = await db.stream(stmt.execution_options(yield_per=batch_rows))
+        async for rows in result.partitions():
+            yield rows
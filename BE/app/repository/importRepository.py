@@ -0,0 +1,33 @@
+from typing import IO, Sequence
+from sqlalchemy import Table
+from sqlalchemy.engine import Connection
+
+
+class ImportRepository:
+    """
+    Bulk loads on the sync (psycopg2) engine: COPY into a temporary staging
+    table, then a single INSERT ... SELECT into the real one.
+    """
+
+    def copy_and_merge(self, conn: Connection, table: Table, columns: Sequence[str], data: IO[str]) -> int:
+        """
+        Load `data` (CSV without a header, one field per column) into `table`.
+        Rows that hit a unique constraint, in the table or earlier in the
+        same file, are skipped; returns how many were inserted. Does not commit.
+        """
+        column_list = ", ".join(columns)
+        cursor = conn.connection.cursor()
+        try:
+            # the staging copy keeps the target's column types (enums included)
+            cursor.execute(
+                f"CREATE TEMP TABLE import_staging ON COMMIT DROP AS "
+                f"SELECT {column_list} FROM {table.fullname} WITH NO DATA"
+            )
+            cursor.copy_expert(f"COPY import_staging ({column_list}) FROM STDIN WITH (FORMAT csv)", data)
+            cursor.execute(
+                f"INSERT INTO {table.fullname} ({column_list}) "
+                f"SELECT {column_list} FROM import_staging ON CONFLICT DO NOTHING"
+            )
+            return cursor.rowcount
+        finally:
+            cursor.close()
@@ -1,34 +1,49 @@
-from typing import List 
-from sqlalchemy.orm import Session
+from typing import Iterable, List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import apply_page
 from models import MenuItem
 from decimal import Decimal
 
 class MenuItemRepository:
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100):
-        return db.query(MenuItem).offset(skip).limit(limit).all()
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+        result = await db.scalars(apply_page(select(MenuItem), MenuItem.id, skip, limit, after_id))
+        return result.all()
 
-    def get_by_id(self, db: Session, item_id: int) -> MenuItem:
-        return db.query(MenuItem).filter(MenuItem.id == item_id).first()
+    async def get_by_id(self, db: AsyncSession, item_id: int) -> MenuItem:
+        return await db.get(MenuItem, item_id)
 
-    def create(self, db: Session, menu_item: MenuItem):
+    async def create(self, db: AsyncSession, menu_item: MenuItem):
         db.add(menu_item)
-        db.commit()
-        db.refresh(menu_item)
+        await db.flush()
+        await db.refresh(menu_item)
         return menu_item
 
-    def update(self, db: Session, menu_item: MenuItem):
-        db.merge(menu_item)
-        db.commit()
-        db.refresh(menu_item)
-        return menu_item
+    async def update_fields(self, db: AsyncSession, item_id: int, values: dict) -> Optional[MenuItem]:
+        """Set just `values` in one UPDATE ... RETURNING; None when the menu item doesn't exist"""
+        if not values:
+            return await self.get_by_id(db, item_id)
+        return await db.scalar(
+            update(MenuItem).where(MenuItem.id == item_id).values(**values).returning(MenuItem),
+            execution_options={"populate_existing": True}
+        )
+
+    async def delete(self, db: AsyncSession, menu_item: MenuItem):
+        await db.delete(menu_item)
+        await db.flush()
+
+    async def get_catalog(self, db: AsyncSession, item_ids: Optional[Iterable[int]] = None) -> List[MenuItem]:
+        """Menu items as committed (all, or just `item_ids`), ignoring stale copies in the session"""
+        stmt = select(MenuItem).order_by(MenuItem.id).execution_options(populate_existing=True)
+        if item_ids is not None:
+            stmt = stmt.where(MenuItem.id.in_(list(item_ids)))
+        result = await db.scalars(stmt)
+        return result.all()
 
-    def delete(self, db: Session, menu_item: MenuItem):
-        db.delete(menu_item)
-        db.commit()
+    async def get_all_by_type(self, db: AsyncSession, item_type: str) -> List[MenuItem]:
+        result = await db.scalars(select(MenuItem).where(MenuItem.item_type == item_type))
+        return result.all()
 
-    def get_all_by_type(self, db: Session, item_type: str) -> List[MenuItem]:
-        return db.query(MenuItem).filter(MenuItem.item_type == item_type).all()
-    
 
-    def get_item_price_by_id(self, db: Session, item_id: int) -> Decimal:
-        return db.query(MenuItem.item_price).filter(MenuItem.id == item_id).scalar()
\ No newline at end of file
+    async def get_item_price_by_id(self, db: AsyncSession, item_id: int) -> Decimal:
+        return await db.scalar(select(MenuItem.item_price).where(MenuItem.id == item_id))
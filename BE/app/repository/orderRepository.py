@@ -1,42 +1,121 @@
-from typing import List
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import apply_page
 from models import Order, OrderStatus
 from sqlalchemy.sql import func
 from models import OrderItem
 
 class OrderRepository:
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Order]:
-        return db.query(Order).offset(skip).limit(limit).all()
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Order]:
+        result = await db.scalars(apply_page(select(Order), Order.id, skip, limit, after_id))
+        return result.all()
 
-    def get_by_id(self, db: Session, order_id: int) -> Order:
-        return db.query(Order).filter(Order.id == order_id).first()
+    async def get_by_id(self, db: AsyncSession, order_id: int) -> Order:
+        return await db.get(Order, order_id)
 
-    def create(self, db: Session, order: Order) -> Order:
+    async def create(self, db: AsyncSession, order: Order) -> Order:
         db.add(order)
-        db.commit()
-        db.refresh(order)
+        await db.flush()
+        await db.refresh(order)
         return order
 
-    def update(self, db: Session, order: Order) -> Order:
-        db.merge(order)
-        db.commit()
-        db.refresh(order)
-        return order
+    async def update_fields(self, db: AsyncSession, order_id: int, values: dict) -> Optional[Order]:
+        """Set just `values` in one UPDATE ... RETURNING; None when the order doesn't exist"""
+        if not values:
+            return await self.get_by_id(db, order_id)
+        return await db.scalar(
+            update(Order).where(Order.id == order_id).values(**values).returning(Order),
+            execution_options={"populate_existing": True}
+        )
+
+    async def delete(self, db: AsyncSession, order: Order) -> None:
+        await db.delete(order)
+        await db.flush()
+
+    async def find_by_customer_id(self, db: AsyncSession, customer_id: int) -> List[Order]:
+        result = await db.scalars(select(Order).where(Order.customer_id == customer_id))
+        return result.all()
+
+    async def find_by_status(self, db: AsyncSession, status: OrderStatus) -> List[Order]:
+        result = await db.scalars(select(Order).where(Order.status == status))
+        return result.all()
+
+    async def query(
+        self,
+        db: AsyncSession,
+        statuses: Optional[List[OrderStatus]] = None,
+        customer_id: Optional[int] = None,
+        table_id: Optional[int] = None,
+        staff_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Order]:
+        """Newest orders matching every given filter; filters left as None are ignored"""
+        stmt = select(Order)
+        if statuses:
+            stmt = stmt.where(Order.status.in_(statuses))
+        if customer_id is not None:
+            stmt = stmt.where(Order.customer_id == customer_id)
+        if table_id is not None:
+            stmt = stmt.where(Order.table_id == table_id)
+        if staff_id is not None:
+            stmt = stmt.where(Order.staff_id == staff_id)
+        if since is not None:
+            stmt = stmt.where(Order.order_date >= since)
+        if until is not None:
+            stmt = stmt.where(Order.order_date < until)
+        result = await db.scalars(stmt.order_by(Order.order_date.desc(), Order.id.desc()).limit(limit))
+        return result.all()
+
+    async def calculate_total_amount(self,db: AsyncSession , order_id:int ):
+        total = await db.scalar(
+            select(func.coalesce(func.sum(OrderItem.subtotal), 0))
+            .where(OrderItem.order_id == order_id)
+        )
+        return total
 
-    def delete(self, db: Session, order: Order) -> None:
-        db.delete(order)
-        db.commit()
-    
-    def find_by_customer_id(self, db: Session, customer_id: int) -> List[Order]:
-        return db.query(Order).filter(Order.customer_id == customer_id).all()
-    
-    def find_by_status(self, db: Session, status: OrderStatus) -> List[Order]:
-        return db.query(Order).filter(Order.status == status).all()
-    
-    def calculate_total_amount(self,db: Session , order_id:int ):
+    async def lock(self, db: AsyncSession, order_id: int) -> bool:
+        """Hold the order's row lock until commit; False when there is no such order"""
+        found = await db.scalar(select(Order.id).where(Order.id == order_id).with_for_update())
+        return found is not None
+
+    async def lock_by_item(self, db: AsyncSession, order_item_id: int) -> Optional[int]:
+        """lock() for the order owning an order item; returns its id, None when there is no such item"""
+        return await db.scalar(
+            select(Order.id)
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .where(OrderItem.id == order_item_id)
+            .with_for_update(of=Order)
+        )
+
+    async def add_to_total(self, db: AsyncSession, order_id: int, delta) -> Order:
+        """Shift total/final amount by a signed delta in one UPDATE ... RETURNING; does not commit"""
+        total = func.coalesce(Order.total_amount, 0) + delta
+        return await db.scalar(
+            update(Order)
+            .where(Order.id == order_id)
+            .values(total_amount=total, final_amount=total - func.coalesce(Order.discount_amount, 0))
+            .returning(Order),
+            execution_options={"populate_existing": True}
+        )
+
+    async def repair_totals(self, db: AsyncSession) -> List[int]:
+        """Reset every order whose stored totals drifted from its lines; returns their ids, does not commit"""
         total = (
-            db.query(func.coalesce(func.sum(OrderItem.subtotal), 0))
-            .filter(OrderItem.order_id == order_id)
-            .scalar()
+            select(func.coalesce(func.sum(OrderItem.subtotal), 0))
+            .where(OrderItem.order_id == Order.id)
+            .scalar_subquery()
+        )
+        final = total - func.coalesce(Order.discount_amount, 0)
+        result = await db.scalars(
+            update(Order)
+            .where(Order.total_amount.is_distinct_from(total) | Order.final_amount.is_distinct_from(final))
+            .values(total_amount=total, final_amount=final)
+            .returning(Order.id),
+            execution_options={"synchronize_session": False}
         )
-        return total
\ No newline at end of file
+        return result.all()
+
@@ -1,45 +1,102 @@
-from typing import List
-from sqlalchemy.orm import Session
-from models import OrderItem 
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import apply_page
+from sqlalchemy.orm import joinedload
+from models import OrderItem
 
 class OrderItemRepository:
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[OrderItem]:
-        return db.query(OrderItem).offset(skip).limit(limit).all()
+    # item_name on the response reads OrderItem.menu_item, which can't be
+    # lazy-loaded on an AsyncSession; every query joins it in so a listing
+    # costs one statement no matter how many rows it returns
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[OrderItem]:
+        result = await db.scalars(apply_page(
+            select(OrderItem).options(joinedload(OrderItem.menu_item)),
+            OrderItem.id, skip, limit, after_id
+        ))
+        return result.all()
 
-    def get_by_id(self, db: Session, order_item_id: int) -> OrderItem:
-        return db.query(OrderItem).filter(OrderItem.id == order_item_id).first()
+    async def _reload(self, db: AsyncSession, order_item_id: int) -> OrderItem:
+        # one SELECT refreshes the row (server defaults) and its menu item
+        return await db.scalar(
+            select(OrderItem)
+            .options(joinedload(OrderItem.menu_item))
+            .where(OrderItem.id == order_item_id)
+            .execution_options(populate_existing=True)
+        )
+
+    async def get_by_id(self, db: AsyncSession, order_item_id: int) -> OrderItem:
+        return await db.scalar(
+            select(OrderItem)
+            .options(joinedload(OrderItem.menu_item))
+            .where(OrderItem.id == order_item_id)
+        )
 
-    def create(self, db: Session, order_item: OrderItem) -> OrderItem:
+    async def create(self, db: AsyncSession, order_item: OrderItem) -> OrderItem:
         db.add(order_item)
-        db.commit()
-        db.refresh(order_item)
-        return order_item
-
-    def update(self, db: Session, order_item: OrderItem) -> OrderItem:
-        db.merge(order_item)
-        db.commit()
-        db.refresh(order_item)
-        return order_item
-
-    def delete(self, db: Session, order_item: OrderItem) -> None:
-        db.delete(order_item)
-        db.commit()
-    
-    def find_by_order_id(self, db: Session, order_id: int) -> List[OrderItem]:
-        return db.query(OrderItem).filter(OrderItem.order_id == order_id).all()
-    
-    def find_by_order_and_menu(
+        await db.flush()
+        return await self._reload(db, order_item.id)
+
+    async def update(self, db: AsyncSession, order_item: OrderItem) -> OrderItem:
+        order_item = await db.merge(order_item)
+        await db.flush()
+        return await self._reload(db, order_item.id)
+
+    async def delete(self, db: AsyncSession, order_item: OrderItem) -> None:
+        await db.delete(order_item)
+        await db.flush()
+
+    async def find_by_order_id(self, db: AsyncSession, order_id: int) -> List[OrderItem]:
+        result = await db.scalars(
+            select(OrderItem)
+            .options(joinedload(OrderItem.menu_item))
+            .where(OrderItem.order_id == order_id)
+        )
+        return result.all()
+
+    async def find_by_order_and_menu(
         self,
-        db: Session,
+        db: AsyncSession,
         order_id: int,
         menu_item_id: int
     ):
-        return (
-            db.query(OrderItem)
-            .filter(
+        return await db.scalar(
+            select(OrderItem)
+            .options(joinedload(OrderItem.menu_item))
+            .where(
                 OrderItem.order_id == order_id,
                 OrderItem.menu_item_id == menu_item_id
             )
-            .first()
         )
-    
+
+    async def get_subtotals(self, db: AsyncSession, order_id: int, menu_item_ids: Iterable[int]) -> Dict[int, Decimal]:
+        """Current subtotal of the order's lines for `menu_item_ids`, keyed by menu item"""
+        result = await db.execute(
+            select(OrderItem.menu_item_id, OrderItem.subtotal)
+            .where(OrderItem.order_id == order_id, OrderItem.menu_item_id.in_(list(menu_item_ids)))
+        )
+        return {menu_item_id: subtotal for menu_item_id, subtotal in result}
+
+    async def upsert_many(self, db: AsyncSession, rows: List[dict]) -> List[dict]:
+        """
+        Insert order lines in one statement; a line whose (order_id, menu_item_id)
+        already exists gets the quantity added and the subtotal repriced.
+        Does not commit.
+        """
+        stmt = insert(OrderItem).values(rows)
+        quantity = OrderItem.quantity + stmt.excluded.quantity
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[OrderItem.order_id, OrderItem.menu_item_id],
+            set_={
+                "quantity": quantity,
+                "unit_price": stmt.excluded.unit_price,
+                "subtotal": quantity * stmt.excluded.unit_price,
+                "special_instructions": func.coalesce(
+                    stmt.excluded.special_instructions, OrderItem.special_instructions
+                ),
+            },
+        ).returning(*OrderItem.__table__.c)
+        result = await db.execute(stmt)
+        return [dict(row) for row in result.mappings()]
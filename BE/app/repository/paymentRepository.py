@@ -1,54 +1,49 @@
-from typing import List
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import apply_page
 from models import Payment, PaymentStatus, PaymentMethod
 
 class PaymentRepository:
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Payment]:
-        return db.query(Payment).offset(skip).limit(limit).all()
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Payment]:
+        result = await db.scalars(apply_page(select(Payment), Payment.id, skip, limit, after_id))
+        return result.all()
 
-    def get_by_id(self, db: Session, payment_id: int) -> Payment:
-        return db.query(Payment).filter(Payment.id == payment_id).first()
+    async def get_by_id(self, db: AsyncSession, payment_id: int) -> Payment:
+        return await db.get(Payment, payment_id)
 
-    def create(self, db: Session, payment: Payment) -> Payment:
+    async def create(self, db: AsyncSession, payment: Payment) -> Payment:
         db.add(payment)
-        db.commit()
-        db.refresh(payment)
+        await db.flush()
+        await db.refresh(payment)
         return payment
 
-    def update(self, db: Session, payment: Payment) -> Payment:
-        db.merge(payment)
-        db.commit()
-        db.refresh(payment)
+    async def update(self, db: AsyncSession, payment: Payment) -> Payment:
+        payment = await db.merge(payment)
+        await db.flush()
+        await db.refresh(payment)
         return payment
 
-    def delete(self, db: Session, payment: Payment) -> None:
-        db.delete(payment)
-        db.commit()
-    
-    def find_by_order_id(self, db: Session, order_id: int) -> List[Payment]:
-        return db.query(Payment).filter(Payment.order_id == order_id).all()
-    
-    def find_by_status(self, db: Session, status: str) -> List[Payment]:
-        return db.query(Payment).filter(Payment.payment_status == status).all()
-    
-    def find_by_orderid(self, db: Session, order_id: int) -> List[Payment]:
-        return db.query(Payment).filter(Payment.order_id == order_id).all()
-    
-    def find_by_transaction_id(self, db: Session, transaction_id: str) -> List[Payment]:
-        return db.query(Payment).filter(Payment.transaction_id == transaction_id).all()
-    
-    def update_payment_status(self , db: Session , payment_id: int , status: PaymentStatus ) -> Payment:
-        payment = db.query(Payment).filter(Payment.id == payment_id).first()
-        if payment:
-            payment.payment_status = status
-            db.commit()
-            db.refresh(payment)
-        return payment
-    
-    def update_payment_method(self , db: Session , payment_id: int , payment_method: PaymentMethod ) -> Payment:
-        payment = db.query(Payment).filter(Payment.id == payment_id).first()
-        if payment:
-            payment.payment_method = payment_method
-            db.commit()
-            db.refresh(payment)
-        return payment
\ No newline at end of file
+    async def delete(self, db: AsyncSession, payment: Payment) -> None:
+        await db.delete(payment)
+        await db.flush()
+
+    async def find_by_order_id(self, db: AsyncSession, order_id: int) -> List[Payment]:
+        result = await db.scalars(select(Payment).where(Payment.order_id == order_id))
+        return result.all()
+
+    async def find_by_status(self, db: AsyncSession, status: str) -> List[Payment]:
+        result = await db.scalars(select(Payment).where(Payment.payment_status == status))
+        return result.all()
+
+    async def find_by_orderid(self, db: AsyncSession, order_id: int) -> List[Payment]:
+        result = await db.scalars(select(Payment).where(Payment.order_id == order_id))
+        return result.all()
+
+    async def find_by_transaction_id(self, db: AsyncSession, transaction_id: str) -> List[Payment]:
+        result = await db.scalars(select(Payment).where(Payment.transaction_id == transaction_id))
+        return result.all()
+
+    async def get_for_update(self, db: AsyncSession, payment_id: int) -> Payment:
+        """Load and row-lock a payment so concurrent status changes apply one at a time"""
+        return await db.get(Payment, payment_id, with_for_update=True, populate_existing=True)
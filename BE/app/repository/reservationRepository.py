@@ -1,35 +1,67 @@
-from typing import List
-from sqlalchemy.orm import Session
-from models import Reservation
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+from sqlalchemy import select, func, exists, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import apply_page
+from models import Reservation, Table, HOLDING_STATUSES
+
+# rendered as literals so the planner can match the partial GiST index
+# behind reservations_no_overlap, which only covers holding reservations
+_holding = bindparam("holding", list(HOLDING_STATUSES), expanding=True, literal_execute=True)
+
 
 class ReservationRepository:
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Reservation]:
-        return db.query(Reservation).offset(skip).limit(limit).all()
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Reservation]:
+        result = await db.scalars(apply_page(select(Reservation), Reservation.id, skip, limit, after_id))
+        return result.all()
 
-    def get_by_id(self, db: Session, reservation_id: int) -> Reservation:
-        return db.query(Reservation).filter(Reservation.id == reservation_id).first()
+    async def get_by_id(self, db: AsyncSession, reservation_id: int) -> Reservation:
+        return await db.get(Reservation, reservation_id)
 
-    def create(self, db: Session, reservation_obj: Reservation) -> Reservation:
+    async def create(self, db: AsyncSession, reservation_obj: Reservation) -> Reservation:
         db.add(reservation_obj)
-        db.commit()
-        db.refresh(reservation_obj)
+        await db.flush()
+        await db.refresh(reservation_obj)
         return reservation_obj
 
-    def update(self, db: Session, reservation_obj: Reservation) -> Reservation:
-        db.merge(reservation_obj)
-        db.commit()
-        db.refresh(reservation_obj)
+    async def update(self, db: AsyncSession, reservation_obj: Reservation) -> Reservation:
+        reservation_obj = await db.merge(reservation_obj)
+        await db.flush()
+        await db.refresh(reservation_obj)
         return reservation_obj
 
-    def delete(self, db: Session, reservation_obj: Reservation) -> None:
-        db.delete(reservation_obj)
-        db.commit()
-    
-    def find_by_customer_id(self, db: Session, customer_id: int) -> List[Reservation]:
-        return db.query(Reservation).filter(Reservation.customer_id == customer_id).all()
-    
-    def find_by_date(self, db: Session, reservation_date: str) -> List[Reservation]:
-        return db.query(Reservation).filter(Reservation.reservation_date == reservation_date).all()
-    
-    def find_by_status(self, db: Session, status: str) -> List[Reservation]:
-        return db.query(Reservation).filter(Reservation.status == status).all()
\ No newline at end of file
+    async def delete(self, db: AsyncSession, reservation_obj: Reservation) -> None:
+        await db.delete(reservation_obj)
+        await db.flush()
+
+    async def find_by_customer_id(self, db: AsyncSession, customer_id: int) -> List[Reservation]:
+        result = await db.scalars(select(Reservation).where(Reservation.customer_id == customer_id))
+        return result.all()
+
+    async def find_by_date(self, db: AsyncSession, day: date) -> List[Reservation]:
+        """Reservations whose slot touches `day`, in start order"""
+        start = datetime.combine(day, time.min)
+        result = await db.scalars(
+            select(Reservation)
+            .where(Reservation.slot.overlaps(func.tsrange(start, start + timedelta(days=1))))
+            .order_by(Reservation.reservation_date, Reservation.id)
+        )
+        return result.all()
+
+    async def find_bookable_tables(self, db: AsyncSession, start: datetime, end: datetime, guests: int) -> List[Table]:
+        """Tables seating `guests` that no holding reservation claims during [start, end), smallest first"""
+        taken = exists().where(
+            Reservation.table_id == Table.id,
+            Reservation.status.in_(_holding),
+            Reservation.slot.overlaps(func.tsrange(start, end)),
+        )
+        result = await db.scalars(
+            select(Table)
+            .where(Table.table_size >= guests, ~taken)
+            .order_by(Table.table_size, Table.table_number)
+        )
+        return result.all()
+
+    async def find_by_status(self, db: AsyncSession, status: str) -> List[Reservation]:
+        result = await db.scalars(select(Reservation).where(Reservation.status == status))
+        return result.all()
@@ -0,0 +1,96 @@
+from datetime import date
+from typing import List, Optional, Sequence
+from sqlalchemy import select, delete, func, cast, text, Date, SmallInteger
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import RevenueDaily, Payment, PaymentStatus, Order
+
+# columns a revenue query may group by
+GROUP_COLUMNS = {
+    "day": RevenueDaily.day,
+    "hour": RevenueDaily.hour,
+    "payment_method": RevenueDaily.payment_method,
+    "staff": RevenueDaily.staff_id,
+}
+
+
+class RevenueRepository:
+    async def add(self, db: AsyncSession, key: dict, completed_count: int = 0, completed_amount=0,
+                  refunded_count: int = 0, refunded_amount=0) -> None:
+        """Shift one rollup bucket by signed deltas, creating it if needed; does not commit"""
+        stmt = insert(RevenueDaily).values(
+            **key,
+            completed_count=completed_count,
+            completed_amount=completed_amount,
+            refunded_count=refunded_count,
+            refunded_amount=refunded_amount,
+        )
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[RevenueDaily.day, RevenueDaily.hour, RevenueDaily.payment_method, RevenueDaily.staff_id],
+            set_={
+                "completed_count": RevenueDaily.completed_count + stmt.excluded.completed_count,
+                "completed_amount": RevenueDaily.completed_amount + stmt.excluded.completed_amount,
+                "refunded_count": RevenueDaily.refunded_count + stmt.excluded.refunded_count,
+                "refunded_amount": RevenueDaily.refunded_amount + stmt.excluded.refunded_amount,
+                "updated_at": func.now(),
+            },
+        ))
+
+    async def rebuild(self, db: AsyncSession, since: Optional[date] = None, until: Optional[date] = None) -> int:
+        """Recompute the buckets of [since, until) from payments; returns the bucket count, does not commit"""
+        # incremental updates wait until the rebuilt buckets are committed, and
+        # any that committed before the lock are already visible to the SELECT
+        await db.execute(text(f"LOCK TABLE {RevenueDaily.__table__.fullname} IN EXCLUSIVE MODE"))
+        day = cast(Payment.payment_date, Date)
+        hour = cast(func.extract("hour", Payment.payment_date), SmallInteger)
+        staff_id = func.coalesce(Order.staff_id, 0)
+        cleared = delete(RevenueDaily)
+        source = (
+            select(
+                day,
+                hour,
+                Payment.payment_method,
+                staff_id,
+                func.count().filter(Payment.payment_status == PaymentStatus.completed),
+                func.coalesce(func.sum(Payment.amount_paid).filter(Payment.payment_status == PaymentStatus.completed), 0),
+                func.count().filter(Payment.payment_status == PaymentStatus.refunded),
+                func.coalesce(func.sum(Payment.amount_paid).filter(Payment.payment_status == PaymentStatus.refunded), 0),
+            )
+            .outerjoin(Order, Order.id == Payment.order_id)
+            .where(Payment.payment_status.in_((PaymentStatus.completed, PaymentStatus.refunded)))
+            .group_by(day, hour, Payment.payment_method, staff_id)
+        )
+        if since is not None:
+            cleared = cleared.where(RevenueDaily.day >= since)
+            source = source.where(Payment.payment_date >= since)
+        if until is not None:
+            cleared = cleared.where(RevenueDaily.day < until)
+            source = source.where(Payment.payment_date < until)
+        await db.execute(cleared, execution_options={"synchronize_session": False})
+        result = await db.execute(
+            insert(RevenueDaily).from_select(
+                ["day", "hour", "payment_method", "staff_id",
+                 "completed_count", "completed_amount", "refunded_count", "refunded_amount"],
+                source,
+            )
+        )
+        return result.rowcount
+
+    async def get_range(self, db: AsyncSession, since: Optional[date], until: Optional[date],
+                        group_by: Sequence[str]) -> List[dict]:
+        keys = [GROUP_COLUMNS[name].label(name) for name in group_by]
+        stmt = select(
+            *keys,
+            func.coalesce(func.sum(RevenueDaily.completed_count), 0).label("payments"),
+            func.coalesce(func.sum(RevenueDaily.completed_amount), 0).label("revenue"),
+            func.coalesce(func.sum(RevenueDaily.refunded_count), 0).label("refunds"),
+            func.coalesce(func.sum(RevenueDaily.refunded_amount), 0).label("refunded"),
+        )
+        if since is not None:
+            stmt = stmt.where(RevenueDaily.day >= since)
+        if until is not None:
+            stmt = stmt.where(RevenueDaily.day < until)
+        if keys:
+            stmt = stmt.group_by(*keys).order_by(*keys)
+        result = await db.execute(stmt)
+        return [dict(row) for row in result.mappings()]
@@ -1,34 +1,38 @@
-from typing import List
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import apply_page
 from models import Review
 
 class ReviewRepository:
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Review]:
-        return db.query(Review).offset(skip).limit(limit).all()
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Review]:
+        result = await db.scalars(apply_page(select(Review), Review.id, skip, limit, after_id))
+        return result.all()
 
-    def get_by_id(self, db: Session, review_id: int) -> Review:
-        return db.query(Review).filter(Review.id == review_id).first()
+    async def get_by_id(self, db: AsyncSession, review_id: int) -> Review:
+        return await db.get(Review, review_id)
 
-    def create(self, db: Session, review_obj: Review) -> Review:
+    async def create(self, db: AsyncSession, review_obj: Review) -> Review:
         db.add(review_obj)
-        db.commit()
-        db.refresh(review_obj)
+        await db.flush()
+        await db.refresh(review_obj)
         return review_obj
 
-    def update(self, db: Session, review_obj: Review) -> Review:
-        db.merge(review_obj)
-        db.commit()
-        db.refresh(review_obj)
+    async def update(self, db: AsyncSession, review_obj: Review) -> Review:
+        review_obj = await db.merge(review_obj)
+        await db.flush()
+        await db.refresh(review_obj)
         return review_obj
 
-    def delete(self, db: Session, review_obj: Review) -> None:
-        db.delete(review_obj)
-        db.commit()
-    
-    def find_by_customer_id(self, db: Session, customer_id: int) -> List[Review]:
-        return db.query(Review).filter(Review.customer_id == customer_id).all()
-    
-    def find_by_rating(self, db: Session, rating: int) -> List[Review]:
-        return db.query(Review).filter(Review.rating == rating).all()
-    
-    
\ No newline at end of file
+    async def delete(self, db: AsyncSession, review_obj: Review) -> None:
+        await db.delete(review_obj)
+        await db.flush()
+
+    async def find_by_customer_id(self, db: AsyncSession, customer_id: int) -> List[Review]:
+        result = await db.scalars(select(Review).where(Review.customer_id == customer_id))
+        return result.all()
+
+    async def find_by_rating(self, db: AsyncSession, rating: int) -> List[Review]:
+        result = await db.scalars(select(Review).where(Review.rating == rating))
+        return result.all()
+
@@ -1,59 +1,59 @@
-from typing import List
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from sqlalchemy import exists, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import apply_page
 from models import Staff
 
 class StaffRepository:
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100):
-        return db.query(Staff).offset(skip).limit(limit).all()
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+        result = await db.scalars(apply_page(select(Staff), Staff.id, skip, limit, after_id))
+        return result.all()
 
-    def get_by_id(self, db: Session, staff_id: int):
-        return db.query(Staff).filter(Staff.id == staff_id).first()
+    async def get_by_id(self, db: AsyncSession, staff_id: int):
+        return await db.get(Staff, staff_id)
 
-    def create(self, db: Session, staff: Staff):
+    async def create(self, db: AsyncSession, staff: Staff):
         db.add(staff)
-        db.commit()
-        db.refresh(staff)
+        # INSERT ... RETURNING already brings back the server defaults
+        await db.flush()
         return staff
 
-    def update(self, db: Session, staff: Staff):
-        db.merge(staff)
-        db.commit()
-        db.refresh(staff)
+    async def update(self, db: AsyncSession, staff: Staff):
+        staff = await db.merge(staff)
+        await db.flush()
+        await db.refresh(staff)
         return staff
 
-    def delete(self, db: Session, staff: Staff):
-        db.delete(staff)
-        db.commit()
-    
-    def find_by_username(self, db: Session, username: str):
-        return db.query(Staff).filter(Staff.username == username).first()
-    
-    def find_by_email(self, db: Session, email: str):
-        return db.query(Staff).filter(Staff.email == email).first()
+    async def delete(self, db: AsyncSession, staff: Staff):
+        await db.delete(staff)
+        await db.flush()
 
-    def exists_by_username(self, db: Session, username: str) -> bool:
-        #return true if username exists, else false
-        return db.query(Staff).filter(Staff.username == username).count() > 0
-    
-    def exists_by_email(self, db: Session, email: str) -> bool:
-        #return true if email exists, else false
-        return db.query(Staff).filter(Staff.email == email).count() > 0
+    async def find_by_username(self, db: AsyncSession, username: str):
+        return await db.scalar(select(Staff).where(Staff.username == username))
 
-    
-    def search_by_name(self, db: Session, full_name: str):
-        return db.query(Staff).filter(Staff.full_name.ilike(f"%{full_name}%")).all()
+    async def find_by_email(self, db: AsyncSession, email: str):
+        return await db.scalar(select(Staff).where(Staff.email == email))
 
-    def count(self, db: Session) -> int:
-        return db.query(Staff).count()
+    async def exists_by_username(self, db: AsyncSession, username: str) -> bool:
+        return await db.scalar(select(exists().where(Staff.username == username)))
 
-    def get_admin(self, db: Session):
-        return db.query(Staff).filter(Staff.username == "admin").first()
+    async def exists_by_email(self, db: AsyncSession, email: str) -> bool:
+        return await db.scalar(select(exists().where(Staff.email == email)))
 
 
-    def init_admin(self, db: Session):
+    async def search_by_name(self, db: AsyncSession, full_name: str):
+        result = await db.scalars(select(Staff).where(Staff.full_name.ilike(f"%{full_name}%")))
+        return result.all()
+
+    async def count(self, db: AsyncSession) -> int:
+        return await db.scalar(select(func.count()).select_from(Staff))
+
+    async def get_admin(self, db: AsyncSession):
+        return await db.scalar(select(Staff).where(Staff.username == "admin"))
+
+
+    async def init_admin(self, db: AsyncSession):
         admin = Staff(username="admin", password_hashed="admin", full_name="admin", email="admin", phone="admin")
-        if not self.get_admin(db):
-            self.create(db, admin)
-    
-        
-        
\ No newline at end of file
+        if not await self.get_admin(db):
+            await self.create(db, admin)
+
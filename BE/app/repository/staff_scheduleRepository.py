@@ -1,74 +1,139 @@
-from typing import List
-from sqlalchemy.orm import Session
-from models import StaffSchedule, workDay, workShift
+from typing import Iterable, List, Optional
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import apply_page
+from models import StaffSchedule, Staff, StaffRole, workDay, workShift
 from schemas import StaffScheduleCreateDTO, StaffScheduleUpdateDTO
 
 class StaffScheduleRepository:
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[StaffSchedule]:
-        return db.query(StaffSchedule).offset(skip).limit(limit).all()
-    
-    
-    def get_by_id(self, db: Session, schedule_id: int) -> StaffSchedule:
-        return db.query(StaffSchedule).filter(StaffSchedule.id == schedule_id).first()
-
-    def create(self , db: Session, schedule: StaffSchedule ) -> StaffSchedule:
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[StaffSchedule]:
+        result = await db.scalars(apply_page(select(StaffSchedule), StaffSchedule.id, skip, limit, after_id))
+        return result.all()
+
+
+    async def get_by_id(self, db: AsyncSession, schedule_id: int) -> StaffSchedule:
+        return await db.get(StaffSchedule, schedule_id)
+
+    async def create(self , db: AsyncSession, schedule: StaffSchedule ) -> StaffSchedule:
         db.add(schedule)
-        db.commit()
-        db.refresh(schedule)
+        await db.flush()
+        await db.refresh(schedule)
         return schedule
-    
-    
-    def update_schedule_by_id(self,db:Session, schedule_id:int , updated_schedule:StaffScheduleUpdateDTO):
-        schedule = db.query(StaffSchedule).filter(StaffSchedule.id == schedule_id).first()
+
+
+    async def update_schedule_by_id(self,db:AsyncSession, schedule_id:int , updated_schedule:StaffScheduleUpdateDTO):
+        schedule = await db.get(StaffSchedule, schedule_id)
         if not schedule:
             return None
-        
+
         update_data = updated_schedule.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(schedule, key, value)
-        
-        db.commit()
-        db.refresh(schedule)
+
+        await db.flush()
+        await db.refresh(schedule)
         return schedule
-    
-    def delete(self, db: Session, schedule: StaffSchedule) -> None:
-        db.delete(schedule)
-        db.commit()
-    
-    def find_by_staff_id(self, db: Session, staff_id: int) -> List[StaffSchedule]:
-        return db.query(StaffSchedule).filter(StaffSchedule.staff_id == staff_id).all()
-    
-    def find_by_day_and_shift(self, db: Session, work_day: workDay, work_shift: workShift) -> List[StaffSchedule]:
-        return db.query(StaffSchedule).filter(
+
+    async def delete(self, db: AsyncSession, schedule: StaffSchedule) -> None:
+        await db.delete(schedule)
+        await db.flush()
+
+    async def get_coverage(self, db: AsyncSession, role: Optional[StaffRole] = None) -> List[dict]:
+        """Every assignment with its staff member's name and role, in one joined query"""
+        stmt = (
+            select(
+                StaffSchedule.id.label("schedule_id"),
+                StaffSchedule.work_day,
+                StaffSchedule.work_shift,
+                Staff.id.label("staff_id"),
+                Staff.full_name,
+                Staff.role,
+            )
+            .join(Staff, Staff.id == StaffSchedule.staff_id)
+            .order_by(Staff.full_name, StaffSchedule.id)
+        )
+        if role is not None:
+            stmt = stmt.where(Staff.role == role)
+        result = await db.execute(stmt)
+        return [dict(row) for row in result.mappings()]
+
+    async def find_existing_staff_ids(self, db: AsyncSession, staff_ids: Iterable[int]) -> set:
+        result = await db.scalars(select(Staff.id).where(Staff.id.in_(list(staff_ids))))
+        return set(result.all())
+
+    async def find_assignments(self, db: AsyncSession, staff_ids: Optional[Iterable[int]] = None) -> List[StaffSchedule]:
+        """Current assignments of `staff_ids` (everyone when None), locked until commit"""
+        stmt = select(StaffSchedule).with_for_update()
+        if staff_ids is not None:
+            stmt = stmt.where(StaffSchedule.staff_id.in_(list(staff_ids)))
+        result = await db.scalars(stmt)
+        return result.all()
+
+    async def insert_missing(self, db: AsyncSession, rows: List[dict]) -> List[dict]:
+        """
+        Insert assignments in one statement, skipping any that already exist
+        (staff_id, work_day, work_shift); returns the inserted rows. Does not commit.
+        """
+        if not rows:
+            return []
+        result = await db.execute(
+            insert(StaffSchedule)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["staff_id", "work_day", "work_shift"])
+            .returning(StaffSchedule.id, StaffSchedule.staff_id, StaffSchedule.work_day, StaffSchedule.work_shift)
+        )
+        return [dict(row) for row in result.mappings()]
+
+    async def delete_by_ids(self, db: AsyncSession, schedule_ids: List[int]) -> None:
+        """Does not commit"""
+        if schedule_ids:
+            await db.execute(
+                delete(StaffSchedule).where(StaffSchedule.id.in_(schedule_ids)),
+                execution_options={"synchronize_session": False}
+            )
+
+    async def find_by_staff_id(self, db: AsyncSession, staff_id: int) -> List[StaffSchedule]:
+        result = await db.scalars(select(StaffSchedule).where(StaffSchedule.staff_id == staff_id))
+        return result.all()
+
+    async def find_by_day_and_shift(self, db: AsyncSession, work_day: workDay, work_shift: workShift) -> List[StaffSchedule]:
+        result = await db.scalars(select(StaffSchedule).where(
             StaffSchedule.work_day == work_day,
             StaffSchedule.work_shift == work_shift
-        ).all()
-        
-    def find_by_day(self, db: Session, work_day: workDay) -> List[StaffSchedule]:
-        return db.query(StaffSchedule).filter(
+        ))
+        return result.all()
+
+    async def find_by_day(self, db: AsyncSession, work_day: workDay) -> List[StaffSchedule]:
+        result = await db.scalars(select(StaffSchedule).where(
             StaffSchedule.work_day == work_day
-        ).all()
-        
-    def find_by_shift(self, db: Session, work_shift: workShift) -> List[StaffSchedule]:
-        return db.query(StaffSchedule).filter(
+        ))
+        return result.all()
+
+    async def find_by_shift(self, db: AsyncSession, work_shift: workShift) -> List[StaffSchedule]:
+        result = await db.scalars(select(StaffSchedule).where(
             StaffSchedule.work_shift == work_shift
-        ).all()
-        
-    def find_by_staff_and_day(self, db: Session, staff_id: int, work_day: workDay) -> List[StaffSchedule]:
-        return db.query(StaffSchedule).filter(
+        ))
+        return result.all()
+
+    async def find_by_staff_and_day(self, db: AsyncSession, staff_id: int, work_day: workDay) -> List[StaffSchedule]:
+        result = await db.scalars(select(StaffSchedule).where(
             StaffSchedule.staff_id == staff_id,
             StaffSchedule.work_day == work_day
-        ).all()
-        
-    def find_by_staff_and_shift(self, db: Session, staff_id: int, work_shift: workShift) -> List[StaffSchedule]:
-        return db.query(StaffSchedule).filter(
+        ))
+        return result.all()
+
+    async def find_by_staff_and_shift(self, db: AsyncSession, staff_id: int, work_shift: workShift) -> List[StaffSchedule]:
+        result = await db.scalars(select(StaffSchedule).where(
             StaffSchedule.staff_id == staff_id,
             StaffSchedule.work_shift == work_shift
-        ).all()
-    
-    def find_by_staff_and_day_and_shift(self, db: Session, staff_id: int, work_day: workDay, work_shift: workShift) -> List[StaffSchedule]:
-        return db.query(StaffSchedule).filter(
+        ))
+        return result.all()
+
+    async def find_by_staff_and_day_and_shift(self, db: AsyncSession, staff_id: int, work_day: workDay, work_shift: workShift) -> List[StaffSchedule]:
+        result = await db.scalars(select(StaffSchedule).where(
             StaffSchedule.staff_id == staff_id,
             StaffSchedule.work_day == work_day,
             StaffSchedule.work_shift == work_shift
-        ).all()
\ No newline at end of file
+        ))
+        return result.all()
@@ -1,49 +1,48 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import apply_page
 from models import Table
-from typing import List, Optional 
-from sqlalchemy import Column
+from typing import Iterable, List, Optional
 
 class TableRepository:
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Table]:
-        return db.query(Table).offset(skip).limit(limit).all()
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Table]:
+        result = await db.scalars(apply_page(select(Table), Table.id, skip, limit, after_id))
+        return result.all()
 
-    def get_by_id(self, db: Session, table_id: int) -> Optional[Table]:
-        return db.query(Table).filter(Table.id == table_id).first()
+    async def get_by_id(self, db: AsyncSession, table_id: int) -> Optional[Table]:
+        return await db.get(Table, table_id)
 
-    def create(self, db: Session, table: Table) -> Table:
+    async def create(self, db: AsyncSession, table: Table) -> Table:
         db.add(table)
-        db.commit()
-        db.refresh(table)
+        await db.flush()
+        await db.refresh(table)
         return table
 
-    def update(self, db: Session, table: Table) -> Table:
-        db.merge(table)
-        db.commit()
-        db.refresh(table)
+    async def update(self, db: AsyncSession, table: Table) -> Table:
+        table = await db.merge(table)
+        await db.flush()
+        await db.refresh(table)
         return table
 
-    def delete(self, db: Session, table: Table) -> None:
-        db.delete(table)
-        db.commit()
-    
-    def find_by_size(self, db: Session, size: int) -> List[Table]:
-        return db.query(Table).filter(Table.table_size == size).all()
-    
-
-    def update_table_status(self, db: Session, table_id: int , is_occupied: bool)-> Optional[Table]:
-        table = db.query(Table).filter(Table.id == table_id).first()
-        if table: 
-            table.is_occupied = is_occupied
-            db.commit()
-            db.refresh(table)
-        return table
-    
-    def get_available_tables(self,db: Session)->List[Table]:
-        return db.query(Table).filter(Table.is_occupied == False).all()
-    
-    def get_sized_available_tables(self, db: Session, size: int)->List[Table]:
-        return db.query(Table).filter(Table.is_occupied == False, Table.table_size == size).all()
-    
-    def get_unavailable_tables(self,db: Session)->List[Table]:
-        return db.query(Table).filter(Table.is_occupied == True).all()
-    
\ No newline at end of file
+    async def delete(self, db: AsyncSession, table: Table) -> None:
+        await db.delete(table)
+        await db.flush()
+
+    async def get_occupancy(self, db: AsyncSession, table_ids: Optional[Iterable[int]] = None) -> List[Table]:
+        """Tables as committed (all, or just `table_ids`), ignoring stale copies in the session"""
+        stmt = select(Table).order_by(Table.id).execution_options(populate_existing=True)
+        if table_ids is not None:
+            stmt = stmt.where(Table.id.in_(list(table_ids)))
+        result = await db.scalars(stmt)
+        return result.all()
+
+    async def find_by_size(self, db: AsyncSession, size: int) -> List[Table]:
+        result = await db.scalars(select(Table).where(Table.table_size == size))
+        return result.all()
+
+
+    async def update_table_status(self, db: AsyncSession, table_id: int , is_occupied: bool)-> Optional[Table]:
+        return await db.scalar(
+            update(Table).where(Table.id == table_id).values(is_occupied=is_occupied).returning(Table),
+            execution_options={"populate_existing": True}
+        )
@@ -1,38 +1,40 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import VipRequest, VipRequestStatus
 from typing import List, Optional
 
 class VipRequestRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, customer_id: int, reason: str = None) -> VipRequest:
+    async def create(self, customer_id: int, reason: str = None) -> VipRequest:
         new_request = VipRequest(
             customer_id=customer_id,
             reason=reason
         )
         self.db.add(new_request)
-        self.db.commit()
-        self.db.refresh(new_request)
+        await self.db.flush()
+        await self.db.refresh(new_request)
         return new_request
 
-    def get_by_customer_and_status(self, customer_id: int, status: VipRequestStatus) -> Optional[VipRequest]:
-        return self.db.query(VipRequest).filter(
+    async def get_by_customer_and_status(self, customer_id: int, status: VipRequestStatus) -> Optional[VipRequest]:
+        return await self.db.scalar(select(VipRequest).where(
             VipRequest.customer_id == customer_id,
             VipRequest.status == status
-        ).first()
+        ))
 
-    def get_all(self, status: str = None) -> List[VipRequest]:
-        query = self.db.query(VipRequest)
+    async def get_all(self, status: str = None) -> List[VipRequest]:
+        query = select(VipRequest)
         if status and status in VipRequestStatus.__members__:
-            query = query.filter(VipRequest.status == VipRequestStatus[status])
-        return query.all()
+            query = query.where(VipRequest.status == VipRequestStatus[status])
+        result = await self.db.scalars(query)
+        return result.all()
 
-    def get_by_id(self, request_id: int) -> Optional[VipRequest]:
-        return self.db.query(VipRequest).filter(VipRequest.id == request_id).first()
+    async def get_by_id(self, request_id: int) -> Optional[VipRequest]:
+        return await self.db.get(VipRequest, request_id)
 
-    def update(self, vip_request: VipRequest) -> VipRequest:
+    async def update(self, vip_request: VipRequest) -> VipRequest:
         self.db.add(vip_request)
-        self.db.commit()
-        self.db.refresh(vip_request)
+        await self.db.flush()
+        await self.db.refresh(vip_request)
         return vip_request
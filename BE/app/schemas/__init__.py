@@ -1,12 +1,15 @@
 from .customerDTO import CustomerCreateDTO, CustomerUpdateDTO, CustomerResponse
 from .menu_itemDTO import MenuItemCreateDTO, MenuItemUpdateDTO, MenuItemResponse
-from .order_itemDTO import OrderItemCreateDTO, OrderItemUpdateDTO, OrderItemResponse
-from .orderDTO import OrderCreateDTO, OrderUpdateDTO, OrderResponseDTO
+from .order_itemDTO import OrderItemCreateDTO, OrderItemUpdateDTO, OrderItemResponse, OrderItemLineDTO, OrderItemBatchCreateDTO
+from .orderDTO import OrderCreateDTO, OrderUpdateDTO, OrderResponseDTO, OrderWithItemsCreateDTO, OrderWithItemsResponseDTO
 from .paymentDTO import PaymentCreateDTO,PaymentResponse
 from .reservationDTO import ReservationCreateDTO, ReservationUpdateDTO, ReservationResponse
 from .reviewDTO import ReviewCreateDTO, ReviewUpdateDTO, ReviewResponse
-from .staff_scheduleDTO import StaffScheduleCreateDTO, StaffScheduleUpdateDTO, StaffScheduleResponse
+from .staff_scheduleDTO import StaffScheduleDTO, StaffScheduleCreateDTO, StaffScheduleUpdateDTO, StaffScheduleResponse, CoverageStaff, CoverageCell, StaffScheduleBulkDTO, StaffScheduleWeekDTO, ScheduleOutcome, StaffScheduleBulkResponse, StaffScheduleWeekResponse
 from .staffDTO import StaffCreateDTO, StaffUpdateDTO, StaffResponse
 from .tableDTO import TableCreateDTO, TableUpdateDTO, TableResponse, TableStatusUpdateDTO
 from .LoginDTO import LoginRequestDTO, LoginResponseDTO
 from .LoginDTO import LoginRequestDTO, LoginResponseDTO
+from .pageDTO import PageResponse, ChangesResponse
+from .analyticsDTO import SummaryResponse, HourBreakdown, PaymentMethodBreakdown, StaffBreakdown, RevenueRow
+from .importDTO import ImportRowError, ImportResponse
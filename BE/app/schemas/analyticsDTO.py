@@ -0,0 +1,55 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+from models import PaymentMethod
+
+
+class HourBreakdown(BaseModel):
+    hour: int
+    orders: int
+    revenue: float
+
+
+class PaymentMethodBreakdown(BaseModel):
+    payment_method: PaymentMethod
+    payments: int
+    revenue: float
+
+
+class StaffBreakdown(BaseModel):
+    staff_id: Optional[int]
+    full_name: Optional[str]
+    orders: int
+    revenue: float
+
+
+class SummaryResponse(BaseModel):
+    period: str
+    since: Optional[datetime]
+    until: Optional[datetime]
+    generated_at: datetime
+    revenue: float
+    refunded: float
+    completed_payments: int
+    pending_payments: int
+    orders: int
+    paid_orders: int
+    cancelled_orders: int
+    active_orders: int
+    tables: int
+    occupied_tables: int
+    by_hour: Optional[List[HourBreakdown]] = None
+    by_payment_method: Optional[List[PaymentMethodBreakdown]] = None
+    by_staff: Optional[List[StaffBreakdown]] = None
+
+
+class RevenueRow(BaseModel):
+    # only the group_by columns that were requested are present
+    day: Optional[date] = None
+    hour: Optional[int] = None
+    payment_method: Optional[PaymentMethod] = None
+    staff_id: Optional[int] = None
+    payments: int
+    revenue: float
+    refunds: int
+    refunded: float
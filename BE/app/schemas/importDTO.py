@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportResponse(BaseModel):
+    kind: str
+    rows: int
+    invalid: int
+    inserted: int
+    # valid rows whose unique key (table number, username, email) already existed
+    skipped: int
+    errors: List[ImportRowError]
@@ -3,6 +3,7 @@ from typing import Optional, List
 from datetime import datetime
 from enum import Enum
 from models import OrderStatus, PaymentMethod
+from .order_itemDTO import OrderItemLineDTO, OrderItemResponse
 
 class OrderDTO(BaseModel):
     notes: Optional[str] = None
@@ -14,6 +15,10 @@ class OrderCreateDTO(OrderDTO):
     staff_id: Optional[int] = None
 
 
+class OrderWithItemsCreateDTO(OrderCreateDTO):
+    items: List[OrderItemLineDTO] = Field(..., min_length=1)
+
+
 class OrderUpdateDTO(BaseModel):
     status: Optional[OrderStatus] = None
     payment_method: Optional[PaymentMethod] = None
@@ -40,3 +45,7 @@ class OrderResponseDTO(OrderDTO):
 
     class Config:
         from_attributes = True
+
+
+class OrderWithItemsResponseDTO(OrderResponseDTO):
+    items: List[OrderItemResponse]
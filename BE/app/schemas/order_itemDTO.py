@@ -1,6 +1,6 @@
 # schemas/order_item.py (renamed for clarity)
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 class OrderItemCreateDTO(BaseModel):
@@ -9,6 +9,14 @@ class OrderItemCreateDTO(BaseModel):
     quantity: int = Field(..., gt=0, description="Quantity must be at least 1")
     special_instructions: Optional[str] = None
 
+class OrderItemLineDTO(BaseModel):
+    menu_item_id: int = Field(..., gt=0)
+    quantity: int = Field(..., gt=0, description="Quantity must be at least 1")
+    special_instructions: Optional[str] = None
+
+class OrderItemBatchCreateDTO(BaseModel):
+    items: List[OrderItemLineDTO] = Field(..., min_length=1)
+
 class OrderItemUpdateDTO(BaseModel):
     quantity: Optional[int] = Field(None, gt=0)
     special_instructions: Optional[str] = None
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class PageResponse(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class ChangesResponse(BaseModel, Generic[T]):
+    changes: List[T]
+    deleted: List[int]
+    next_token: str
+    has_more: bool
@@ -13,7 +13,8 @@ class ReservationDTO(BaseModel):
     customer_id: int = Field(..., gt=0)
     table_id: int = Field(..., gt=0)
     reservation_date: datetime
-    duration_hours: Optional[int] = 2
+    # the slot tsrange is built from this; same bounds as /reservations/availability
+    duration_hours: int = Field(2, ge=1, le=12)
     number_of_guests: int = Field(..., gt=0)
     status: Optional[ReservationStatus] = ReservationStatus.pending
     special_requests: Optional[str] = None
@@ -25,7 +26,7 @@ class ReservationCreateDTO(ReservationDTO):
 class ReservationUpdateDTO(BaseModel):
     table_id: Optional[int] = Field(None, gt=0)
     reservation_date: Optional[datetime] = None
-    duration_hours: Optional[int] = None
+    duration_hours: int = Field(2, ge=1, le=12)
     number_of_guests: Optional[int] = Field(None, gt=0)
     status: Optional[ReservationStatus] = None
     special_requests: Optional[str] = None
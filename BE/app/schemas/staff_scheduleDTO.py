@@ -1,8 +1,8 @@
-from pydantic import BaseModel,Field
-from typing import Optional
+from pydantic import BaseModel,Field,model_validator
+from typing import List, Literal, Optional
 from datetime import datetime
 from enum import Enum
-from models import workDay, workShift
+from models import workDay, workShift, StaffRole
 
 
 
@@ -28,3 +28,52 @@ class StaffScheduleResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class CoverageStaff(BaseModel):
+    schedule_id: int
+    staff_id: int
+    full_name: str
+    role: StaffRole
+
+class CoverageCell(BaseModel):
+    work_day: workDay
+    work_shift: workShift
+    count: int
+    understaffed: bool
+    staff: List[CoverageStaff]
+
+
+class StaffScheduleBulkDTO(BaseModel):
+    entries: List[StaffScheduleDTO] = Field(..., max_length=5000)
+
+class StaffScheduleWeekDTO(BaseModel):
+    entries: List[StaffScheduleDTO] = Field(..., max_length=5000)
+    # replace only these staff members' weeks; everyone's when omitted
+    staff_ids: Optional[List[int]] = None
+
+    @model_validator(mode="after")
+    def _not_a_blanket_delete(self):
+        # an empty rota for everyone would delete every assignment; clearing
+        # weeks has to name whose
+        if not self.entries and self.staff_ids is None:
+            raise ValueError("entries is empty: pass staff_ids to clear those staff members' weeks")
+        return self
+
+class ScheduleOutcome(BaseModel):
+    staff_id: int
+    work_day: workDay
+    work_shift: workShift
+    status: Literal["created", "exists", "unchanged", "duplicate", "unknown_staff", "out_of_scope"]
+    schedule_id: Optional[int] = None
+
+class StaffScheduleBulkResponse(BaseModel):
+    created: int
+    skipped: int
+    results: List[ScheduleOutcome]
+
+class StaffScheduleWeekResponse(BaseModel):
+    created: int
+    unchanged: int
+    skipped: int
+    deleted: List[int]
+    results: List[ScheduleOutcome]
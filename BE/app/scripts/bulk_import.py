@@ -0,0 +1,52 @@
+"""
+Bulk-load menu items, tables, staff or customers from CSV (with a header row)
+or NDJSON, the same pipeline as POST /imports/{kind}. Run from the app folder:
+    python -m scripts.bulk_import menu_items menu.csv
+    python -m scripts.bulk_import customers customers.ndjson --skip-invalid
+Column names are the fields of the matching create DTO; staff and customer
+rows carry the plain password in password_hashed, as the POST endpoints do.
+Those are bcrypt-hashed on --hash-workers processes (every core by default),
+about 4 rows/s each: run large staff/customer loads here, off the API hosts.
+"""
+import argparse
+import os
+import sys
+import time
+
+from db import engine
+from services import BulkImportService
+from services.bulk_import import FORMATS, KINDS, detect_format
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("kind", choices=list(KINDS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--skip-invalid", action="store_true", help="load the valid rows even if some are invalid")
+    parser.add_argument("--hash-workers", type=int, default=os.cpu_count() or 1, help="password hashing processes")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        parser.error("cannot tell the file format, pass --format")
+    started = time.perf_counter()
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            result = BulkImportService().run(args.kind, stream, fmt, args.skip_invalid, args.hash_workers)
+    finally:
+        engine.dispose()
+
+    for error in result["errors"]:
+        print(f"line {error['line']}: {error['error']}")
+    if result["invalid"] and not args.skip_invalid:
+        print(f"❌ {result['invalid']} of {result['rows']} rows invalid, nothing loaded")
+        sys.exit(1)
+    print(
+        f"✅ {result['inserted']} {args.kind} inserted, {result['skipped']} already existed, "
+        f"{result['invalid']} invalid, in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Backfill or rebuild the revenue_daily rollup from payments. Run from the app folder:
+    python -m scripts.rebuild_revenue                        # everything
+    python -m scripts.rebuild_revenue --since 2025-01-01 --until 2025-02-01
+"""
+import argparse
+import asyncio
+from datetime import date
+
+from db import async_engine, unit_of_work
+from services import RevenueService
+
+
+async def rebuild(since, until):
+    try:
+        async with unit_of_work() as db:
+            buckets = await RevenueService().rebuild(db, since, until)
+        print(f"✅ Rebuilt {buckets} revenue buckets")
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--since", type=date.fromisoformat, help="first day to rebuild (inclusive)")
+    parser.add_argument("--until", type=date.fromisoformat, help="day to stop at (exclusive)")
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.since, args.until))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,11 @@ from .payment import PaymentService
 from .staff_schedule import StaffScheduleService
 from .review import ReviewService
 from .auth import AuthService
+from .changes import ChangeService
+from .analytics import AnalyticsService
+from .revenue import RevenueService
+from .bulk_import import BulkImportService
+from .exports import ExportService
 
 
 __all__ = [
@@ -21,5 +26,10 @@ __all__ = [
     "ReservationService",
     "PaymentService",
     "StaffScheduleService",
-    "ReviewService"
+    "ReviewService",
+    "ChangeService",
+    "AnalyticsService",
+    "RevenueService",
+    "BulkImportService",
+    "ExportService"
 ]
\ No newline at end of file
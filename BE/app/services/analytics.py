@@ -0,0 +1,140 @@
+import asyncio
+import time
+import weakref
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from core import config
+from repository import AnalyticsRepository
+
+PERIODS = ("today", "7d", "30d", "all")
+BREAKDOWNS = ("hour", "payment_method", "staff")
+
+# distinct (period, breakdowns) results kept per worker
+MAX_CACHED_SUMMARIES = 64
+
+
+def period_bounds(period: str, now: datetime):
+    if period == "today":
+        return now.replace(hour=0, minute=0, second=0, microsecond=0), None
+    if period == "7d":
+        return now - timedelta(days=7), None
+    if period == "30d":
+        return now - timedelta(days=30), None
+    return None, None
+
+
+class AnalyticsService:
+    """
+    Admin dashboard figures, aggregated by the database instead of the browser.
+
+    A result is reused for ANALYTICS_SUMMARY_TTL_SECONDS so a dashboard left
+    open by several admins costs a handful of aggregate queries per interval;
+    concurrent misses for the same key wait for one computation, misses for
+    different keys run side by side. With a TTL of 0 nothing waits.
+    """
+
+    def __init__(self):
+        self.repository = AnalyticsRepository()
+        self._cache = {}
+        # one lock per key being computed; dropped once nobody holds it
+        self._locks = weakref.WeakValueDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    async def summary(
+        self,
+        db: AsyncSession,
+        period: str = "today",
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        breakdowns: Iterable[str] = ()
+    ) -> dict:
+        if period not in PERIODS:
+            raise ValueError(f"period must be one of {', '.join(PERIODS)}")
+        breakdowns = tuple(sorted(set(breakdowns)))
+        unknown = [name for name in breakdowns if name not in BREAKDOWNS]
+        if unknown:
+            raise ValueError(f"Unknown breakdown: {', '.join(unknown)}")
+        if since is not None and until is not None and since >= until:
+            raise ValueError("since must be earlier than until")
+
+        custom = since is not None or until is not None
+        key = ("custom", since, until, breakdowns) if custom else (period, breakdowns)
+        if config.ANALYTICS_SUMMARY_TTL_SECONDS <= 0:
+            self.misses += 1
+            return await self._summarize(db, period, custom, since, until, breakdowns)
+        cached = self._fresh(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        async with lock:
+            cached = self._fresh(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+            result = await self._summarize(db, period, custom, since, until, breakdowns)
+            self._store(key, result)
+            return result
+
+    async def _summarize(self, db: AsyncSession, period: str, custom: bool, since, until, breakdowns) -> dict:
+        now = datetime.now()
+        if not custom:
+            since, until = period_bounds(period, now)
+        result = await self._compute(db, since, until, breakdowns)
+        result.update(period="custom" if custom else period, since=since, until=until, generated_at=now)
+        return result
+
+    def _fresh(self, key) -> Optional[dict]:
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _store(self, key, result: dict):
+        ttl = config.ANALYTICS_SUMMARY_TTL_SECONDS
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        if len(self._cache) >= MAX_CACHED_SUMMARIES:
+            self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+        if len(self._cache) < MAX_CACHED_SUMMARIES:
+            self._cache[key] = (now + ttl, result)
+
+    async def _compute(self, db: AsyncSession, since, until, breakdowns) -> dict:
+        result = {}
+        result.update(await self.repository.payment_totals(db, since, until))
+        result.update(await self.repository.order_counts(db, since, until))
+        result.update(await self.repository.table_counts(db))
+
+        if "hour" in breakdowns:
+            hours = {}
+            for row in await self.repository.orders_by_hour(db, since, until):
+                hours.setdefault(int(row["hour"]), {"orders": 0, "revenue": 0})["orders"] = row["orders"]
+            for row in await self.repository.revenue_by_hour(db, since, until):
+                hours.setdefault(int(row["hour"]), {"orders": 0, "revenue": 0})["revenue"] = row["revenue"]
+            result["by_hour"] = [{"hour": hour, **hours[hour]} for hour in sorted(hours)]
+        if "payment_method" in breakdowns:
+            result["by_payment_method"] = await self.repository.revenue_by_payment_method(db, since, until)
+        if "staff" in breakdowns:
+            result["by_staff"] = await self.repository.orders_by_staff(db, since, until)
+        return result
+
+    def invalidate(self):
+        self._cache = {}
+
+    def stats(self) -> dict:
+        return {
+            "cached": len(self._cache),
+            "computing": len(self._locks),
+            "ttl_seconds": config.ANALYTICS_SUMMARY_TTL_SECONDS,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+analytics_service = AnalyticsService()
@@ -1,11 +1,13 @@
 # auth.py (service)
-from core.security import verify_password, create_access_token
+from core.security import verify_password_async, create_access_token
 from repository import StaffRepository, CustomerRepository
 
 class AuthService:
-    def login(self, db, username: str, password: str):
-        staff = StaffRepository().find_by_username(db, username)
-        if staff and verify_password(password, staff.password_hashed):
+    async def login(self, db, username: str, password: str):
+        staff = await StaffRepository().find_by_username(db, username)
+        # hand the connection back to the pool before the slow bcrypt check
+        await db.close()
+        if staff and await verify_password_async(password, staff.password_hashed):
             token = create_access_token({
                 "sub": staff.id,
                 "user_type": "staff",
@@ -17,8 +19,9 @@ class AuthService:
                 "role": staff.role
             }
 
-        customer = CustomerRepository().find_by_username(db, username)
-        if customer and verify_password(password, customer.password_hashed):
+        customer = await CustomerRepository().find_by_username(db, username)
+        await db.close()
+        if customer and await verify_password_async(password, customer.password_hashed):
             token = create_access_token({
                 "sub": customer.id,
                 "user_type": "customer",
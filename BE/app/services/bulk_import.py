@@ -0,0 +1,229 @@
+import asyncio
+import csv
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import IO, Iterator, List, Optional, Tuple, Type
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from core import config
+from core.cache_sync import WATCHED_TABLES
+from core.etag import collection_versions
+from core.security import hash_password
+from db import engine
+from models import Customer, MenuItem, Staff, Table
+from repository import ImportRepository
+from schemas import CustomerCreateDTO, MenuItemCreateDTO, StaffCreateDTO, TableCreateDTO
+from services.menu_catalog import menu_catalog
+from services.table_index import table_index
+
+FORMATS = ("csv", "ndjson")
+EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+# rows hashed and written per round; bounds memory, not the file size
+BATCH_ROWS = 1000
+# validated rows stay in memory up to this size before spilling to disk
+SPOOL_BYTES = 16 * 1024 * 1024
+# invalid rows listed in the result; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+_imports_running = 0
+
+
+@dataclass(frozen=True)
+class ImportKind:
+    model: type
+    dto: Type[BaseModel]
+    # target columns, in COPY order; unset ones take the model's default
+    columns: Tuple[str, ...]
+    # the DTO's password_hashed holds a plain password to hash before loading
+    hashes_password: bool = False
+
+
+KINDS = {
+    "menu_items": ImportKind(
+        MenuItem, MenuItemCreateDTO,
+        ("item_name", "item_type", "item_price", "item_description", "item_image", "is_available"),
+    ),
+    "tables": ImportKind(Table, TableCreateDTO, ("table_number", "table_size", "is_occupied")),
+    "staff": ImportKind(
+        Staff, StaffCreateDTO,
+        ("username", "password_hashed", "full_name", "email", "phone", "role", "salary"),
+        hashes_password=True,
+    ),
+    "customers": ImportKind(
+        Customer, CustomerCreateDTO,
+        ("username", "password_hashed", "full_name", "email", "phone", "role"),
+        hashes_password=True,
+    ),
+}
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """csv/ndjson from a file name's extension, None when it doesn't say"""
+    return EXTENSIONS.get(os.path.splitext(filename or "")[1].lower())
+
+
+def _records(stream: IO[str], fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """(line number, record, parse error) for every row of a CSV (with header) or NDJSON stream"""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            # blank cells mean "not given", so DTO defaults apply
+            yield reader.line_num, {k: v for k, v in record.items() if k is not None and v != ""}, None
+        return
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "expected a JSON object"
+            continue
+        yield number, record, None
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc'])) or 'row'}: {e['msg']}" for e in error.errors())
+
+
+class BulkImportService:
+    """
+    Streaming CSV/NDJSON loads for onboarding: every row is validated with
+    the same DTO as the single-row endpoint, written to a spooled CSV and
+    COPYed in with one merge, so a file costs a handful of statements
+    instead of one committed INSERT per row. Rows whose unique key (table
+    number, username, email) already exists are skipped.
+
+    Unless skip_invalid is set, one invalid row means nothing is loaded;
+    validation still runs to the end so every problem is reported at once.
+
+    Passwords are hashed in separate processes, never on the API worker's
+    threads; see the IMPORT_* settings for how much an upload may hash.
+    """
+
+    def __init__(self):
+        self.repository = ImportRepository()
+
+    def run(
+        self, kind_name: str, stream: IO[str], fmt: str, skip_invalid: bool = False,
+        hash_workers: int = config.IMPORT_HASH_WORKERS, max_hashed_rows: Optional[int] = None
+    ) -> dict:
+        """
+        Validate and load one file; sync, runs on the psycopg2 engine.
+        Staff/customer files longer than max_hashed_rows are refused.
+        """
+        kind = KINDS.get(kind_name)
+        if kind is None:
+            raise ValueError(f"Unknown import kind: {kind_name}, expected one of {', '.join(KINDS)}")
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+
+        result = {"kind": kind_name, "rows": 0, "invalid": 0, "inserted": 0, "skipped": 0, "errors": []}
+        pool = None
+        if kind.hashes_password:
+            # spawn: forking a process that runs threads (the event loop's
+            # executor, the DB pool) can copy held locks into the children
+            pool = ProcessPoolExecutor(hash_workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES, mode="w+", newline="") as staged:
+                valid = self._stage(kind, stream, fmt, csv.writer(staged), pool, skip_invalid, result, max_hashed_rows)
+                if valid and (skip_invalid or not result["invalid"]):
+                    staged.seek(0)
+                    with engine.begin() as conn:
+                        result["inserted"] = self.repository.copy_and_merge(conn, kind.model.__table__, kind.columns, staged)
+                    result["skipped"] = valid - result["inserted"]
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+        return result
+
+    async def load(self, kind_name: str, stream: IO[str], fmt: str, skip_invalid: bool = False) -> dict:
+        """
+        run() off the event loop for an upload, then drop this worker's caches
+        of the loaded table; 503 when IMPORT_MAX_CONCURRENT loads are running
+        """
+        global _imports_running
+        if _imports_running >= config.IMPORT_MAX_CONCURRENT:
+            raise HTTPException(
+                status_code=503,
+                detail="Another import is running, please retry",
+                headers={"Retry-After": "30"}
+            )
+        _imports_running += 1
+        try:
+            result = await asyncio.to_thread(
+                self.run, kind_name, stream, fmt, skip_invalid,
+                config.IMPORT_HASH_WORKERS, config.IMPORT_API_MAX_HASHED_ROWS
+            )
+        finally:
+            _imports_running -= 1
+        if result["inserted"]:
+            if kind_name == "menu_items":
+                menu_catalog.invalidate()
+            elif kind_name == "tables":
+                table_index.invalidate()
+            if kind_name in WATCHED_TABLES:
+                collection_versions.bump(kind_name)
+        return result
+
+    def _stage(
+        self, kind: ImportKind, stream: IO[str], fmt: str, writer, pool, skip_invalid: bool, result: dict,
+        max_hashed_rows: Optional[int] = None
+    ) -> int:
+        """Validate every record, writing the good ones as COPY rows; returns how many were written"""
+        written = 0
+        batch = []
+        for line, record, error in _records(stream, fmt):
+            result["rows"] += 1
+            if kind.hashes_password and max_hashed_rows is not None and result["rows"] > max_hashed_rows:
+                raise ValueError(
+                    f"{result['kind']} uploads are limited to {max_hashed_rows} rows, "
+                    f"load larger files with scripts.bulk_import"
+                )
+            if error is None:
+                try:
+                    batch.append(self._row(kind, kind.dto.model_validate(record)))
+                except ValidationError as e:
+                    error = _describe(e)
+            if error is not None:
+                result["invalid"] += 1
+                if len(result["errors"]) < MAX_REPORTED_ERRORS:
+                    result["errors"].append({"line": line, "error": error})
+            if result["invalid"] and not skip_invalid:
+                # nothing will be loaded; keep validating but stop hashing
+                batch = []
+            elif len(batch) >= BATCH_ROWS:
+                written += self._write(kind, batch, writer, pool)
+                batch = []
+        return written + self._write(kind, batch, writer, pool)
+
+    def _row(self, kind: ImportKind, item: BaseModel) -> List:
+        data = item.model_dump()
+        row = []
+        for name in kind.columns:
+            value = data.get(name)
+            if value is None:
+                default = kind.model.__table__.c[name].default
+                if default is not None and default.is_scalar:
+                    value = default.arg
+            row.append(value.value if isinstance(value, Enum) else value)
+        return row
+
+    def _write(self, kind: ImportKind, batch: List[List], writer, pool) -> int:
+        if not batch:
+            return 0
+        if pool:
+            position = kind.columns.index("password_hashed")
+            hashes = pool.map(hash_password, [row[position] for row in batch], chunksize=16)
+            for row, hashed in zip(batch, hashes):
+                row[position] = hashed
+        writer.writerows(batch)
+        return len(batch)
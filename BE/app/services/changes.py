@@ -0,0 +1,78 @@
+import time
+from datetime import timedelta
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from core import config
+from core.pagination import encode_token, decode_token
+from repository import ChangeRepository
+
+# tombstones are kept this long past the oldest token still accepted, so a
+# delete whose transaction began before that token was issued is not pruned
+TOMBSTONE_GRACE = timedelta(days=1)
+
+
+class ChangeTokenExpired(ValueError):
+    """The token is older than CHANGE_TOKEN_MAX_AGE_DAYS; tombstones it needs may be gone"""
+
+
+class ChangeService:
+    """
+    Delta sync: rows written and rows deleted since a client's token.
+
+    The token records the (transaction id, row id) of the last row and the
+    last tombstone a client has seen, and when it was issued. Only writes of
+    finished transactions are read (below the snapshot's xmin), so one that
+    commits after a later one is picked up on a following call instead of
+    skipped, however long it ran. Clients apply `changes` as upserts, then
+    drop the ids in `deleted`; a token older than CHANGE_TOKEN_MAX_AGE_DAYS
+    is refused and the client syncs from scratch.
+    """
+
+    def __init__(self):
+        self.repository = ChangeRepository()
+
+    def _position(self, since: Optional[str]) -> dict:
+        if not since:
+            return {}
+        try:
+            position = decode_token(since)
+            for key in ("x", "i", "dx", "di"):
+                if key in position:
+                    int(position[key])
+            issued = float(position["s"])
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid change token")
+        if time.time() - issued > config.CHANGE_TOKEN_MAX_AGE_DAYS * 86400:
+            raise ChangeTokenExpired("Change token expired, sync again without since")
+        return position
+
+    def _after(self, position: dict, xid_key: str, id_key: str):
+        if xid_key not in position:
+            return None
+        return int(position[xid_key]), int(position[id_key])
+
+    async def changes(self, db: AsyncSession, model, since: Optional[str], limit: int = 500) -> dict:
+        position = self._position(since)
+        rows = await self.repository.changed_since(db, model, self._after(position, "x", "i"), limit + 1)
+        deleted = await self.repository.deleted_since(
+            db, model.__tablename__, self._after(position, "dx", "di"), limit + 1
+        )
+        has_more = len(rows) > limit or len(deleted) > limit
+        rows, deleted = rows[:limit], deleted[:limit]
+
+        if rows:
+            position["x"], position["i"] = rows[-1].change_xid, rows[-1].id
+        if deleted:
+            position["dx"], position["di"] = deleted[-1].change_xid, deleted[-1].id
+        position["s"] = int(time.time())
+        return {
+            "changes": rows,
+            "deleted": [tombstone.row_id for tombstone in deleted],
+            "next_token": encode_token(position),
+            "has_more": has_more,
+        }
+
+    async def prune(self, db: AsyncSession) -> int:
+        """Drop tombstones no accepted token can still need; returns how many"""
+        older_than = timedelta(days=config.CHANGE_TOKEN_MAX_AGE_DAYS) + TOMBSTONE_GRACE
+        return await self.repository.prune_deleted(db, older_than)
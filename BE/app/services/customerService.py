@@ -1,10 +1,18 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from models import Customer,CustomerRole
 from schemas import CustomerCreateDTO, CustomerUpdateDTO
-from core.security import hash_password
+from core.security import hash_password_async
 from repository import CustomerRepository
+from core.db_errors import raise_duplicate
+
+# unique constraints on customers, and the 400 each one turns into
+DUPLICATE_MESSAGES = {
+    "customers_username_key": "Username already exists",
+    "customers_email_key": "Email already exists",
+}
 
 
 class CustomerService:
@@ -12,36 +20,28 @@ class CustomerService:
     def __init__(self):
         self.repository = CustomerRepository()
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Customer]:
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Customer]:
         """Get all customers with pagination"""
-        return self.repository.get_all(db, skip=skip, limit=limit)
+        return await self.repository.get_all(db, skip=skip, limit=limit, after_id=after_id)
     
-    def get_by_id(self, db: Session, customer_id: int) -> Optional[Customer]:
+    async def get_by_id(self, db: AsyncSession, customer_id: int) -> Optional[Customer]:
         """Get customer by ID"""
-        return self.repository.get_by_id(db, customer_id)
+        return await self.repository.get_by_id(db, customer_id)
     
-    def get_by_username(self, db: Session, username: str) -> Optional[Customer]:
+    async def get_by_username(self, db: AsyncSession, username: str) -> Optional[Customer]:
         """Get customer by username"""
-        return self.repository.find_by_username(db, username)
+        return await self.repository.find_by_username(db, username)
     
-    def get_by_email(self, db: Session, email: str) -> Optional[Customer]:
+    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[Customer]:
         """Get customer by email"""
-        return self.repository.find_by_email(db, email)
+        return await self.repository.find_by_email(db, email)
     
-    def create(self, db: Session, customer_data: CustomerCreateDTO) -> Customer:
+    async def create(self, db: AsyncSession, customer_data: CustomerCreateDTO) -> Customer:
         """
         Create new customer with business logic validation.
         """
-        # Business logic: Check if username exists
-        if self.repository.exists_by_username(db, customer_data.username):
-            raise ValueError("Username already exists")
-        
-        # Business logic: Check if email exists
-        if self.repository.exists_by_email(db, customer_data.email):
-            raise ValueError("Email already exists")
-        
         # Business logic: Hash password
-        hashed_password = hash_password(customer_data.password_hashed)
+        hashed_password = await hash_password_async(customer_data.password_hashed)
         
         # Create customer object
         customer = Customer(
@@ -52,46 +52,45 @@ class CustomerService:
             phone=customer_data.phone
         )
         
-        # Delegate to repository
-        return self.repository.create(db, customer)
+        # Delegate to repository; the unique constraints catch taken usernames/emails
+        try:
+            return await self.repository.create(db, customer)
+        except IntegrityError as e:
+            raise_duplicate(e, DUPLICATE_MESSAGES)
     
     
-    def delete(self, db: Session, customer_id: int) -> bool:
+    async def delete(self, db: AsyncSession, customer_id: int) -> bool:
         """Delete customer"""
-        customer = self.repository.find_by_id(db, customer_id)
+        customer = await self.repository.find_by_id(db, customer_id)
         if not customer:
             return False
         
         # Business logic: Could add checks here
         # e.g., prevent deletion if customer has active orders
         
-        self.repository.delete(db, customer)
+        await self.repository.delete(db, customer)
         return True
     
-    def search_by_name(self, db: Session, name: str) -> List[Customer]:
+    async def search_by_name(self, db: AsyncSession, name: str) -> List[Customer]:
         """Search customers by name"""
-        return self.repository.search_by_name(db, name )
+        return await self.repository.search_by_name(db, name )
     
-    def get_total_count(self, db: Session) -> int:
+    async def get_total_count(self, db: AsyncSession) -> int:
         """Get total number of customers"""
-        return self.repository.count(db)
+        return await self.repository.count(db)
     
-    def update(self, db: Session, customer_id: int, customer_data: CustomerUpdateDTO) -> Customer:
-        """Update customer information"""
-        customer = self.repository.get_by_id(db, customer_id)
+    async def update(self, db: AsyncSession, customer_id: int, customer_data: CustomerUpdateDTO) -> Optional[Customer]:
+        """Update only the fields sent; None when the customer doesn't exist"""
         updated_customer = customer_data.model_dump(exclude_unset=True)
 
-        if "email" in updated_customer:
-            if self.repository.exists_by_email(db, updated_customer["email"]):
-                raise ValueError("Email already exists")
-        # Update fields
-        for key, value in updated_customer.items():
-            setattr(customer, key, value)
-        
-        print("Updated customer data:", updated_customer)
-
+        # the column holds a hash, never the password itself
+        if "password_hashed" in updated_customer:
+            updated_customer["password_hashed"] = await hash_password_async(updated_customer["password_hashed"])
 
-        return self.repository.update(db, customer)
+        try:
+            return await self.repository.update_fields(db, customer_id, updated_customer)
+        except IntegrityError as e:
+            raise_duplicate(e, DUPLICATE_MESSAGES)
     
-    def update_customer_role(self,db , customer_id: int , new_role : CustomerRole) -> Customer:
-        return self.repository.update_role(db, customer_id, new_role)
\ No newline at end of file
+    async def update_customer_role(self,db , customer_id: int , new_role : CustomerRole) -> Customer:
+        return await self.repository.update_role(db, customer_id, new_role)
\ No newline at end of file
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import AsyncIterator, Optional
+from sqlalchemy import Select
+from db import unit_of_work
+from repository import ExportRepository
+
+EXPORTS = ("orders", "order_items", "payments")
+FORMATS = ("csv", "ndjson")
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+# rows per cursor fetch, and per chunk written to the client
+BATCH_ROWS = 2000
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class ExportService:
+    """
+    Accounting exports streamed straight from a server-side cursor: memory
+    holds one batch of rows whatever the size of the export.
+
+    The stream outlives the request's session, so it opens its own and keeps
+    one pooled connection for as long as the client is reading.
+    """
+
+    def __init__(self):
+        self.repository = ExportRepository()
+
+    def query(self, name: str, fmt: str, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Select:
+        """The statement behind one export; raises ValueError before anything is streamed"""
+        if name not in EXPORTS:
+            raise ValueError(f"Unknown export: {name}")
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        if since is not None and until is not None and since >= until:
+            raise ValueError("since must be earlier than until")
+        return getattr(self.repository, name)(since, until)
+
+    async def stream(self, stmt: Select, fmt: str, compress: bool = False) -> AsyncIterator[bytes]:
+        """CSV (with a header row) or NDJSON chunks of `stmt`'s rows, gzipped when `compress`"""
+        columns = list(stmt.selected_columns.keys())
+        # wbits=31 writes a gzip member rather than a bare zlib stream
+        compressor = zlib.compressobj(wbits=31) if compress else None
+
+        def encode(text: str) -> bytes:
+            data = text.encode("utf-8")
+            return compressor.compress(data) if compressor else data
+
+        if fmt == "csv":
+            yield encode(self._csv([columns]))
+        async with unit_of_work() as db:
+            async for rows in self.repository.stream(db, stmt, BATCH_ROWS):
+                if fmt == "csv":
+                    text = self._csv([_plain(value) for value in row] for row in rows)
+                else:
+                    text = "".join(
+                        json.dumps(dict(zip(columns, map(_plain, row))), ensure_ascii=False) + "\n"
+                        for row in rows
+                    )
+                data = encode(text)
+                if data:
+                    yield data
+        if compressor:
+            yield compressor.flush()
+
+    def _csv(self, rows) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
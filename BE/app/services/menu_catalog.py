@@ -0,0 +1,152 @@
+import asyncio
+from dataclasses import dataclass, fields
+from datetime import datetime
+from decimal import Decimal
+from types import MappingProxyType
+from typing import List, Optional
+from pydantic import TypeAdapter
+from core.cache_sync import on_change
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import item_type
+from repository import MenuItemRepository
+from schemas import MenuItemResponse
+
+_menu_json = TypeAdapter(List[MenuItemResponse])
+
+# rendered bodies kept per snapshot; requests beyond this are rendered uncached
+MAX_RENDERED_VARIANTS = 64
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    id: int
+    item_name: str
+    item_type: item_type
+    item_price: Decimal
+    item_description: Optional[str]
+    item_image: Optional[str]
+    is_available: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+class MenuSnapshot:
+    """One build of the menu. Never modified; a write installs a new one"""
+
+    def __init__(self, version: int, items: List[CatalogItem]):
+        self.version = version
+        self.items = tuple(items)
+        self.by_id = MappingProxyType({item.id: item for item in self.items})
+        by_type = {}
+        for item in self.items:
+            by_type.setdefault(item.item_type, []).append(item)
+        self.by_type = MappingProxyType({key: tuple(value) for key, value in by_type.items()})
+        self.available = tuple(item for item in self.items if item.is_available)
+        self._rendered = {}
+
+    def render(self, variant, items) -> bytes:
+        """JSON body for `items`, serialized once per snapshot and variant"""
+        body = self._rendered.get(variant)
+        if body is None:
+            body = _menu_json.dump_json(_menu_json.validate_python(items, from_attributes=True))
+            if len(self._rendered) < MAX_RENDERED_VARIANTS:
+                self._rendered[variant] = body
+        return body
+
+
+class MenuCatalog:
+    """
+    The whole menu held in memory, so price lookups and menu listings run
+    no SQL. MenuItemService reloads it after each committed write; invalidate()
+    drops it so the next read rebuilds it. Items changed by other workers
+    arrive through cache_sync and only those rows are re-read.
+    """
+
+    def __init__(self):
+        self.repository = MenuItemRepository()
+        self._snapshot: Optional[MenuSnapshot] = None
+        self._dirty = set()
+        self._generation = 0
+        self._version = 0
+        self._lock = asyncio.Lock()
+        self.loads = 0
+        self.refreshes = 0
+
+    async def get(self, db: AsyncSession) -> MenuSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and not self._dirty:
+            return snapshot
+        async with self._lock:
+            if self._snapshot is None:
+                return await self._load(db)
+            if self._dirty:
+                await self._refresh(db)
+            return self._snapshot or await self._load(db)
+
+    async def reload(self, db: AsyncSession) -> MenuSnapshot:
+        """Write-through: rebuild from committed rows right after a menu write"""
+        self.invalidate()
+        async with self._lock:
+            return await self._load(db)
+
+    def changed(self, item_id: Optional[int]) -> None:
+        if item_id is None:
+            self.invalidate()
+        else:
+            self._dirty.add(item_id)
+
+    def invalidate(self) -> None:
+        # a load already in flight read rows from before this call: it must not install them
+        self._generation += 1
+        self._snapshot = None
+        self._dirty.clear()
+
+    async def _load(self, db: AsyncSession) -> MenuSnapshot:
+        generation = self._generation
+        self._dirty.clear()
+        rows = await self.repository.get_catalog(db)
+        self._version += 1
+        self.loads += 1
+        snapshot = MenuSnapshot(self._version, [self._item(row) for row in rows])
+        if generation == self._generation:
+            self._snapshot = snapshot
+        return snapshot
+
+    async def _refresh(self, db: AsyncSession) -> None:
+        """Re-read just the dirty items and install a snapshot with them swapped in"""
+        item_ids, self._dirty = self._dirty, set()
+        generation = self._generation
+        rows = await self.repository.get_catalog(db, item_ids)
+        self.refreshes += 1
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        if generation != self._generation:
+            # rebuilt or dropped meanwhile; these rows may predate that, read them again
+            self._dirty |= item_ids
+            return
+        items = dict(snapshot.by_id)
+        for item_id in item_ids:
+            items.pop(item_id, None)
+        items.update((row.id, self._item(row)) for row in rows)
+        self._version += 1
+        self._snapshot = MenuSnapshot(self._version, sorted(items.values(), key=lambda item: item.id))
+
+    def _item(self, row) -> CatalogItem:
+        return CatalogItem(**{f.name: getattr(row, f.name) for f in fields(CatalogItem)})
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "version": snapshot.version if snapshot else None,
+            "items": len(snapshot.items) if snapshot else 0,
+            "rendered_variants": len(snapshot._rendered) if snapshot else 0,
+            "pending_refresh": len(self._dirty),
+            "loads": self.loads,
+            "refreshes": self.refreshes,
+        }
+
+
+menu_catalog = MenuCatalog()
+on_change("menu_items", menu_catalog.changed)
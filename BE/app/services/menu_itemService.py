@@ -1,23 +1,47 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from models import MenuItem
 from schemas import MenuItemCreateDTO, MenuItemUpdateDTO
 from repository import MenuItemRepository
+from core.etag import collection_versions
+from core.unit_of_work import after_commit
+from services.menu_catalog import CatalogItem, menu_catalog
 
 class MenuItemService:
 
     def __init__(self):
         self.repository = MenuItemRepository()
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[MenuItem]:
-        """Get all menu items with pagination"""
-        return self.repository.get_all(db, skip=skip, limit=limit)
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[CatalogItem]:
+        """Get all menu items with pagination, from the in-memory catalog"""
+        items = (await menu_catalog.get(db)).items
+        if after_id is not None:
+            return [item for item in items if item.id > after_id][:limit]
+        return list(items[skip:skip + limit])
     
-    def get_all_by_type(self, db: Session, item_type: str) -> List[MenuItem]:
+    async def get_all_by_type(self, db: AsyncSession, item_type: str) -> List[CatalogItem]:
         """Get all menu items by type"""
-        return self.repository.get_all_by_type(db, item_type)
+        return list((await menu_catalog.get(db)).by_type.get(item_type, ()))
+
+    async def render_all(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> bytes:
+        """Serialized page of the menu, cached until the next menu write"""
+        snapshot = await menu_catalog.get(db)
+        return snapshot.render(("all", skip, limit), snapshot.items[skip:skip + limit])
+
+    async def render_available(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> bytes:
+        """Serialized page of the items customers can order, from the catalog's availability index"""
+        snapshot = await menu_catalog.get(db)
+        return snapshot.render(("available", skip, limit), snapshot.available[skip:skip + limit])
+
+    async def render_by_type(self, db: AsyncSession, item_type: str) -> Optional[bytes]:
+        """Serialized menu items of one type; None when there are none"""
+        snapshot = await menu_catalog.get(db)
+        items = snapshot.by_type.get(item_type)
+        if not items:
+            return None
+        return snapshot.render(("type", item_type), items)
     
-    def create(self, db: Session, item_data: MenuItemCreateDTO) -> MenuItem:
+    async def create(self, db: AsyncSession, item_data: MenuItemCreateDTO) -> MenuItem:
         """Create new menu item"""
         menu_item = MenuItem(
             item_name=item_data.item_name,
@@ -27,23 +51,26 @@ class MenuItemService:
             item_image=item_data.item_image,
             is_available=item_data.is_available
         )
-        return self.repository.create(db, menu_item)
+        menu_item = await self.repository.create(db, menu_item)
+        after_commit(db, menu_catalog.reload, db)
+        after_commit(db, collection_versions.bump, "menu_items")
+        return menu_item
     
-    def delete(self, db: Session, item_id: int) -> bool:
+    async def delete(self, db: AsyncSession, item_id: int) -> bool:
         """Delete menu item"""
-        menu_item = self.repository.get_by_id(db, item_id)
+        menu_item = await self.repository.get_by_id(db, item_id)
         if not menu_item:
             return False
-        self.repository.delete(db, menu_item)
+        await self.repository.delete(db, menu_item)
+        after_commit(db, menu_catalog.reload, db)
+        after_commit(db, collection_versions.bump, "menu_items")
         return True
     
-    def update(self, db: Session, item_id: int, item_data: MenuItemUpdateDTO) -> Optional[MenuItem]:
+    async def update(self, db: AsyncSession, item_id: int, item_data: MenuItemUpdateDTO) -> Optional[MenuItem]:
         """Update menu item"""
-        existing_item = self.repository.get_by_id(db, item_id)
-        if not existing_item:
+        menu_item = await self.repository.update_fields(db, item_id, item_data.model_dump(exclude_unset=True))
+        if not menu_item:
             return None
-        
-        for field, value in item_data.model_dump(exclude_unset=True).items():
-            setattr(existing_item, field, value)
-        
-        return self.repository.update(db, existing_item)
+        after_commit(db, menu_catalog.reload, db)
+        after_commit(db, collection_versions.bump, "menu_items")
+        return menu_item
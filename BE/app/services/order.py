@@ -1,30 +1,33 @@
-from schemas import OrderCreateDTO, OrderUpdateDTO
-from sqlalchemy.orm import Session
+from schemas import OrderCreateDTO, OrderUpdateDTO, OrderWithItemsCreateDTO, OrderItemLineDTO
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import Order,OrderStatus
-from typing import List
+from typing import List, Optional, Tuple
+from datetime import datetime
+from decimal import Decimal
 from repository import OrderRepository,OrderItemRepository
+from core.events import publish_order, publish_table
+from core.etag import collection_versions
+from core.unit_of_work import after_commit
+from services.table_index import table_index
+from services.menu_catalog import menu_catalog
 
 class OrderService:
     def __init__(self):
         self.repository = OrderRepository()
         self.order_item_repository = OrderItemRepository()
     
-    def recalculate_order_total(self, db: Session, order_id: int):
-        total = self.repository.calculate_total_amount(db, order_id)
-
-        order = self.repository.get_by_id(db, order_id)
-        order.total_amount = total
-        order.final_amount = total - order.discount_amount
-
-        self.repository.update(db, order)
+    async def reconcile_totals(self, db: AsyncSession) -> List[int]:
+        """Repair orders whose incrementally kept totals drifted from their lines"""
+        return await self.repository.repair_totals(db)
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Order]:
-        return self.repository.get_all(db, skip, limit)
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Order]:
+        return await self.repository.get_all(db, skip, limit, after_id)
     
-    def get_by_id(self, db: Session, order_id: int) -> Order:
-        return self.repository.get_by_id(db, order_id)
+    async def get_by_id(self, db: AsyncSession, order_id: int) -> Order:
+        return await self.repository.get_by_id(db, order_id)
     
-    def create(self, db: Session, order_data: OrderCreateDTO) -> Order:
+    async def create(self, db: AsyncSession, order_data: OrderCreateDTO) -> Order:
         order = Order(
         customer_id=order_data.customer_id,
         table_id=order_data.table_id,
@@ -33,34 +36,137 @@ class OrderService:
         )
         # Update table status
         from models import Table
-        table = db.query(Table).filter(Table.id == order_data.table_id).first()
+        table = await db.get(Table, order_data.table_id)
         if table:
             table.is_occupied = True
             db.add(table)
             
-        return self.repository.create(db, order)
+        order = await self.repository.create(db, order)
+        after_commit(db, publish_order, "order.created", order)
+        if table:
+            after_commit(db, table_index.mark, table)
+            after_commit(db, collection_versions.bump, "tables")
+            after_commit(db, publish_table, table)
+        return order
     
-    def update(self, db: Session, order_id: int, order_data: OrderUpdateDTO) -> Order:
-        order = self.get_by_id(db, order_id)
+    async def update(self, db: AsyncSession, order_id: int, order_data: OrderUpdateDTO) -> Optional[Order]:
+        updated_order = order_data.model_dump(exclude_unset=True)
+        if "discount_amount" in updated_order:
+            discount = Decimal(str(updated_order["discount_amount"] or 0))
+            updated_order["final_amount"] = func.coalesce(Order.total_amount, 0) - discount
 
-        for key, value in order_data.model_dump(exclude_unset=True).items():
-            setattr(order, key, value)
-        
-        
-        return self.repository.update(db, order)
+        order = await self.repository.update_fields(db, order_id, updated_order)
+        if order:
+            after_commit(db, publish_order, "order.updated", order)
+        return order
     
-    def delete(self, db: Session, order_id: int) -> bool:
-        order = self.get_by_id(db, order_id)
+    async def delete(self, db: AsyncSession, order_id: int) -> bool:
+        order = await self.get_by_id(db, order_id)
         if not order:
             return False
-        self.repository.delete(db, order)
+        await self.repository.delete(db, order)
         return True
     
-    def find_by_customer_id(self, db: Session, customer_id: int) -> List[Order]:
-        return self.repository.find_by_customer_id(db, customer_id)
+    async def find_by_customer_id(self, db: AsyncSession, customer_id: int) -> List[Order]:
+        return await self.repository.find_by_customer_id(db, customer_id)
     
-    def get_amounts_paid_by_order_id(self, db: Session , order_id: int) ->float:
-        return self.repository.calculate_total_amount(db, order_id)
+    async def get_amounts_paid_by_order_id(self, db: AsyncSession , order_id: int) ->float:
+        return await self.repository.calculate_total_amount(db, order_id)
     
-    def find_by_status(self, db: Session, status: OrderStatus) -> List[Order]:
-        return self.repository.find_by_status(db, status)
\ No newline at end of file
+    async def find_by_status(self, db: AsyncSession, status: OrderStatus) -> List[Order]:
+        return await self.repository.find_by_status(db, status)
+
+    async def query(
+        self,
+        db: AsyncSession,
+        statuses: Optional[List[OrderStatus]] = None,
+        customer_id: Optional[int] = None,
+        table_id: Optional[int] = None,
+        staff_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Order]:
+        if since and until and since >= until:
+            raise ValueError("since must be earlier than until")
+        return await self.repository.query(db, statuses, customer_id, table_id, staff_id, since, until, limit)
+
+    async def _price_lines(self, db: AsyncSession, lines: List[OrderItemLineDTO]) -> Tuple[List[dict], dict]:
+        """Merge repeated menu items and price every line with one lookup"""
+        merged = {}
+        for line in lines:
+            row = merged.setdefault(line.menu_item_id, {"quantity": 0, "special_instructions": None})
+            row["quantity"] += line.quantity
+            row["special_instructions"] = line.special_instructions or row["special_instructions"]
+
+        catalog = (await menu_catalog.get(db)).by_id
+        menu_items = {item_id: catalog[item_id] for item_id in merged if item_id in catalog}
+        missing = sorted(set(merged) - set(menu_items))
+        if missing:
+            raise ValueError(f"Menu items not found: {missing}")
+
+        rows = []
+        for menu_item_id, row in merged.items():
+            price = menu_items[menu_item_id].item_price
+            rows.append({
+                "menu_item_id": menu_item_id,
+                "quantity": row["quantity"],
+                "unit_price": price,
+                "subtotal": price * row["quantity"],
+                "special_instructions": row["special_instructions"],
+            })
+        return rows, menu_items
+
+    async def _save_lines(
+        self, db: AsyncSession, order_id: int, rows: List[dict], menu_items: dict, previous: Optional[dict] = None
+    ) -> Tuple[Order, List[dict]]:
+        """
+        Upsert the lines and move the order total by what they changed, the
+        same signed delta the single-line paths apply. `previous` holds the
+        subtotals of the lines that already existed, by menu item.
+        """
+        for row in rows:
+            row["order_id"] = order_id
+        items = await self.order_item_repository.upsert_many(db, rows)
+        for item in items:
+            item["item_name"] = menu_items[item["menu_item_id"]].item_name
+        delta = sum((item["subtotal"] for item in items), Decimal(0)) - sum((previous or {}).values(), Decimal(0))
+        order = await self.repository.add_to_total(db, order_id, delta)
+        return order, items
+
+    async def create_with_items(self, db: AsyncSession, order_data: OrderWithItemsCreateDTO) -> Tuple[Order, List[dict]]:
+        """Create an order, its lines and its total in a single transaction"""
+        rows, menu_items = await self._price_lines(db, order_data.items)
+
+        order = Order(
+            customer_id=order_data.customer_id,
+            table_id=order_data.table_id,
+            staff_id=order_data.staff_id,
+            notes=order_data.notes
+        )
+        from models import Table
+        table = await db.get(Table, order_data.table_id)
+        if table:
+            table.is_occupied = True
+        db.add(order)
+        await db.flush()
+
+        order, items = await self._save_lines(db, order.id, rows, menu_items)
+        after_commit(db, publish_order, "order.created", order)
+        if table:
+            after_commit(db, table_index.mark, table)
+            after_commit(db, collection_versions.bump, "tables")
+            after_commit(db, publish_table, table)
+        return order, items
+
+    async def add_items(self, db: AsyncSession, order_id: int, lines: List[OrderItemLineDTO]) -> Optional[Tuple[Order, List[dict]]]:
+        """Upsert a batch of lines into an existing order and update its total once"""
+        # locked so two batches for one order can't both read the same old subtotals
+        if not await self.repository.lock(db, order_id):
+            return None
+        rows, menu_items = await self._price_lines(db, lines)
+        previous = await self.order_item_repository.get_subtotals(db, order_id, menu_items)
+        order, items = await self._save_lines(db, order_id, rows, menu_items, previous)
+        after_commit(db, publish_order, "order.items_changed", order)
+        return order, items
+
@@ -1,37 +1,46 @@
 
 from schemas import OrderItemCreateDTO, OrderItemUpdateDTO
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import OrderItem,MenuItem
-from typing import List
-from repository import OrderItemRepository,MenuItemRepository
+from typing import List, Optional
+from repository import OrderItemRepository,OrderRepository
 from fastapi import HTTPException, status
-from services import OrderService
+from core.events import publish_order
+from core.unit_of_work import after_commit
+from services.menu_catalog import menu_catalog
 
 
 class OrderItemService:
     def __init__(self):
         self.repository = OrderItemRepository()
+        self.order_repository = OrderRepository()
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[OrderItem]:
-        return self.repository.get_all(db, skip, limit)
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[OrderItem]:
+        return await self.repository.get_all(db, skip, limit, after_id)
     
-    def get_by_id(self, db: Session, order_item_id: int) -> OrderItem:
-        return self.repository.get_by_id(db, order_item_id)
+    async def get_by_id(self, db: AsyncSession, order_item_id: int) -> OrderItem:
+        return await self.repository.get_by_id(db, order_item_id)
     
-    def create(self, db: Session, data: OrderItemCreateDTO) -> OrderItem:
-        menu_item_repo = MenuItemRepository()
-        price = menu_item_repo.get_item_price_by_id(db, data.menu_item_id)
+    async def create(self, db: AsyncSession, data: OrderItemCreateDTO) -> OrderItem:
+        menu_item = (await menu_catalog.get(db)).by_id.get(data.menu_item_id)
+        price = menu_item.item_price if menu_item else None
 
-        existing = self.repository.find_by_order_and_menu(
+        # locked like OrderService.add_items, so concurrent edits to this
+        # order's lines read the subtotal they replace one after another
+        await self.order_repository.lock(db, data.order_id)
+        existing = await self.repository.find_by_order_and_menu(
             db, data.order_id, data.menu_item_id
         )
 
         if existing:
         # 🔁 merge quantities
+            old_subtotal = existing.subtotal
             existing.quantity += data.quantity
             existing.unit_price = price  # optional: keep latest price
             existing.calculate_subtotal()
-            saved_item = self.repository.update(db, existing)
+            # order total moves by the line's change; committed together with the line
+            order = await self.order_repository.add_to_total(db, data.order_id, existing.subtotal - old_subtotal)
+            saved_item = await self.repository.update(db, existing)
         else:
         # 🆕 new row
             item = OrderItem(
@@ -42,29 +51,40 @@ class OrderItemService:
             special_instructions=data.special_instructions,
         )
             item.calculate_subtotal()
-            saved_item = self.repository.create(db, item)
-
-        # recalc order total
-        order_service = OrderService()
-        order_service.recalculate_order_total(db, data.order_id)
+            order = await self.order_repository.add_to_total(db, data.order_id, item.subtotal)
+            saved_item = await self.repository.create(db, item)
 
+        if order:
+            after_commit(db, publish_order, "order.items_changed", order)
         return saved_item       
 
 
-    def update(self, db: Session, order_item_id: int, order_item_data: OrderItemUpdateDTO) -> OrderItem:
-        order_item = self.get_by_id(db, order_item_id)
+    async def update(self, db: AsyncSession, order_item_id: int, order_item_data: OrderItemUpdateDTO) -> OrderItem:
+        # the line is read after the order lock, so old_subtotal is the committed one
+        if await self.order_repository.lock_by_item(db, order_item_id) is None:
+            return None
+        order_item = await self.get_by_id(db, order_item_id)
+        if not order_item:
+            return None
 
+        old_subtotal = order_item.subtotal
         for key, value in order_item_data.model_dump(exclude_unset=True).items():
             setattr(order_item, key, value)
-        
-        return self.repository.update(db, order_item)
+        order_item.calculate_subtotal()
+
+        if order_item.subtotal != old_subtotal:
+            await self.order_repository.add_to_total(db, order_item.order_id, order_item.subtotal - old_subtotal)
+        return await self.repository.update(db, order_item)
     
-    def delete(self, db: Session, order_item_id: int) -> bool:
-        order_item = self.get_by_id(db, order_item_id)
+    async def delete(self, db: AsyncSession, order_item_id: int) -> bool:
+        if await self.order_repository.lock_by_item(db, order_item_id) is None:
+            return False
+        order_item = await self.get_by_id(db, order_item_id)
         if not order_item:
             return False
-        self.repository.delete(db, order_item)
+        await self.order_repository.add_to_total(db, order_item.order_id, -order_item.subtotal)
+        await self.repository.delete(db, order_item)
         return True
     
-    def find_by_order_id(self, db: Session, order_id: int) -> List[OrderItem]:
-        return self.repository.find_by_order_id(db, order_id)
\ No newline at end of file
+    async def find_by_order_id(self, db: AsyncSession, order_id: int) -> List[OrderItem]:
+        return await self.repository.find_by_order_id(db, order_id)
\ No newline at end of file
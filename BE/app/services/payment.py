@@ -1,71 +1,100 @@
-from sqlalchemy.orm import Session
-from models import Payment, PaymentStatus, PaymentMethod
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Payment, PaymentStatus, PaymentMethod, Order, Table
 from repository import PaymentRepository
 from typing import List, Optional
 from schemas import PaymentCreateDTO, PaymentResponse 
 from services import OrderService
+from services.revenue import RevenueService
+from core.events import publish_order, publish_table
+from core.etag import collection_versions
+from core.unit_of_work import after_commit
+from services.table_index import table_index
 
 class PaymentService:
     def __init__(self):
         self.repository = PaymentRepository()
+        self.revenue = RevenueService()
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Payment]:
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Payment]:
         """Get all payments with pagination"""
-        return self.repository.get_all(db, skip=skip, limit=limit)
+        return await self.repository.get_all(db, skip=skip, limit=limit, after_id=after_id)
     
-    def get_by_id(self, db: Session, payment_id: int) -> Optional[Payment]:
+    async def get_by_id(self, db: AsyncSession, payment_id: int) -> Optional[Payment]:
         """Get payment by ID"""
-        return self.repository.get_by_id(db, payment_id)
+        return await self.repository.get_by_id(db, payment_id)
     
-    def create(self, db: Session, payment_data: PaymentCreateDTO) -> Payment:
+    async def create(self, db: AsyncSession, payment_data: PaymentCreateDTO) -> Payment:
         """Create new payment"""
         OrderServiceInstance = OrderService()
-        amount = OrderServiceInstance.get_amounts_paid_by_order_id(db, payment_data.order_id)
+        amount = await OrderServiceInstance.get_amounts_paid_by_order_id(db, payment_data.order_id)
         payment = Payment(
             order_id=payment_data.order_id,
             payment_method = payment_data.payment_method,
             amount_paid = amount,
         )
         
-        return self.repository.create(db, payment)
+        return await self.repository.create(db, payment)
     
     
-    def delete(self, db: Session, payment_id: int) -> bool:
+    async def delete(self, db: AsyncSession, payment_id: int) -> bool:
         """Delete payment"""
-        payment = self.repository.get_by_id(db, payment_id)
+        payment = await self.repository.get_for_update(db, payment_id)
         if not payment:
             return False
-        self.repository.delete(db, payment)
+        order = await db.get(Order, payment.order_id)
+        await self.revenue.record_delete(db, payment, order.staff_id if order else None)
+        await self.repository.delete(db, payment)
         return True
     
-    def get_by_order_id(self, db: Session, order_id: int) -> List[Payment]:
+    async def get_by_order_id(self, db: AsyncSession, order_id: int) -> List[Payment]:
         """Get payments by order ID"""
-        return self.repository.find_by_order_id(db, order_id)
+        return await self.repository.find_by_order_id(db, order_id)
     
-    def get_by_status(self, db: Session, status: str) -> List[Payment]:
+    async def get_by_status(self, db: AsyncSession, status: str) -> List[Payment]:
         """Get payments by status"""
-        return self.repository.find_by_status(db, status)
+        return await self.repository.find_by_status(db, status)
     
-    def get_by_transaction_id(self, db: Session, transaction_id: str) -> List[Payment]:
+    async def get_by_transaction_id(self, db: AsyncSession, transaction_id: str) -> List[Payment]:
         """Get payments by transaction ID"""
-        return self.repository.find_by_transaction_id(db, transaction_id)
+        return await self.repository.find_by_transaction_id(db, transaction_id)
     
     
-    def update_payment_status(self , db: Session , payment_id: int , status: PaymentStatus) -> Optional[Payment]:
-        payment = self.repository.update_payment_status(db, payment_id, status)
-        
-        # When payment is completed, free up the table
-        if payment and status == PaymentStatus.completed:
-            from models import Table, Order
-            order = db.query(Order).filter(Order.id == payment.order_id).first()
-            if order:
-                table = db.query(Table).filter(Table.id == order.table_id).first()
-                if table:
-                    table.is_occupied = False
-                    db.add(table)
-                    db.commit()
-        
+    async def update_payment_status(self , db: AsyncSession , payment_id: int , status: PaymentStatus) -> Optional[Payment]:
+        payment = await self.repository.get_for_update(db, payment_id)
+        if not payment:
+            return payment
+
+        old_status = payment.payment_status
+        payment.payment_status = status
+        order = await db.get(Order, payment.order_id)
+        # the revenue rollup and the freed table commit with the payment, at the end of the request
+        await self.revenue.record_change(db, payment, order.staff_id if order else None, old_status)
+        table = None
+        if order and status == PaymentStatus.completed:
+            table = await db.get(Table, order.table_id)
+            if table:
+                table.is_occupied = False
+        await db.flush()
+        await db.refresh(payment)
+
+        if table:
+            after_commit(db, table_index.mark, table)
+            after_commit(db, collection_versions.bump, "tables")
+            after_commit(db, publish_table, table)
+        if order:
+            after_commit(db, publish_order, "payment.updated", order, payment_id=payment.id, payment_status=status.value)
+
         return payment
     
-    def update_payment_method(self , db: Session , payment_id: int , payment_method: PaymentMethod) -> Optional[Payment]:
-        return self.repository.update_payment_method(db, payment_id, payment_method)
\ No newline at end of file
+    async def update_payment_method(self , db: AsyncSession , payment_id: int , payment_method: PaymentMethod) -> Optional[Payment]:
+        payment = await self.repository.get_for_update(db, payment_id)
+        if not payment:
+            return payment
+
+        old_method = payment.payment_method
+        payment.payment_method = payment_method
+        order = await db.get(Order, payment.order_id)
+        await self.revenue.record_change(db, payment, order.staff_id if order else None, payment.payment_status, old_method)
+        await db.flush()
+        await db.refresh(payment)
+        return payment
@@ -1,21 +1,28 @@
-from sqlalchemy.orm import Session
-from models import Reservation
-from typing import List
+from datetime import date, datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Reservation, Table
+from typing import List, Optional
 from repository import ReservationRepository
 from schemas import ReservationCreateDTO, ReservationUpdateDTO
+from core.unit_of_work import savepoint
+
+# Postgres exclusion_violation: reservations_no_overlap rejected the row
+EXCLUSION_VIOLATION = "23P01"
 
 
 class ReservationService:
     def __init__(self):
         self.repository = ReservationRepository()
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Reservation]:
-        return self.repository.get_all(db, skip, limit)
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Reservation]:
+        return await self.repository.get_all(db, skip, limit, after_id)
     
-    def get_by_id(self, db: Session, reservation_id: int) -> Reservation:
-        return self.repository.get_by_id(db, reservation_id)
+    async def get_by_id(self, db: AsyncSession, reservation_id: int) -> Reservation:
+        return await self.repository.get_by_id(db, reservation_id)
     
-    def create(self, db: Session, reservation_data: ReservationCreateDTO) -> Reservation:
+    async def create(self, db: AsyncSession, reservation_data: ReservationCreateDTO) -> Reservation:
+        await self._check_table(db, reservation_data.table_id, reservation_data.number_of_guests)
         reservation = Reservation(
             customer_id=reservation_data.customer_id,
             table_id=reservation_data.table_id,
@@ -26,24 +33,58 @@ class ReservationService:
             special_requests=reservation_data.special_requests,
             created_at=reservation_data.created_at
         )
-        return self.repository.create(db, reservation)
+        return await self._save(db, self.repository.create, reservation)
     
-    def update(self, db: Session, reservation_id: int, reservation_data: ReservationUpdateDTO) -> Reservation:
-        reservation = self.get_by_id(db, reservation_id)
+    async def update(self, db: AsyncSession, reservation_id: int, reservation_data: ReservationUpdateDTO) -> Optional[Reservation]:
+        reservation = await self.get_by_id(db, reservation_id)
+        if not reservation:
+            return None
 
-        for key, value in reservation_data.model_dump(exclude_unset=True).items():
+        changes = reservation_data.model_dump(exclude_unset=True)
+        if "table_id" in changes or "number_of_guests" in changes:
+            await self._check_table(
+                db,
+                changes.get("table_id", reservation.table_id),
+                changes.get("number_of_guests", reservation.number_of_guests)
+            )
+        for key, value in changes.items():
             setattr(reservation, key, value)
         
-        return self.repository.update(db, reservation)
+        return await self._save(db, self.repository.update, reservation)
     
-    def delete(self, db: Session, reservation_id: int) -> bool:
-        reservation = self.get_by_id(db, reservation_id)
+    async def delete(self, db: AsyncSession, reservation_id: int) -> bool:
+        reservation = await self.get_by_id(db, reservation_id)
         if not reservation:
             return False
-        self.repository.delete(db, reservation)
+        await self.repository.delete(db, reservation)
         return True
     
-    def find_by_customer_id(self, db: Session, customer_id: int) -> List[Reservation]:
-        return self.repository.find_by_customer_id(db, customer_id)
+    async def find_by_customer_id(self, db: AsyncSession, customer_id: int) -> List[Reservation]:
+        return await self.repository.find_by_customer_id(db, customer_id)
+    
+    async def find_by_date(self, db: AsyncSession, day: date) -> List[Reservation]:
+        return await self.repository.find_by_date(db, day)
+    
+    async def find_available_tables(self, db: AsyncSession, start: datetime, duration_hours: int, guests: int) -> List[Table]:
+        """Tables that can take `guests` for [start, start + duration_hours), smallest first"""
+        if duration_hours <= 0:
+            raise ValueError("duration must be at least one hour")
+        return await self.repository.find_bookable_tables(db, start, start + timedelta(hours=duration_hours), guests)
+    
+    async def _check_table(self, db: AsyncSession, table_id: int, guests: int) -> None:
+        table = await db.get(Table, table_id)
+        if not table:
+            raise ValueError("Table not found")
+        if table.table_size < guests:
+            raise ValueError(f"Table {table.table_number} seats only {table.table_size}")
     
-    
\ No newline at end of file
+    async def _save(self, db: AsyncSession, save, reservation: Reservation) -> Reservation:
+        # the exclusion constraint decides overlaps, so two concurrent bookings
+        # of one slot can't both succeed
+        try:
+            async with savepoint(db):
+                return await save(db, reservation)
+        except IntegrityError as e:
+            if getattr(e.orig, "sqlstate", None) == EXCLUSION_VIOLATION:
+                raise ValueError("Table is already reserved for that time")
+            raise
@@ -0,0 +1,83 @@
+from datetime import date
+from typing import Iterable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Payment, PaymentStatus, PaymentMethod
+from repository import RevenueRepository
+from repository.revenueRepository import GROUP_COLUMNS
+
+# the statuses a payment is counted under in the rollup
+ROLLUP_STATUSES = (PaymentStatus.completed, PaymentStatus.refunded)
+
+
+class RevenueService:
+    """
+    Revenue reporting from the revenue_daily rollup.
+
+    PaymentService calls record_change in the same transaction as every
+    status or method change, so the rollup moves with the payment; reads
+    never touch payments or orders. rebuild() recomputes a date range from
+    payments for backfills or after editing history by hand.
+    """
+
+    def __init__(self):
+        self.repository = RevenueRepository()
+
+    async def record_change(
+        self,
+        db: AsyncSession,
+        payment: Payment,
+        staff_id: Optional[int],
+        old_status: Optional[PaymentStatus],
+        old_method: Optional[PaymentMethod] = None
+    ) -> None:
+        """Move `payment` from its old status/method bucket to its current one; does not commit"""
+        old_method = old_method or payment.payment_method
+        if old_status == payment.payment_status and old_method == payment.payment_method:
+            return
+        if old_status in ROLLUP_STATUSES:
+            await self._add(db, payment, staff_id, old_status, old_method, -1)
+        if payment.payment_status in ROLLUP_STATUSES:
+            await self._add(db, payment, staff_id, payment.payment_status, payment.payment_method, 1)
+
+    async def record_delete(self, db: AsyncSession, payment: Payment, staff_id: Optional[int]) -> None:
+        """Take a payment that is about to be deleted out of the rollup; does not commit"""
+        if payment.payment_status in ROLLUP_STATUSES:
+            await self._add(db, payment, staff_id, payment.payment_status, payment.payment_method, -1)
+
+    async def _add(self, db: AsyncSession, payment: Payment, staff_id, status, method, sign: int):
+        key = {
+            "day": payment.payment_date.date(),
+            "hour": payment.payment_date.hour,
+            "payment_method": method,
+            "staff_id": staff_id or 0,
+        }
+        if status == PaymentStatus.completed:
+            await self.repository.add(db, key, completed_count=sign, completed_amount=sign * payment.amount_paid)
+        else:
+            await self.repository.add(db, key, refunded_count=sign, refunded_amount=sign * payment.amount_paid)
+
+    async def rebuild(self, db: AsyncSession, since: Optional[date] = None, until: Optional[date] = None) -> int:
+        """Recompute the rollup for [since, until) from payments; returns the number of buckets written"""
+        if since is not None and until is not None and since >= until:
+            raise ValueError("since must be earlier than until")
+        return await self.repository.rebuild(db, since, until)
+
+    async def revenue(
+        self,
+        db: AsyncSession,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        group_by: Iterable[str] = ("day",)
+    ) -> List[dict]:
+        """Completed and refunded totals for days in [since, until), one row per group"""
+        group_by = list(dict.fromkeys(group_by))
+        unknown = [name for name in group_by if name not in GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown group_by: {', '.join(unknown)}")
+        if since is not None and until is not None and since >= until:
+            raise ValueError("since must be earlier than until")
+        rows = await self.repository.get_range(db, since, until, group_by)
+        for row in rows:
+            if "staff" in row:
+                row["staff_id"] = row.pop("staff") or None
+        return rows
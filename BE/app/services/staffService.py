@@ -1,45 +1,47 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import Staff
 from schemas import StaffCreateDTO, StaffUpdateDTO
-from core.security import hash_password
+from core.security import hash_password_async
 from repository import StaffRepository
+from core.etag import collection_versions
+from core.unit_of_work import after_commit
+from core.db_errors import raise_duplicate
+
+# unique constraints on staff, and the 400 each one turns into
+DUPLICATE_MESSAGES = {
+    "staff_username_key": "Username already exists",
+    "staff_email_key": "Email already exists",
+}
 
 
 class StaffService:
     def __init__(self):
         self.repository = StaffRepository()
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Staff]:
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Staff]:
         """Get all staff members with pagination"""
-        return self.repository.get_all(db, skip=skip, limit=limit)
+        return await self.repository.get_all(db, skip=skip, limit=limit, after_id=after_id)
 
-    def get_by_id(self, db: Session, staff_id: int) -> Optional[Staff]:
+    async def get_by_id(self, db: AsyncSession, staff_id: int) -> Optional[Staff]:
         """Get staff member by ID"""
-        return self.repository.get_by_id(db, staff_id)
+        return await self.repository.get_by_id(db, staff_id)
     
-    def get_by_username(self, db: Session, username: str) -> Optional[Staff]:
+    async def get_by_username(self, db: AsyncSession, username: str) -> Optional[Staff]:
         """Get staff member by username"""
-        return self.repository.find_by_username(db, username)
+        return await self.repository.find_by_username(db, username)
     
-    def get_by_email(self, db: Session, email: str) -> Optional[Staff]:
+    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[Staff]:
         """Get staff member by email"""
-        return self.repository.find_by_email(db, email)
+        return await self.repository.find_by_email(db, email)
     
-    def create(self, db: Session, staff_data: StaffCreateDTO) -> Staff:
+    async def create(self, db: AsyncSession, staff_data: StaffCreateDTO) -> Staff:
         """
         Create new staff member with business logic validation.
         """
-        # Business logic: Check if username exists
-        if self.repository.exists_by_username(db, staff_data.username):
-            raise ValueError("Username already exists")
-        
-        # Business logic: Check if email exists
-        if self.repository.exists_by_email(db, staff_data.email):
-            raise ValueError("Email already exists")
-        
         # Business logic: Hash password
-        hashed_password = hash_password(staff_data.password_hashed)
+        hashed_password = await hash_password_async(staff_data.password_hashed)
         
         # Create staff object
         staff = Staff(
@@ -51,40 +53,44 @@ class StaffService:
             role=staff_data.role
         )
         
-        # Delegate to repository
-        return self.repository.create(db, staff)
+        # Delegate to repository; the unique constraints catch taken usernames/emails
+        try:
+            staff = await self.repository.create(db, staff)
+        except IntegrityError as e:
+            raise_duplicate(e, DUPLICATE_MESSAGES)
+        after_commit(db, collection_versions.bump, "staff")
+        return staff
     
-    def delete(self, db: Session, staff_id: int) -> bool:
+    async def delete(self, db: AsyncSession, staff_id: int) -> bool:
         """Delete staff member by ID"""
-        staff = self.repository.get_by_id(db, staff_id)
+        staff = await self.repository.get_by_id(db, staff_id)
         if not staff:
             return False
-        self.repository.delete(db, staff)
+        await self.repository.delete(db, staff)
+        after_commit(db, collection_versions.bump, "staff")
+        # the database drops the member's schedules with them
+        after_commit(db, collection_versions.bump, "staff_schedules")
         return True
 
-    def search_by_name(self, db: Session, full_name: str) -> List[Staff]:
+    async def search_by_name(self, db: AsyncSession, full_name: str) -> List[Staff]:
         """Search staff members by full name"""
-        return self.repository.search_by_name(db, full_name)
+        return await self.repository.search_by_name(db, full_name)
     
-    def count(self, db: Session) -> int:
+    async def count(self, db: AsyncSession) -> int:
         """Count total number of staff members"""
-        return self.repository.count(db)
+        return await self.repository.count(db)
     
-    def update(self, db: Session, staff_id : int , staff_data:StaffUpdateDTO) -> Staff:
-        staff = self.repository.get_by_id(db, staff_id)
+    async def update(self, db: AsyncSession, staff_id : int , staff_data:StaffUpdateDTO) -> Staff:
+        staff = await self.repository.get_by_id(db, staff_id)
         if not staff:
             raise ValueError("Staff member not found")
         
         updated_staff = staff_data.model_dump(exclude_unset=True)
         
-        if "email" in updated_staff:
-            if self.repository.exists_by_email(db, updated_staff["email"]):
-                raise ValueError("Email already exists")
-        
         #hashed password if password is being updated
         # Special handling for password_hashed
         if "password_hashed" in updated_staff:
-            updated_staff["password_hashed"] = hash_password(updated_staff.pop("password_hashed"))
+            updated_staff["password_hashed"] = await hash_password_async(updated_staff.pop("password_hashed"))
 
 
         for key, value in updated_staff.items():
@@ -92,6 +98,11 @@ class StaffService:
 
         print("Updated staff data:", updated_staff)
 
-        return self.repository.update(db, staff)
+        try:
+            staff = await self.repository.update(db, staff)
+        except IntegrityError as e:
+            raise_duplicate(e, DUPLICATE_MESSAGES)
+        after_commit(db, collection_versions.bump, "staff")
+        return staff
 
 
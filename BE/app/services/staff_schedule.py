@@ -1,57 +1,180 @@
-from sqlalchemy.orm import Session
-from models import StaffSchedule, workDay, workShift
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import StaffSchedule, StaffRole, workDay, workShift
 
-from typing import List
+from typing import Iterable, List, Optional
 from repository import StaffScheduleRepository
-from schemas import StaffScheduleCreateDTO, StaffScheduleUpdateDTO
+from core.etag import collection_versions
+from core.unit_of_work import after_commit
+from schemas import StaffScheduleCreateDTO, StaffScheduleUpdateDTO, StaffScheduleDTO
+
+# coverage grids per role filter, tagged with the staff/schedule versions they
+# were built from; any write to either collection (in any worker) retires them
+_coverage_cache = {}
+
 
 class StaffScheduleService:
     def __init__(self):
         self.repository = StaffScheduleRepository()
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[StaffSchedule]:
-        return self.repository.get_all(db, skip, limit)
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[StaffSchedule]:
+        return await self.repository.get_all(db, skip, limit, after_id)
     
-    def get_by_id(self, db: Session, schedule_id: int) -> StaffSchedule:
-        return self.repository.get_by_id(db, schedule_id)
+    async def get_by_id(self, db: AsyncSession, schedule_id: int) -> StaffSchedule:
+        return await self.repository.get_by_id(db, schedule_id)
     
-    def create(self , db: Session, schedule_data: StaffScheduleCreateDTO ) -> StaffSchedule:
+    async def create(self , db: AsyncSession, schedule_data: StaffScheduleCreateDTO ) -> StaffSchedule:
         schedule = StaffSchedule(
             staff_id=schedule_data.staff_id,
             work_day=schedule_data.work_day,
             work_shift=schedule_data.work_shift
         )
-        return self.repository.create(db, schedule)
+        schedule = await self.repository.create(db, schedule)
+        after_commit(db, collection_versions.bump, "staff_schedules")
+        return schedule
     
-    def update_by_id(self, db:Session, schedule_id:int , updated_schedule:StaffScheduleUpdateDTO):
-        return self.repository.update_schedule_by_id(db, schedule_id, updated_schedule)
+    async def update_by_id(self, db:AsyncSession, schedule_id:int , updated_schedule:StaffScheduleUpdateDTO):
+        schedule = await self.repository.update_schedule_by_id(db, schedule_id, updated_schedule)
+        if schedule:
+            after_commit(db, collection_versions.bump, "staff_schedules")
+        return schedule
     
-    def delete(self, db: Session, schedule_id: int) -> bool:
-        schedule = self.repository.get_by_id(db, schedule_id)
+    async def delete(self, db: AsyncSession, schedule_id: int) -> bool:
+        schedule = await self.repository.get_by_id(db, schedule_id)
         if not schedule:
             return False
-        self.repository.delete(db, schedule)
+        await self.repository.delete(db, schedule)
+        after_commit(db, collection_versions.bump, "staff_schedules")
         return True
     
-    def find_by_staff_id(self, db: Session, staff_id: int) -> List[StaffSchedule]:
-        return self.repository.find_by_staff_id(db, staff_id)
+    async def bulk_create(self, db: AsyncSession, entries: List[StaffScheduleDTO]) -> dict:
+        """
+        Add many assignments in one transaction and one INSERT ... ON CONFLICT
+        DO NOTHING. Assignments that already exist are left alone; every entry
+        gets an outcome, in request order.
+        """
+        known = await self.repository.find_existing_staff_ids(db, {e.staff_id for e in entries})
+        results, wanted = self._triage(entries, known)
+        inserted = await self.repository.insert_missing(db, [self._row(key) for key in wanted])
+        for row in inserted:
+            outcome = wanted[(row["staff_id"], row["work_day"], row["work_shift"])]
+            outcome.update(status="created", schedule_id=row["id"])
+        for outcome in wanted.values():
+            if outcome["status"] is None:
+                outcome["status"] = "exists"
+        if inserted:
+            after_commit(db, collection_versions.bump, "staff_schedules")
+        return {"created": len(inserted), "skipped": len(results) - len(inserted), "results": results}
+    
+    async def replace_week(self, db: AsyncSession, entries: List[StaffScheduleDTO], staff_ids: Optional[List[int]] = None) -> dict:
+        """
+        Make the stored rota equal `entries` in one transaction: assignments
+        not listed are deleted, missing ones inserted, the rest kept as they
+        are. With `staff_ids` only those people's weeks are touched.
+        """
+        scope = set(staff_ids) if staff_ids is not None else None
+        known = await self.repository.find_existing_staff_ids(db, {e.staff_id for e in entries})
+        results, wanted = self._triage(entries, known, scope)
+        current = {
+            (schedule.staff_id, schedule.work_day, schedule.work_shift): schedule.id
+            for schedule in await self.repository.find_assignments(db, scope)
+        }
+        deleted = [schedule_id for key, schedule_id in current.items() if key not in wanted]
+        await self.repository.delete_by_ids(db, deleted)
+        missing = [key for key in wanted if key not in current]
+        inserted = await self.repository.insert_missing(db, [self._row(key) for key in missing])
+        for row in inserted:
+            outcome = wanted[(row["staff_id"], row["work_day"], row["work_shift"])]
+            outcome.update(status="created", schedule_id=row["id"])
+        for key, outcome in wanted.items():
+            if outcome["status"] is None:
+                # kept, or added by a concurrent writer between our read and insert
+                outcome.update(status="unchanged", schedule_id=current.get(key))
+        if deleted or inserted:
+            after_commit(db, collection_versions.bump, "staff_schedules")
+        unchanged = len(wanted) - len(inserted)
+        return {
+            "created": len(inserted),
+            "unchanged": unchanged,
+            "skipped": len(results) - len(wanted),
+            "deleted": deleted,
+            "results": results,
+        }
+    
+    def _triage(self, entries: Iterable[StaffScheduleDTO], known_staff: set, scope: Optional[set] = None):
+        """One outcome per entry; returns them plus the distinct writable ones keyed by assignment"""
+        results = []
+        wanted = {}
+        for entry in entries:
+            key = (entry.staff_id, entry.work_day, entry.work_shift)
+            outcome = {"staff_id": entry.staff_id, "work_day": entry.work_day, "work_shift": entry.work_shift, "status": None}
+            if entry.staff_id not in known_staff:
+                outcome["status"] = "unknown_staff"
+            elif scope is not None and entry.staff_id not in scope:
+                outcome["status"] = "out_of_scope"
+            elif key in wanted:
+                outcome["status"] = "duplicate"
+            else:
+                wanted[key] = outcome
+            results.append(outcome)
+        return results, wanted
+    
+    def _row(self, key) -> dict:
+        staff_id, work_day, work_shift = key
+        return {"staff_id": staff_id, "work_day": work_day, "work_shift": work_shift}
+    
+    async def find_by_staff_id(self, db: AsyncSession, staff_id: int) -> List[StaffSchedule]:
+        return await self.repository.find_by_staff_id(db, staff_id)
+    
+    async def find_by_day_and_shift(self, db: AsyncSession, work_day : workDay, work_shift: workShift) -> List[StaffSchedule]:
+        return await self.repository.find_by_day_and_shift(db, work_day, work_shift)
     
-    def find_by_day_and_shift(self, db: Session, work_day : workDay, work_shift: workShift) -> List[StaffSchedule]:
-        return self.repository.find_by_day_and_shift(db, work_day, work_shift)
+    async def find_by_day(self, db: AsyncSession, work_day: workDay) -> List[StaffSchedule]:
+        return await self.repository.find_by_day(db, work_day)
     
-    def find_by_day(self, db: Session, work_day: workDay) -> List[StaffSchedule]:
-        return self.repository.find_by_day(db, work_day)
+    async def find_by_shift(self, db: AsyncSession, work_shift: workShift) -> List[StaffSchedule]:
+        return await self.repository.find_by_shift(db, work_shift)
     
-    def find_by_shift(self, db: Session, work_shift: workShift) -> List[StaffSchedule]:
-        return self.repository.find_by_shift(db, work_shift)
+    async def find_by_staff_and_day(self, db: AsyncSession, staff_id: int, work_day: workDay) -> List[StaffSchedule]:
+        return await self.repository.find_by_staff_and_day(db, staff_id, work_day)
     
-    def find_by_staff_and_day(self, db: Session, staff_id: int, work_day: workDay) -> List[StaffSchedule]:
-        return self.repository.find_by_staff_and_day(db, staff_id, work_day)
+    async def find_by_staff_and_shift(self, db: AsyncSession, staff_id: int, work_shift: workShift) -> List[StaffSchedule]:
+        return await self.repository.find_by_staff_and_shift(db, staff_id, work_shift)
     
-    def find_by_staff_and_shift(self, db: Session, staff_id: int, work_shift: workShift) -> List[StaffSchedule]:
-        return self.repository.find_by_staff_and_shift(db, staff_id, work_shift)
+    async def find_by_staff_day_and_shift(self, db: AsyncSession, staff_id: int, work_day: workDay, work_shift: workShift) -> List[StaffSchedule]:
+        return await self.repository.find_by_staff_and_day_and_shift(db, staff_id, work_day, work_shift)
     
-    def find_by_staff_day_and_shift(self, db: Session, staff_id: int, work_day: workDay, work_shift: workShift) -> List[StaffSchedule]:
-        return self.repository.find_by_staff_and_day_and_shift(db, staff_id, work_day, work_shift)
+    async def coverage_matrix(
+        self,
+        db: AsyncSession,
+        role: Optional[StaffRole] = None,
+        min_staff: int = 1,
+        understaffed_only: bool = False
+    ) -> List[dict]:
+        """
+        The 7-day x 4-shift grid, Monday morning first, with the staff assigned
+        to each cell. A cell is understaffed below `min_staff` people (of
+        `role`, when given).
+        """
+        grid = await self._coverage(db, role)
+        cells = []
+        for cell in grid:
+            understaffed = len(cell["staff"]) < min_staff
+            if understaffed_only and not understaffed:
+                continue
+            cells.append({**cell, "count": len(cell["staff"]), "understaffed": understaffed})
+        return cells
     
-    
\ No newline at end of file
+    async def _coverage(self, db: AsyncSession, role: Optional[StaffRole]) -> List[dict]:
+        versions = (collection_versions.version("staff_schedules"), collection_versions.version("staff"))
+        cached = _coverage_cache.get(role)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+        cells = {(day, shift): [] for day in workDay for shift in workShift}
+        for row in await self.repository.get_coverage(db, role):
+            cells[(row.pop("work_day"), row.pop("work_shift"))].append(row)
+        grid = [
+            {"work_day": day, "work_shift": shift, "staff": staff}
+            for (day, shift), staff in cells.items()
+        ]
+        _coverage_cache[role] = (versions, grid)
+        return grid
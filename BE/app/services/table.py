@@ -1,30 +1,38 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import Table
 from typing import List, Optional
 
 from schemas import TableCreateDTO, TableUpdateDTO, TableResponse
 from repository import TableRepository
+from core.events import publish_table
+from core.etag import collection_versions
+from core.unit_of_work import after_commit
+from services.table_index import table_index
 
 class TableService:
     def __init__(self):
         self.table_repository = TableRepository()
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Table]:
-        return self.table_repository.get_all(db, skip, limit)
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Table]:
+        index = await table_index.get(db)
+        return index.page(skip, limit, after_id)
     
-    def get_by_id(self, db: Session, table_id: int) -> Optional[Table]:
-        return self.table_repository.get_by_id(db, table_id)
+    async def get_by_id(self, db: AsyncSession, table_id: int) -> Optional[Table]:
+        return await self.table_repository.get_by_id(db, table_id)
     
-    def create(self, db: Session, table_create_dto: TableCreateDTO) -> Table:
+    async def create(self, db: AsyncSession, table_create_dto: TableCreateDTO) -> Table:
         table = Table(
             table_number=table_create_dto.table_number,
             table_size=table_create_dto.table_size,
 
         )
-        return self.table_repository.create(db, table)
+        table = await self.table_repository.create(db, table)
+        after_commit(db, table_index.invalidate)
+        after_commit(db, collection_versions.bump, "tables")
+        return table
     
-    def update(self, db: Session, table_id: int, table_update_dto: TableUpdateDTO) -> Optional[Table]:
-        table = self.get_by_id(db, table_id)
+    async def update(self, db: AsyncSession, table_id: int, table_update_dto: TableUpdateDTO) -> Optional[Table]:
+        table = await self.get_by_id(db, table_id)
         updated_table = table_update_dto.model_dump(exclude_unset=True)
         if not table:
             return None
@@ -33,28 +41,47 @@ class TableService:
         for key, value in updated_table.items():
             setattr(table, key, value)
         
-        return self.table_repository.update(db, table)
+        table = await self.table_repository.update(db, table)
+        after_commit(db, table_index.invalidate)
+        after_commit(db, collection_versions.bump, "tables")
+        return table
     
 
-    def delete(self, db: Session, table_id: int) -> bool:
-        table = self.get_by_id(db, table_id)
+    async def delete(self, db: AsyncSession, table_id: int) -> bool:
+        table = await self.get_by_id(db, table_id)
         if not table:
             return False
-        self.table_repository.delete(db, table)
+        await self.table_repository.delete(db, table)
+        after_commit(db, table_index.invalidate)
+        after_commit(db, collection_versions.bump, "tables")
         return True
     
-    def find_by_size(self, db: Session, size: int) -> List[Table]:
-        return self.table_repository.find_by_size(db, size)
+    async def find_by_size(self, db: AsyncSession, size: int) -> List[Table]:
+        return await self.table_repository.find_by_size(db, size)
     
-    def get_available_tables(self, db: Session) -> List[Table]:
-        return self.table_repository.get_available_tables(db)
+    async def get_available_tables(self, db: AsyncSession, min_size: Optional[int] = None) -> List[Table]:
+        """Free tables, smallest first; only those seating at least `min_size` when given"""
+        index = await table_index.get(db)
+        return index.free_at_least(min_size or 0)
     
 
-    def get_sized_available_tables(self, db: Session, size: int) -> List[Table]:
-        return self.table_repository.get_sized_available_tables(db, size)
+    async def get_sized_available_tables(self, db: AsyncSession, size: int) -> List[Table]:
+        index = await table_index.get(db)
+        return index.free_of_size(size)
     
-    def update_table_status(self, db: Session, table_id: int, is_occupied: bool) -> Optional[Table]:
-        return self.table_repository.update_table_status(db, table_id, is_occupied)
+    async def find_best_fit(self, db: AsyncSession, party_size: int) -> Optional[Table]:
+        """Smallest free table that seats `party_size`"""
+        index = await table_index.get(db)
+        return index.best_fit(party_size)
     
-    def get_unavailable_tables(self, db: Session) -> List[Table]:
-        return self.table_repository.get_unavailable_tables(db)
\ No newline at end of file
+    async def update_table_status(self, db: AsyncSession, table_id: int, is_occupied: bool) -> Optional[Table]:
+        table = await self.table_repository.update_table_status(db, table_id, is_occupied)
+        if table:
+            after_commit(db, table_index.mark, table)
+            after_commit(db, collection_versions.bump, "tables")
+            after_commit(db, publish_table, table)
+        return table
+    
+    async def get_unavailable_tables(self, db: AsyncSession) -> List[Table]:
+        index = await table_index.get(db)
+        return index.occupied()
\ No newline at end of file
@@ -0,0 +1,191 @@
+import asyncio
+from bisect import bisect_left
+from dataclasses import dataclass, fields, replace
+from datetime import datetime
+from typing import Iterable, List, Optional
+from core.cache_sync import on_change
+from sqlalchemy.ext.asyncio import AsyncSession
+from repository import TableRepository
+
+
+@dataclass(frozen=True)
+class IndexedTable:
+    id: int
+    table_number: str
+    table_size: int
+    is_occupied: bool
+    created_at: datetime
+
+
+class OccupancyIndex:
+    """
+    Tables ordered by (size, number) with a bitset of the free ones: bit i of
+    `free` is set while tables[i] is free. Tables of one size sit next to each
+    other, so "seats at least N" is every bit from the first table of the
+    smallest size >= N upwards, and the lowest such free bit is the best fit.
+    """
+
+    def __init__(self, tables: Iterable[IndexedTable]):
+        self.tables = sorted(tables, key=lambda t: (t.table_size, t.table_number))
+        self.position = {table.id: i for i, table in enumerate(self.tables)}
+        self.by_id = sorted(self.tables, key=lambda t: t.id)
+        self._ids = [table.id for table in self.by_id]
+        self.sizes = []
+        self.starts = []
+        free = 0
+        for i, table in enumerate(self.tables):
+            if not self.sizes or self.sizes[-1] != table.table_size:
+                self.sizes.append(table.table_size)
+                self.starts.append(i)
+            if not table.is_occupied:
+                free |= 1 << i
+        self.free = free
+
+    def _start(self, size: int) -> int:
+        """Position of the first table that seats `size`"""
+        bucket = bisect_left(self.sizes, size)
+        return self.starts[bucket] if bucket < len(self.starts) else len(self.tables)
+
+    def _tables(self, mask: int) -> List[IndexedTable]:
+        found = []
+        while mask:
+            low = mask & -mask
+            found.append(self.tables[low.bit_length() - 1])
+            mask ^= low
+        return found
+
+    def best_fit(self, size: int) -> Optional[IndexedTable]:
+        start = self._start(size)
+        mask = self.free >> start
+        if not mask:
+            return None
+        return self.tables[start + (mask & -mask).bit_length() - 1]
+
+    def free_at_least(self, size: int) -> List[IndexedTable]:
+        start = self._start(size)
+        return self._tables(self.free >> start << start)
+
+    def free_of_size(self, size: int) -> List[IndexedTable]:
+        start, end = self._start(size), self._start(size + 1)
+        return self._tables(self.free & (((1 << end) - 1) >> start << start))
+
+    def occupied(self) -> List[IndexedTable]:
+        return self._tables(~self.free & ((1 << len(self.tables)) - 1))
+
+    def page(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[IndexedTable]:
+        start = bisect_left(self._ids, after_id + 1) if after_id is not None else skip
+        return self.by_id[start:start + limit]
+
+    def set_occupied(self, table_id: int, is_occupied: bool) -> bool:
+        """Flip one table in place; False when the table isn't indexed"""
+        i = self.position.get(table_id)
+        if i is None:
+            return False
+        table = replace(self.tables[i], is_occupied=is_occupied)
+        self.tables[i] = table
+        self.by_id[bisect_left(self._ids, table_id)] = table
+        if is_occupied:
+            self.free &= ~(1 << i)
+        else:
+            self.free |= 1 << i
+        return True
+
+
+class TableOccupancy:
+    """
+    Per-worker occupancy index, so availability lookups and the /tables/
+    listing every customer screen polls run no SQL.
+
+    Services call mark() after committing an occupancy change. Changes made by
+    other workers arrive through cache_sync and are re-read for just the rows
+    named; anything structural (a table added, removed or resized) rebuilds
+    the whole index.
+    """
+
+    def __init__(self):
+        self.repository = TableRepository()
+        self._index: Optional[OccupancyIndex] = None
+        self._dirty = set()
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self.loads = 0
+        self.refreshes = 0
+
+    async def get(self, db: AsyncSession) -> OccupancyIndex:
+        index = self._index
+        if index is not None and not self._dirty:
+            return index
+        async with self._lock:
+            if self._index is None:
+                return await self._load(db)
+            if self._dirty:
+                await self._refresh(db)
+            return self._index or await self._load(db)
+
+    def mark(self, table) -> None:
+        """Record a committed occupancy change of `table` (a Table row)"""
+        # a load in flight may have read the row before this commit
+        self._generation += 1
+        index = self._index
+        if index is not None and not index.set_occupied(table.id, table.is_occupied):
+            self.invalidate()
+
+    def changed(self, table_id: Optional[int]) -> None:
+        if table_id is None:
+            self.invalidate()
+        else:
+            self._dirty.add(table_id)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._index = None
+        self._dirty.clear()
+
+    async def _load(self, db: AsyncSession) -> OccupancyIndex:
+        generation = self._generation
+        self._dirty.clear()
+        rows = await self.repository.get_occupancy(db)
+        self.loads += 1
+        index = OccupancyIndex(self._entry(row) for row in rows)
+        if generation == self._generation:
+            self._index = index
+        return index
+
+    async def _refresh(self, db: AsyncSession) -> None:
+        table_ids, self._dirty = self._dirty, set()
+        generation = self._generation
+        rows = {row.id: row for row in await self.repository.get_occupancy(db, table_ids)}
+        self.refreshes += 1
+        index = self._index
+        if index is None:
+            return
+        if generation != self._generation:
+            # marked meanwhile; these rows may predate that commit, read them again
+            self._dirty |= table_ids
+            return
+        for table_id in table_ids:
+            row = rows.get(table_id)
+            i = index.position.get(table_id)
+            if row is None or i is None or self._entry(row) != replace(index.tables[i], is_occupied=row.is_occupied):
+                # added, deleted or edited beyond occupancy
+                self._index = None
+                return
+            index.set_occupied(table_id, row.is_occupied)
+
+    def _entry(self, row) -> IndexedTable:
+        return IndexedTable(**{f.name: getattr(row, f.name) for f in fields(IndexedTable)})
+
+    def stats(self) -> dict:
+        index = self._index
+        return {
+            "loaded": index is not None,
+            "tables": len(index.tables) if index else 0,
+            "free": bin(index.free).count("1") if index else 0,
+            "pending_refresh": len(self._dirty),
+            "loads": self.loads,
+            "refreshes": self.refreshes,
+        }
+
+
+table_index = TableOccupancy()
+on_change("tables", table_index.changed)
@@ -1,11 +1,11 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from repository.vip_request_repository import VipRequestRepository
 from models import VipRequestStatus, Customer, CustomerRole
 from schemas.vip_requestDTO import VipRequestCreate, VipRequestUpdate
 from fastapi import HTTPException
 
 class VipRequestService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.repository = VipRequestRepository(db)
         self.db = db # Need direct DB access for Customer Role update or should use CustomerRepository?
                      # Ideally use CustomerRepository but for now direct query or minimal usage.
@@ -13,32 +13,31 @@ class VipRequestService:
                      # Checked list_dir, likely no customer_repo yet? "repository" has 22 children.
                      # Assuming simpler approach first.
 
-    def create_request(self, request_dto: VipRequestCreate):
-        existing = self.repository.get_by_customer_and_status(request_dto.customer_id, VipRequestStatus.pending)
+    async def create_request(self, request_dto: VipRequestCreate):
+        existing = await self.repository.get_by_customer_and_status(request_dto.customer_id, VipRequestStatus.pending)
         if existing:
             raise HTTPException(status_code=400, detail="You already have a pending VIP request.")
-        return self.repository.create(request_dto.customer_id, request_dto.reason)
+        return await self.repository.create(request_dto.customer_id, request_dto.reason)
 
-    def get_requests(self, status: str = None):
-        return self.repository.get_all(status)
+    async def get_requests(self, status: str = None):
+        return await self.repository.get_all(status)
 
-    def update_status(self, request_id: int, update_dto: VipRequestUpdate):
-        vip_request = self.repository.get_by_id(request_id)
+    async def update_status(self, request_id: int, update_dto: VipRequestUpdate):
+        vip_request = await self.repository.get_by_id(request_id)
         if not vip_request:
             raise HTTPException(status_code=404, detail="Request not found")
 
         vip_request.status = update_dto.status
         
-        # Business Logic: If Approved, promote customer
+        # Business Logic: If Approved, promote customer; both commit together with the request
         if update_dto.status == VipRequestStatus.approved:
-            self._promote_customer(vip_request.customer_id)
+            await self._promote_customer(vip_request.customer_id)
 
-        return self.repository.update(vip_request)
+        return await self.repository.update(vip_request)
 
-    def _promote_customer(self, customer_id: int):
+    async def _promote_customer(self, customer_id: int):
         # Ideally use CustomerRepository, but direct update for tight coupling in this feature is OK for now
-        customer = self.db.query(Customer).filter(Customer.id == customer_id).first()
+        customer = await self.db.get(Customer, customer_id)
         if customer:
             customer.role = CustomerRole.vip_customer
             self.db.add(customer)
-            self.db.commit()
@@ -0,0 +1,72 @@
+"""
+Cache coherence across workers: how long a menu change made through one
+worker takes to show up in another worker's cached menu.
+
+Needs a local Postgres and two API processes on the same database, e.g.
+    cd app && uvicorn main:app --port 8000 & uvicorn main:app --port 8001 &
+    python benchmarks/cache_coherence.py --writer http://localhost:8000 --reader http://localhost:8001
+
+Each round changes the price of --item-id through the writer and polls the
+reader until it serves the new price. Without LISTEN/NOTIFY (or with
+CACHE_SYNC_ENABLED=0) the reader never catches up and the round times out.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def reader_price(client: httpx.AsyncClient, url: str, item_id: int):
+    response = await client.get(url + "/menu-items/", params={"limit": 1000})
+    for item in response.json():
+        if item["id"] == item_id:
+            return item["item_price"]
+    return None
+
+
+async def check(args):
+    latencies = []
+    timeouts = 0
+    async with httpx.AsyncClient(timeout=10) as client:
+        original = await reader_price(client, args.writer, args.item_id)
+        if original is None:
+            raise SystemExit(f"menu item {args.item_id} not found")
+
+        for round_no in range(args.rounds):
+            price = round(original + 0.01 * (round_no + 1), 2)
+            # warm the reader's cache with the old value first
+            await reader_price(client, args.reader, args.item_id)
+            start = time.perf_counter()
+            await client.put(f"{args.writer}/menu-items/{args.item_id}", json={"item_price": price})
+            while await reader_price(client, args.reader, args.item_id) != price:
+                if time.perf_counter() - start > args.timeout:
+                    timeouts += 1
+                    break
+                await asyncio.sleep(0.005)
+            else:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await client.put(f"{args.writer}/menu-items/{args.item_id}", json={"item_price": original})
+
+    print({
+        "rounds": args.rounds,
+        "timeouts": timeouts,
+        "p50_ms": round(statistics.median(latencies), 1) if latencies else None,
+        "max_ms": round(max(latencies), 1) if latencies else None,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writer", default="http://localhost:8000")
+    parser.add_argument("--reader", default="http://localhost:8001")
+    parser.add_argument("--item-id", type=int, default=1)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    asyncio.run(check(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
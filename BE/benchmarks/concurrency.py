@@ -0,0 +1,68 @@
+"""
+Throughput benchmark: N concurrent clients hammering read endpoints.
+
+Start the API first (cd app && fastapi run main.py), then:
+    python benchmarks/concurrency.py --clients 200 --requests 5000
+
+Run it once against the old sync build and once against the async build
+to compare requests/second and latency percentiles.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def run_load(send, clients: int, total: int):
+    """Fire `total` calls of `send(client, i)` from `clients` concurrent workers"""
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker(client):
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await send(client, i)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 2),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--paths", nargs="+", default=["/orders/", "/tables/", "/menu-items/", "/payments/"])
+    args = parser.parse_args()
+
+    async def send(client, i):
+        return await client.get(args.url + args.paths[i % len(args.paths)])
+
+    print(asyncio.run(run_load(send, args.clients, args.requests)))
+
+
+if __name__ == "__main__":
+    main()
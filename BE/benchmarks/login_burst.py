@@ -0,0 +1,62 @@
+"""
+Login burst: a shift change where many tablets sign in at once.
+
+Fires --burst concurrent logins for an existing account while a probe keeps
+requesting a cheap endpoint, so you can see whether other traffic stalls
+while bcrypt runs. Start the API first, then:
+    python benchmarks/login_burst.py --username waiter1 --password secret1 --burst 40
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from concurrency import run_load
+
+
+async def probe(url: str, stop: asyncio.Event):
+    latencies = []
+    async with httpx.AsyncClient(timeout=60) as client:
+        while not stop.is_set():
+            start = time.perf_counter()
+            await client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.05)
+    return latencies
+
+
+async def burst(args):
+    body = {"username": args.username, "password": args.password}
+
+    async def send(client, i):
+        return await client.post(args.url + "/auth/login", json=body)
+
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(args.url + args.probe, stop))
+    logins = await run_load(send, args.burst, args.burst)
+    stop.set()
+    probe_latencies = await probe_task
+
+    print("logins:", logins)
+    if probe_latencies:
+        print("probe during burst:", {
+            "requests": len(probe_latencies),
+            "p50_ms": round(statistics.median(probe_latencies), 1),
+            "max_ms": round(max(probe_latencies), 1),
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--burst", type=int, default=40)
+    parser.add_argument("--probe", default="/tables/")
+    asyncio.run(burst(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Registration burst: many sign-ups at once, some of them racing for the same
+username.
+
+Fires --registrations POST /customers/ (or /staff/ with --staff) from
+--clients concurrent workers. Every --dup-every'th request reuses the
+username and email of the request before it, so pairs of duplicates arrive
+together; each pair must produce exactly one 201 and one 400, and no 500s.
+Start the API first, then:
+    python benchmarks/registration_burst.py --registrations 2000 --clients 50
+Run it against the build with the pre-insert COUNT checks and against this
+one to compare. Pass --cleanup to delete the accounts afterwards.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+
+from sqlalchemy import delete
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from db import async_engine  # noqa: E402
+from models import Customer, Staff  # noqa: E402
+from concurrency import run_load  # noqa: E402
+
+
+async def run(args):
+    prefix = f"burst{int(time.time()) % 100000}"
+    path = "/staff/" if args.staff else "/customers/"
+    statuses = Counter()
+
+    def account(i):
+        if args.dup_every and i % args.dup_every == 1:
+            i -= 1
+        return f"{prefix}_{i}"
+
+    async def register(client, i):
+        name = account(i)
+        response = await client.post(args.url + path, json={
+            "username": name,
+            "full_name": "Burst Test",
+            "email": f"{name}@example.com",
+            "password_hashed": "secret1",
+        })
+        statuses[response.status_code] += 1
+        return response
+
+    print("registrations", await run_load(register, args.clients, args.registrations))
+    print("statuses", dict(statuses))
+    expected_duplicates = sum(1 for i in range(args.registrations) if account(i) != f"{prefix}_{i}")
+    print(f"expected 400s: {expected_duplicates}")
+
+    if args.cleanup:
+        model = Staff if args.staff else Customer
+        async with async_engine.begin() as conn:
+            await conn.execute(delete(model).where(model.username.like(f"{prefix}\\_%")))
+        print("removed burst accounts")
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--registrations", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--dup-every", type=int, default=10, help="0 to send only unique accounts")
+    parser.add_argument("--staff", action="store_true", help="register staff instead of customers")
+    parser.add_argument("--cleanup", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Reservation availability with a large booking history.
+
+Seeds --reservations confirmed bookings (tagged 'benchmark') straight into the
+database, spread over the existing tables without overlaps, then times
+GET /reservations/availability for random slots and checks that a booking
+overlapping a seeded one is rejected. Start the API first, then:
+    python benchmarks/reservation_availability.py --reservations 100000 --customer-id 1
+Pass --cleanup to delete the seeded rows afterwards.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import delete, insert, select
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from db import async_engine  # noqa: E402
+from models import Reservation, ReservationStatus, Table  # noqa: E402
+from concurrency import run_load  # noqa: E402
+
+BASE = datetime(2030, 1, 1, 10, 0)
+# each table gets a 2-hour booking every 3 hours
+STEP = timedelta(hours=3)
+BATCH = 5000
+
+
+async def seed(count: int, customer_id: int):
+    async with async_engine.begin() as conn:
+        tables = (await conn.execute(select(Table.id, Table.table_size).order_by(Table.id))).all()
+    if not tables:
+        raise SystemExit("create some tables first")
+    rows = []
+    for i in range(count):
+        table_id, size = tables[i % len(tables)]
+        rows.append({
+            "customer_id": customer_id,
+            "table_id": table_id,
+            "reservation_date": BASE + STEP * (i // len(tables)),
+            "duration_hours": 2,
+            "number_of_guests": size,
+            "status": ReservationStatus.confirmed,
+            "special_requests": "benchmark",
+        })
+    async with async_engine.begin() as conn:
+        for start in range(0, len(rows), BATCH):
+            await conn.execute(insert(Reservation), rows[start:start + BATCH])
+    span = STEP * (count // len(tables) + 1)
+    return tables, span
+
+
+async def cleanup():
+    async with async_engine.begin() as conn:
+        await conn.execute(delete(Reservation).where(Reservation.special_requests == "benchmark"))
+
+
+async def run(args):
+    tables, span = await seed(args.reservations, args.customer_id)
+    print(f"seeded {args.reservations} reservations over {len(tables)} tables")
+    hours = int(span.total_seconds() // 3600)
+
+    async def availability(client, i):
+        start = BASE + timedelta(hours=random.randrange(hours), minutes=random.choice((0, 30)))
+        return await client.get(args.url + "/reservations/availability", params={
+            "start": start.isoformat(), "duration": 2, "guests": random.randint(1, 6),
+        })
+
+    print("availability", await run_load(availability, args.clients, args.requests))
+
+    async with httpx.AsyncClient(timeout=30) as client:
+        table_id, size = tables[0]
+        clash = await client.post(args.url + "/reservations/", json={
+            "customer_id": args.customer_id,
+            "table_id": table_id,
+            "reservation_date": (BASE + timedelta(hours=1)).isoformat(),
+            "duration_hours": 2,
+            "number_of_guests": 1,
+            "status": "confirmed",
+        })
+        print("overlapping insert", clash.status_code, clash.json())
+
+    if args.cleanup:
+        await cleanup()
+        print("removed seeded reservations")
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--reservations", type=int, default=100_000)
+    parser.add_argument("--customer-id", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--cleanup", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -88,6 +88,7 @@ CREATE TABLE IF NOT EXISTS restaurant.payments
     payment_status restaurant.payment_status DEFAULT 'pending'::restaurant.payment_status,
     transaction_id character varying(100) COLLATE pg_catalog."default",
     created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
+    updated_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT payments_pkey PRIMARY KEY (id)
 );
 
@@ -169,6 +170,7 @@ CREATE TABLE IF NOT EXISTS restaurant.tables
     table_size integer NOT NULL,
     is_occupied boolean DEFAULT false,
     created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
+    updated_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT tables_pkey PRIMARY KEY (id),
     CONSTRAINT tables_table_number_key UNIQUE (table_number)
 );
@@ -226,6 +228,10 @@ ALTER TABLE IF EXISTS restaurant.orders
     ON DELETE CASCADE;
 CREATE INDEX IF NOT EXISTS idx_orders_table_id
     ON restaurant.orders(table_id);
+CREATE INDEX IF NOT EXISTS idx_orders_status_order_date
+    ON restaurant.orders(status, order_date);
+CREATE INDEX IF NOT EXISTS idx_orders_customer_order_date
+    ON restaurant.orders(customer_id, order_date DESC);
 
 
 ALTER TABLE IF EXISTS restaurant.payments
@@ -280,4 +286,132 @@ ALTER TABLE IF EXISTS restaurant.vip_requests
     ON UPDATE NO ACTION
     ON DELETE NO ACTION;
 
+-- delta sync (/changes): updated_at on every synced table, the id of the
+-- transaction that last wrote each row (pages are ordered by it), plus tombstones
+ALTER TABLE IF EXISTS restaurant.tables
+    ADD COLUMN IF NOT EXISTS updated_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE IF EXISTS restaurant.payments
+    ADD COLUMN IF NOT EXISTS updated_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP;
+
+ALTER TABLE IF EXISTS restaurant.orders
+    ADD COLUMN IF NOT EXISTS change_xid bigint NOT NULL DEFAULT txid_current();
+ALTER TABLE IF EXISTS restaurant.tables
+    ADD COLUMN IF NOT EXISTS change_xid bigint NOT NULL DEFAULT txid_current();
+ALTER TABLE IF EXISTS restaurant.payments
+    ADD COLUMN IF NOT EXISTS change_xid bigint NOT NULL DEFAULT txid_current();
+ALTER TABLE IF EXISTS restaurant.menu_items
+    ADD COLUMN IF NOT EXISTS change_xid bigint NOT NULL DEFAULT txid_current();
+
+DROP INDEX IF EXISTS restaurant.idx_orders_updated_at;
+DROP INDEX IF EXISTS restaurant.idx_tables_updated_at;
+DROP INDEX IF EXISTS restaurant.idx_payments_updated_at;
+DROP INDEX IF EXISTS restaurant.idx_menu_items_updated_at;
+CREATE INDEX IF NOT EXISTS idx_orders_change_xid
+    ON restaurant.orders(change_xid, id);
+CREATE INDEX IF NOT EXISTS idx_tables_change_xid
+    ON restaurant.tables(change_xid, id);
+CREATE INDEX IF NOT EXISTS idx_payments_change_xid
+    ON restaurant.payments(change_xid, id);
+CREATE INDEX IF NOT EXISTS idx_menu_items_change_xid
+    ON restaurant.menu_items(change_xid, id);
+
+CREATE TABLE IF NOT EXISTS restaurant.deleted_rows
+(
+    id serial NOT NULL,
+    table_name character varying(50) COLLATE pg_catalog."default" NOT NULL,
+    row_id integer NOT NULL,
+    deleted_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
+    change_xid bigint NOT NULL DEFAULT txid_current(),
+    CONSTRAINT deleted_rows_pkey PRIMARY KEY (id)
+);
+ALTER TABLE IF EXISTS restaurant.deleted_rows
+    ADD COLUMN IF NOT EXISTS change_xid bigint NOT NULL DEFAULT txid_current();
+DROP INDEX IF EXISTS restaurant.idx_deleted_rows_table_name_id;
+CREATE INDEX IF NOT EXISTS idx_deleted_rows_table_name_change_xid
+    ON restaurant.deleted_rows(table_name, change_xid, id);
+
+-- worker cache coherence (core/cache_sync.py LISTENs on cache_changes): one
+-- notification per statement naming the ids it changed, or ids null past 100
+-- rows, which makes listeners drop that whole table
+CREATE OR REPLACE FUNCTION restaurant.notify_cache_change() RETURNS trigger AS $$
+DECLARE
+    ids integer[];
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        SELECT array_agg(id) INTO ids FROM (SELECT id FROM old_rows LIMIT 101) AS changed;
+    ELSE
+        SELECT array_agg(id) INTO ids FROM (SELECT id FROM new_rows LIMIT 101) AS changed;
+    END IF;
+    IF ids IS NOT NULL THEN
+        PERFORM pg_notify('cache_changes', json_build_object(
+            'table', TG_TABLE_NAME,
+            'op', TG_OP,
+            'ids', CASE WHEN cardinality(ids) <= 100 THEN ids END
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    watched text;
+BEGIN
+    FOREACH watched IN ARRAY ARRAY['menu_items', 'tables', 'staff', 'staff_schedules'] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS cache_changes ON restaurant.%I', watched);
+        EXECUTE format('DROP TRIGGER IF EXISTS cache_changes_insert ON restaurant.%I', watched);
+        EXECUTE format('DROP TRIGGER IF EXISTS cache_changes_update ON restaurant.%I', watched);
+        EXECUTE format('DROP TRIGGER IF EXISTS cache_changes_delete ON restaurant.%I', watched);
+        EXECUTE format(
+            'CREATE TRIGGER cache_changes_insert AFTER INSERT ON restaurant.%I '
+            'REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT '
+            'EXECUTE FUNCTION restaurant.notify_cache_change()', watched);
+        EXECUTE format(
+            'CREATE TRIGGER cache_changes_update AFTER UPDATE ON restaurant.%I '
+            'REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT '
+            'EXECUTE FUNCTION restaurant.notify_cache_change()', watched);
+        EXECUTE format(
+            'CREATE TRIGGER cache_changes_delete AFTER DELETE ON restaurant.%I '
+            'REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT '
+            'EXECUTE FUNCTION restaurant.notify_cache_change()', watched);
+    END LOOP;
+END $$;
+
+-- dashboard summary (/analytics/summary) reads one period of orders and payments
+CREATE INDEX IF NOT EXISTS idx_orders_order_date
+    ON restaurant.orders(order_date);
+CREATE INDEX IF NOT EXISTS idx_payments_payment_date
+    ON restaurant.payments(payment_date);
+
+-- payments rolled up per day/hour/method/staff for /analytics/revenue; kept in step by the API,
+-- fill it for existing data with: python -m scripts.rebuild_revenue (from the app folder)
+CREATE TABLE IF NOT EXISTS restaurant.revenue_daily
+(
+    day date NOT NULL,
+    hour smallint NOT NULL,
+    payment_method restaurant.payment_method NOT NULL,
+    staff_id integer NOT NULL DEFAULT 0,
+    completed_count integer NOT NULL DEFAULT 0,
+    completed_amount numeric(12, 2) NOT NULL DEFAULT 0.00,
+    refunded_count integer NOT NULL DEFAULT 0,
+    refunded_amount numeric(12, 2) NOT NULL DEFAULT 0.00,
+    updated_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT revenue_daily_pkey PRIMARY KEY (day, hour, payment_method, staff_id)
+);
+
+-- reservation time slots: overlapping pending/confirmed bookings of one table are rejected,
+-- and the GiST index behind the constraint serves /reservations/availability
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+ALTER TABLE IF EXISTS restaurant.reservations
+    ADD COLUMN IF NOT EXISTS slot tsrange
+    GENERATED ALWAYS AS (tsrange(reservation_date, reservation_date + duration_hours * interval '1 hour')) STORED;
+DO $$ BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'reservations_no_overlap') THEN
+        ALTER TABLE restaurant.reservations
+            ADD CONSTRAINT reservations_no_overlap
+            EXCLUDE USING gist (table_id WITH =, slot WITH &&)
+            WHERE (status IN ('pending', 'confirmed'));
+    END IF;
+END $$;
+
 END;
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Shared fixtures.
+
+Unit tests need only the app's requirements. Tests that take `database`,
+`client` or `assert_max_queries` run against a real Postgres: the DB_*
+server from the environment (or app/.env), database TEST_DB_NAME
+(default restaurant_test), whose `restaurant` schema is recreated once per
+run and emptied before each test. They are skipped when it can't be reached.
+"""
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+# set before core.config reads them: never point the suite at a real database,
+# and keep background jobs out of the way
+os.environ["DB_NAME"] = os.getenv("TEST_DB_NAME", "restaurant_test")
+os.environ["CACHE_SYNC_ENABLED"] = "0"
+os.environ["ORDER_TOTAL_RECONCILE_SECONDS"] = "0"
+os.environ["CHANGE_TOMBSTONE_PRUNE_SECONDS"] = "0"
+
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.dialects.postgresql import ExcludeConstraint  # noqa: E402
+from sqlalchemy.exc import DBAPIError, OperationalError  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _without_exclusion_constraint(table) -> None:
+    # reservations_no_overlap needs btree_gist; without it the rest of the
+    # schema is still created and tests of the constraint skip
+    for constraint in [c for c in table.constraints if isinstance(c, ExcludeConstraint)]:
+        table.constraints.discard(constraint)
+    for listener in list(table.dispatch.before_create):
+        event.remove(table, "before_create", listener)
+
+
+@pytest.fixture(scope="session")
+def database():
+    """The sync engine on a freshly created schema; .has_btree_gist tells whether the exclusion constraint exists"""
+    import db
+    from models import Reservation
+
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(text("DROP SCHEMA IF EXISTS restaurant CASCADE"))
+            conn.execute(text("CREATE SCHEMA restaurant"))
+            try:
+                with conn.begin_nested():
+                    conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+                has_btree_gist = True
+            except DBAPIError:
+                has_btree_gist = False
+    except OperationalError as e:
+        pytest.skip(f"test database unavailable: {e.orig}")
+    if not has_btree_gist:
+        _without_exclusion_constraint(Reservation.__table__)
+    db.Base.metadata.create_all(db.engine)
+    db.engine.has_btree_gist = has_btree_gist
+    yield db.engine
+    db.engine.dispose()
+
+
+def _reset(engine) -> None:
+    from db import Base
+    from services.analytics import analytics_service
+    from services.menu_catalog import menu_catalog
+    from services.table_index import table_index
+
+    tables = ", ".join(table.fullname for table in Base.metadata.sorted_tables)
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    # per-worker caches would still hold the previous test's rows
+    menu_catalog.invalidate()
+    table_index.invalidate()
+    analytics_service.invalidate()
+
+
+@pytest.fixture
+def client(database):
+    """TestClient on an emptied database; startup and shutdown run as in production"""
+    from fastapi.testclient import TestClient
+    import main
+
+    _reset(database)
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+class QueryCounter:
+    """Collects every SQL statement an engine sends while it is active"""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine):
+    """Count statements run on `engine` (sync or async) inside the block"""
+    target = getattr(engine, "sync_engine", engine)
+    counter = QueryCounter()
+    event.listen(target, "before_cursor_execute", counter._on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(target, "before_cursor_execute", counter._on_execute)
+
+
+@pytest.fixture
+def assert_max_queries(database):
+    """
+    Pin an endpoint's statement count on the API's async engine:
+
+        with assert_max_queries(1):
+            client.get("/order-items/order/1")
+
+    fails, listing the statements, when the block runs more than that;
+    catches N+1 regressions.
+    """
+    from db import async_engine
+
+    @contextmanager
+    def check(limit: int):
+        with count_queries(async_engine) as counter:
+            yield counter
+        if counter.count > limit:
+            listing = "\n".join(counter.statements)
+            raise AssertionError(f"expected at most {limit} queries, got {counter.count}:\n{listing}")
+
+    return check
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+
+@pytest.fixture
+def orders(client):
+    from db import SessionLocal
+    from models import Customer, Order, OrderStatus, Payment, PaymentStatus, Table
+
+    now = datetime.now()
+    with SessionLocal() as session:
+        customer = Customer(username="guest", password_hashed="x", full_name="Guest", email="guest@example.com")
+        table = Table(table_number="T01", table_size=4, is_occupied=True)
+        paid = Order(customer=customer, table=table, status=OrderStatus.paid, order_date=now)
+        session.add_all([
+            customer, table, Table(table_number="T02", table_size=2), paid,
+            Order(customer=customer, table=table, status=OrderStatus.cancelled, order_date=now),
+            # still open, though placed long before the period
+            Order(customer=customer, table=table, status=OrderStatus.preparing, order_date=now - timedelta(days=90)),
+            Payment(order=paid, amount_paid=Decimal("42.50"), payment_status=PaymentStatus.completed),
+        ])
+        session.commit()
+
+
+def test_summary(client, orders):
+    response = client.get("/analytics/summary", params={"period": "today", "breakdown": ["hour", "payment_method"]})
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["orders"], summary["paid_orders"], summary["cancelled_orders"]) == (2, 1, 1)
+    assert summary["active_orders"] == 1
+    assert (summary["tables"], summary["occupied_tables"]) == (2, 1)
+    assert (summary["revenue"], summary["completed_payments"]) == (42.5, 1)
+    assert sum(row["orders"] for row in summary["by_hour"]) == 2
+
+
+def test_summary_periods(client, orders):
+    assert client.get("/analytics/summary", params={"period": "all"}).json()["orders"] == 3
+    assert client.get("/analytics/summary", params={"period": "decade"}).status_code == 400
@@ -0,0 +1,98 @@
+import csv
+import io
+
+import pytest
+from fastapi import HTTPException
+
+from services import bulk_import
+from services.bulk_import import KINDS, BulkImportService, _records
+
+
+class SerialPool:
+    """Stands in for the hashing process pool"""
+
+    def map(self, fn, items, chunksize=1):
+        return [f"hashed:{item}" for item in items]
+
+
+def stage(kind, text, fmt="csv", skip_invalid=False, pool=None, max_hashed_rows=None):
+    out = io.StringIO()
+    result = {"kind": kind, "rows": 0, "invalid": 0, "errors": []}
+    written = BulkImportService()._stage(
+        KINDS[kind], io.StringIO(text), fmt, csv.writer(out), pool, skip_invalid, result, max_hashed_rows
+    )
+    return written, list(csv.reader(io.StringIO(out.getvalue()))), result
+
+
+def test_csv_records_drop_blank_cells():
+    records = list(_records(io.StringIO("table_number,table_size\nT01,4\nT02,\n"), "csv"))
+    assert records == [(2, {"table_number": "T01", "table_size": "4"}, None), (3, {"table_number": "T02"}, None)]
+
+
+def test_ndjson_records_report_bad_lines():
+    text = '{"table_number": "T01"}\n\nnot json\n[1]\n'
+    records = list(_records(io.StringIO(text), "ndjson"))
+    assert [(line, error is None) for line, _, error in records] == [(1, True), (3, False), (4, False)]
+    assert records[2][2] == "expected a JSON object"
+
+
+def test_stage_writes_rows_in_copy_order_with_defaults():
+    written, rows, result = stage("menu_items", "item_name,item_price\nSoup,4.5\n")
+    assert written == 1 and result["invalid"] == 0
+    assert rows == [["Soup", "food", "4.5", "", "", "True"]]
+
+
+def test_one_invalid_row_stops_writing_but_not_validating():
+    text = "table_number,table_size\nT01,4\nbad,4\nT03,0\nT04,2\n"
+    written, rows, result = stage("tables", text)
+    assert written == 0 and rows == []
+    assert (result["rows"], result["invalid"]) == (4, 2)
+    assert [error["line"] for error in result["errors"]] == [3, 4]
+
+    written, rows, _ = stage("tables", text, skip_invalid=True)
+    assert [row[0] for row in rows] == ["T01", "T04"]
+
+
+def test_passwords_are_hashed_through_the_pool():
+    text = '{"username": "ann", "full_name": "Ann", "email": "ann@example.com", "password_hashed": "secret1"}\n'
+    written, rows, _ = stage("customers", text, fmt="ndjson", pool=SerialPool())
+    assert rows[0][1] == "hashed:secret1" and rows[0][-1] == "regular_customer"
+
+
+def test_hashed_uploads_are_capped():
+    line = '{"username": "u%d", "full_name": "U", "email": "u%d@example.com", "password_hashed": "secret1"}\n'
+    text = "".join(line % (n, n) for n in range(3))
+    with pytest.raises(ValueError, match="limited to 2 rows"):
+        stage("customers", text, fmt="ndjson", pool=SerialPool(), max_hashed_rows=2)
+    assert stage("menu_items", "item_name,item_price\nA,1\nB,1\nC,1\n", max_hashed_rows=2)[0] == 3
+
+
+def test_unknown_kind_and_format():
+    with pytest.raises(ValueError):
+        BulkImportService().run("orders", io.StringIO(""), "csv")
+    with pytest.raises(ValueError):
+        BulkImportService().run("tables", io.StringIO(""), "xml")
+
+
+@pytest.mark.anyio
+async def test_concurrent_uploads_are_refused(monkeypatch):
+    monkeypatch.setattr(bulk_import, "_imports_running", bulk_import.config.IMPORT_MAX_CONCURRENT)
+    with pytest.raises(HTTPException) as error:
+        await BulkImportService().load("tables", io.StringIO(""), "csv")
+    assert error.value.status_code == 503
+
+
+def upload(client, text):
+    response = client.post("/imports/tables", files={"file": ("tables.csv", text, "text/csv")})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_upload_skips_existing_keys(client):
+    assert client.get("/tables/").json() == []
+    first = upload(client, "table_number,table_size\nT01,4\nT02,2\n")
+    assert (first["inserted"], first["skipped"]) == (2, 0)
+    again = upload(client, "table_number,table_size\nT02,2\nT03,6\n")
+    assert (again["inserted"], again["skipped"]) == (1, 1)
+    # the upload dropped this worker's table index
+    assert sorted(table["table_number"] for table in client.get("/tables/").json()) == ["T01", "T02", "T03"]
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+from sqlalchemy import text
+
+from core import config
+from core.pagination import encode_token
+from services.changes import ChangeService, ChangeTokenExpired
+
+
+def token(**position):
+    return encode_token({"s": int(time.time()), **position})
+
+
+def test_position_of_a_first_sync_is_empty():
+    assert ChangeService()._position(None) == {}
+    assert ChangeService()._position("") == {}
+
+
+def test_position_round_trip():
+    since = token(x=10, i=3, dx=9, di=1)
+    assert ChangeService()._position(since)["x"] == 10
+
+
+@pytest.mark.parametrize("since", ["garbage!", encode_token({"x": 1}), token(x="ten", i=1)])
+def test_invalid_tokens(since):
+    with pytest.raises(ValueError, match="Invalid change token"):
+        ChangeService()._position(since)
+
+
+def test_old_tokens_expire():
+    issued = time.time() - config.CHANGE_TOKEN_MAX_AGE_DAYS * 86400 - 60
+    with pytest.raises(ChangeTokenExpired):
+        ChangeService()._position(encode_token({"x": 1, "i": 1, "s": issued}))
+
+
+def sync(client, since=None):
+    response = client.get("/menu-items/changes", params={"since": since} if since else {})
+    assert response.status_code == 200
+    return response.json()
+
+
+def create(client, name):
+    response = client.post("/menu-items/", json={"item_name": name, "item_price": 4.5})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_writes_and_deletes_since_a_token(client):
+    first, second = create(client, "Soup"), create(client, "Tea")
+    full = sync(client)
+    assert [row["id"] for row in full["changes"]] == [first, second]
+    assert full["deleted"] == [] and not full["has_more"]
+
+    client.put(f"/menu-items/{first}", json={"item_price": 5})
+    client.delete(f"/menu-items/{second}")
+    delta = sync(client, full["next_token"])
+    assert [row["id"] for row in delta["changes"]] == [first]
+    assert delta["deleted"] == [second]
+
+    assert sync(client, delta["next_token"])["changes"] == []
+
+
+def test_a_long_transaction_is_delivered_once_it_commits(client, database):
+    with database.connect() as slow:
+        slow.execute(text(
+            "INSERT INTO restaurant.menu_items (item_name, item_type, item_price, is_available) VALUES ('Slow', 'food', 1, true)"
+        ))
+        fast = create(client, "Fast")
+        # the open transaction holds back the watermark, so neither row is out yet
+        before = sync(client)
+        assert before["changes"] == []
+        slow.commit()
+
+    after = sync(client, before["next_token"])
+    assert sorted(row["item_name"] for row in after["changes"]) == ["Fast", "Slow"]
+    assert fast in [row["id"] for row in after["changes"]]
+
+
+def test_expired_token_is_gone(client):
+    stale = encode_token({"s": time.time() - (config.CHANGE_TOKEN_MAX_AGE_DAYS + 1) * 86400})
+    assert client.get("/menu-items/changes", params={"since": stale}).status_code == 410
+    assert client.get("/menu-items/changes", params={"since": "garbage!"}).status_code == 400
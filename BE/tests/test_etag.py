@@ -0,0 +1,45 @@
+from core.etag import CollectionVersions, _parse_if_none_match
+
+
+def test_if_none_match_parsing():
+    assert _parse_if_none_match(None) == set()
+    assert _parse_if_none_match('"a", W/"b" ,*') == {'"a"', '"b"', "*"}
+
+
+def test_version_changes_on_bump():
+    versions = CollectionVersions(["tables"])
+    before = versions.version("tables")
+    versions.bump("tables")
+    assert versions.version("tables") != before
+    assert CollectionVersions(["tables"]).version("tables") != before  # new process, new epoch
+
+
+def get(client, path, etag=None):
+    return client.get(path, headers={"If-None-Match": etag} if etag else {})
+
+
+def test_unchanged_list_is_a_304_without_queries(client, assert_max_queries):
+    first = get(client, "/menu-items/")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    hits = client.get("/internal/etags").json()["menu_items"]["hits"]
+    with assert_max_queries(0):
+        again = get(client, "/menu-items/", etag)
+    assert again.status_code == 304 and again.headers["ETag"] == etag
+    assert client.get("/internal/etags").json()["menu_items"]["hits"] == hits + 1
+    assert get(client, "/menu-items/", f"W/{etag}").status_code == 304
+
+
+def test_each_page_has_its_own_tag(client):
+    etag = get(client, "/tables/").headers["ETag"]
+    other = get(client, "/tables/?limit=5", etag)
+    assert other.status_code == 200 and other.headers["ETag"] != etag
+
+
+def test_a_write_retires_the_tag(client):
+    etag = get(client, "/menu-items/").headers["ETag"]
+    assert client.post("/menu-items/", json={"item_name": "Soup", "item_price": 4.5}).status_code == 201
+    fresh = get(client, "/menu-items/", etag)
+    assert fresh.status_code == 200 and fresh.headers["ETag"] != etag
+    assert [item["item_name"] for item in fresh.json()] == ["Soup"]
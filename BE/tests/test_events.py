@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import pytest
+
+from core.events import RESYNC, EventBus, publish_order
+
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_events_reach_matching_topics_only():
+    bus = EventBus(4)
+    kitchen, table = bus.subscribe(["kitchen"]), bus.subscribe(["table:2"])
+    bus.publish("order.created", {"kitchen", "table:1"}, order_id=1)
+    assert drain(kitchen) == [{"type": "order.created", "order_id": 1}]
+    assert drain(table) == []
+    assert bus.stats()["delivered"] == 1
+
+
+def test_a_slow_subscriber_gets_one_resync_instead_of_its_backlog():
+    bus = EventBus(2)
+    slow, fast = bus.subscribe(["tables"]), bus.subscribe(["tables"])
+    for n in range(3):
+        bus.publish("table.updated", {"tables"}, table_id=n)
+        drain(fast)
+    assert drain(slow) == [RESYNC]
+
+    bus.publish("table.updated", {"tables"}, table_id=9)
+    assert drain(slow) == [{"type": "table.updated", "table_id": 9}]
+    assert bus.stats()["overflows"] == 1
+
+
+def test_unsubscribed_streams_get_nothing():
+    bus = EventBus(2)
+    subscription = bus.subscribe(["kitchen"])
+    bus.unsubscribe(subscription)
+    bus.publish("order.created", {"kitchen"})
+    assert drain(subscription) == [] and bus.stats()["subscribers"] == 0
+
+
+def test_order_topics(monkeypatch):
+    bus = EventBus(4)
+    monkeypatch.setattr("core.events.event_bus", bus)
+    customer, walk_in = bus.subscribe(["customer:7"]), bus.subscribe(["table:3"])
+    publish_order("order.created", SimpleNamespace(id=1, table_id=3, customer_id=7, status="pending"))
+    publish_order("order.created", SimpleNamespace(id=2, table_id=3, customer_id=None, status="pending"))
+    assert [event["order_id"] for event in drain(customer)] == [1]
+    assert [event["order_id"] for event in drain(walk_in)] == [1, 2]
+
+
+@pytest.mark.anyio
+async def test_next_times_out_with_none():
+    subscription = EventBus(1).subscribe(["kitchen"])
+    assert await subscription.next(0.01) is None
+    subscription.offer({"type": "ping"})
+    assert await subscription.next(0.01) == {"type": "ping"}
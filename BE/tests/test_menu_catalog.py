@@ -0,0 +1,42 @@
+from datetime import datetime
+from decimal import Decimal
+
+from services.menu_catalog import CatalogItem, MenuSnapshot
+
+
+def item(id, type="food", available=True):
+    now = datetime(2024, 1, 1)
+    return CatalogItem(id, f"Dish {id}", type, Decimal("5.00"), None, None, available, now, now)
+
+
+def test_snapshot_indexes():
+    snapshot = MenuSnapshot(1, [item(1), item(2, "drink", available=False), item(3, "drink")])
+    assert snapshot.by_id[2].item_name == "Dish 2"
+    assert [i.id for i in snapshot.by_type["drink"]] == [2, 3]
+    assert [i.id for i in snapshot.available] == [1, 3]
+
+
+def create(client, name, available=True):
+    response = client.post("/menu-items/", json={"item_name": name, "item_price": 3, "is_available": available})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def names(response):
+    assert response.status_code == 200
+    return [item["item_name"] for item in response.json()]
+
+
+def test_available_items_come_from_the_catalog(client, assert_max_queries):
+    create(client, "Soup")
+    sold_out = create(client, "Pie", available=False)
+    client.get("/menu-items/available")  # warm the catalog
+
+    with assert_max_queries(0):
+        response = client.get("/menu-items/available")
+    assert names(response) == ["Soup"]
+    assert response.headers["ETag"]
+
+    client.put(f"/menu-items/{sold_out}", json={"is_available": True})
+    assert names(client.get("/menu-items/available")) == ["Soup", "Pie"]
+    assert names(client.get("/menu-items/available", params={"skip": 1})) == ["Pie"]
@@ -0,0 +1,49 @@
+"""The order-item listings load each item's menu item with the rows, not one query per item"""
+from decimal import Decimal
+
+import pytest
+
+ITEMS = 5
+
+
+@pytest.fixture
+def order_id(client):
+    from db import SessionLocal
+    from models import Customer, MenuItem, Order, OrderItem, Table
+
+    with SessionLocal() as session:
+        customer = Customer(username="guest", password_hashed="x", full_name="Guest", email="guest@example.com")
+        table = Table(table_number="T1", table_size=4)
+        menu = [MenuItem(item_name=f"Dish {n}", item_price=Decimal("5.50")) for n in range(ITEMS)]
+        order = Order(customer=customer, table=table)
+        session.add_all([customer, table, order, *menu])
+        session.flush()
+        session.add_all(
+            OrderItem(order_id=order.id, menu_item_id=item.id, quantity=2,
+                      unit_price=item.item_price, subtotal=item.item_price * 2)
+            for item in menu
+        )
+        session.commit()
+        return order.id
+
+
+def test_list_is_one_query(client, order_id, assert_max_queries):
+    with assert_max_queries(1):
+        response = client.get("/order-items/")
+    assert response.status_code == 200
+    assert len(response.json()) == ITEMS
+
+
+def test_cursor_page_is_one_query(client, order_id, assert_max_queries):
+    with assert_max_queries(1):
+        response = client.get("/order-items/", params={"cursor": "", "limit": 2})
+    page = response.json()
+    assert [item["id"] for item in page["items"]] == [1, 2]
+    assert page["next_cursor"]
+
+
+def test_by_order_is_one_query(client, order_id, assert_max_queries):
+    with assert_max_queries(1):
+        response = client.get(f"/order-items/order/{order_id}")
+    assert response.status_code == 200
+    assert sorted(item["item_name"] for item in response.json()) == [f"Dish {n}" for n in range(ITEMS)]
@@ -0,0 +1,92 @@
+"""The running order total follows its lines, also under concurrent edits"""
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+
+@pytest.fixture
+def order(client):
+    from db import SessionLocal
+    from models import Customer, MenuItem, Order, OrderItem, Table
+
+    with SessionLocal() as session:
+        customer = Customer(username="guest", password_hashed="x", full_name="Guest", email="guest@example.com")
+        soup, tea = MenuItem(item_name="Soup", item_price=Decimal("5.50")), MenuItem(item_name="Tea", item_price=Decimal("2.00"))
+        order = Order(customer=customer, table=Table(table_number="T01", table_size=4),
+                      total_amount=Decimal("5.50"), final_amount=Decimal("5.50"))
+        session.add_all([customer, order, soup, tea])
+        session.flush()
+        session.add(OrderItem(order_id=order.id, menu_item_id=soup.id, quantity=1,
+                              unit_price=soup.item_price, subtotal=soup.item_price))
+        session.commit()
+        return {"id": order.id, "soup": soup.id, "tea": tea.id, "line": 1}
+
+
+def total(client, order_id):
+    return Decimal(str(client.get(f"/orders/{order_id}").json()["total_amount"]))
+
+
+def test_added_lines_move_the_total(client, order):
+    added = client.post("/order-items/", json={"order_id": order["id"], "menu_item_id": order["tea"], "quantity": 2})
+    assert added.status_code == 201 and total(client, order["id"]) == Decimal("9.50")
+    # same dish again merges into the line
+    client.post("/order-items/", json={"order_id": order["id"], "menu_item_id": order["tea"], "quantity": 1})
+    assert total(client, order["id"]) == Decimal("11.50")
+
+
+@pytest.fixture
+async def sessions(order):
+    # an engine of the test's own event loop; the app's pool belongs to the TestClient's
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    import db
+
+    engine = create_async_engine(db.ASYNC_DATABASE_URL)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def stored_total(sessions, order_id):
+    from models import Order
+
+    async with sessions() as session:
+        return (await session.get(Order, order_id)).total_amount
+
+
+@pytest.mark.anyio
+async def test_edited_and_deleted_lines_move_the_total(order, sessions):
+    from schemas import OrderItemUpdateDTO
+    from services import OrderItemService
+
+    service = OrderItemService()
+    async with sessions() as session:
+        assert (await service.update(session, order["line"], OrderItemUpdateDTO(quantity=3))).subtotal == Decimal("16.50")
+        assert await service.update(session, 999, OrderItemUpdateDTO(quantity=1)) is None
+        await session.commit()
+    assert await stored_total(sessions, order["id"]) == Decimal("16.50")
+
+    async with sessions() as session:
+        assert await service.delete(session, order["line"])
+        assert not await service.delete(session, 999)
+        await session.commit()
+    assert await stored_total(sessions, order["id"]) == Decimal("0.00")
+
+
+@pytest.mark.anyio
+async def test_concurrent_edits_of_one_line(order, sessions):
+    from schemas import OrderItemUpdateDTO
+    from services import OrderItemService
+
+    service = OrderItemService()
+
+    async def edit(quantity, start, hold):
+        await asyncio.sleep(start)
+        async with sessions() as session:
+            await service.update(session, order["line"], OrderItemUpdateDTO(quantity=quantity))
+            await asyncio.sleep(hold)
+            await session.commit()
+
+    # the second edit starts while the first is still open; without the order
+    # lock it would apply its delta to the subtotal the first one replaced
+    await asyncio.gather(edit(2, 0, 0.3), edit(3, 0.1, 0))
+    assert await stored_total(sessions, order["id"]) == Decimal("16.50")
@@ -0,0 +1,67 @@
+import pytest
+
+SLOT = "2030-05-01T18:00:00"
+
+
+@pytest.fixture
+def tables(client):
+    from db import SessionLocal
+    from models import Customer, Table
+
+    with SessionLocal() as session:
+        session.add(Customer(username="guest", password_hashed="x", full_name="Guest", email="guest@example.com"))
+        session.add_all([Table(table_number="T01", table_size=2), Table(table_number="T02", table_size=4)])
+        session.commit()
+    return {"T01": 1, "T02": 2}
+
+
+def book(client, table_id, start=SLOT, hours=2, guests=2):
+    return client.post("/reservations/", json={
+        "customer_id": 1, "table_id": table_id, "reservation_date": start,
+        "duration_hours": hours, "number_of_guests": guests,
+    })
+
+
+def free(client, start=SLOT, guests=2):
+    response = client.get("/reservations/availability", params={"start": start, "guests": guests})
+    assert response.status_code == 200
+    return [table["table_number"] for table in response.json()]
+
+
+@pytest.mark.parametrize("hours", [0, 13])
+def test_duration_is_bounded(client, tables, hours):
+    assert book(client, tables["T01"], hours=hours).status_code == 422
+
+
+def test_table_must_seat_the_party(client, tables):
+    response = book(client, tables["T01"], guests=3)
+    assert response.status_code == 400 and "seats only 2" in response.json()["detail"]
+
+
+def test_availability_leaves_out_reserved_tables(client, tables):
+    assert free(client) == ["T01", "T02"]
+    assert book(client, tables["T01"]).status_code == 201
+    assert free(client) == ["T02"]
+    assert free(client, start="2030-05-01T19:30:00") == ["T02"]
+    # back-to-back: the slot is [start, start + 2h)
+    assert free(client, start="2030-05-01T20:00:00") == ["T01", "T02"]
+    assert free(client, guests=3) == ["T02"]
+
+
+def test_overlapping_bookings_are_refused(database, client, tables):
+    if not database.has_btree_gist:
+        pytest.skip("btree_gist is not available, reservations_no_overlap was not created")
+    assert book(client, tables["T01"]).status_code == 201
+    overlapping = book(client, tables["T01"], start="2030-05-01T19:00:00")
+    assert overlapping.status_code == 400
+    assert overlapping.json()["detail"] == "Table is already reserved for that time"
+    assert book(client, tables["T01"], start="2030-05-01T20:00:00").status_code == 201
+    assert book(client, tables["T02"], start="2030-05-01T19:00:00").status_code == 201
+
+
+def test_cancelled_bookings_free_the_slot(database, client, tables):
+    if not database.has_btree_gist:
+        pytest.skip("btree_gist is not available, reservations_no_overlap was not created")
+    first = book(client, tables["T01"]).json()["id"]
+    assert client.put(f"/reservations/{first}", json={"status": "cancelled"}).status_code == 200
+    assert book(client, tables["T01"]).status_code == 201
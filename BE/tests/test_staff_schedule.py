@@ -0,0 +1,32 @@
+import pytest
+from pydantic import ValidationError
+
+from models import workDay, workShift
+from schemas import StaffScheduleDTO, StaffScheduleWeekDTO
+from services.staff_schedule import StaffScheduleService
+
+
+def entry(staff_id, day="mon", shift="morning"):
+    return StaffScheduleDTO(staff_id=staff_id, work_day=day, work_shift=shift)
+
+
+def test_triage_gives_every_entry_an_outcome_in_order():
+    entries = [entry(1), entry(2), entry(1), entry(1, shift="evening"), entry(3)]
+    results, wanted = StaffScheduleService()._triage(entries, known_staff={1, 3}, scope={1})
+
+    assert [r["status"] for r in results] == [None, "unknown_staff", "duplicate", None, "out_of_scope"]
+    assert list(wanted) == [(1, workDay.mon, workShift.morning), (1, workDay.mon, workShift.evening)]
+    # the writable outcomes are shared, so filling them in updates the results
+    wanted[(1, workDay.mon, workShift.morning)]["status"] = "created"
+    assert results[0]["status"] == "created"
+
+
+def test_triage_without_scope_writes_every_known_staff_member():
+    results, wanted = StaffScheduleService()._triage([entry(1), entry(2, day="tue")], known_staff={1, 2})
+    assert len(wanted) == 2 and all(r["status"] is None for r in results)
+
+
+def test_an_empty_week_needs_staff_ids():
+    with pytest.raises(ValidationError):
+        StaffScheduleWeekDTO(entries=[])
+    assert StaffScheduleWeekDTO(entries=[], staff_ids=[4]).staff_ids == [4]
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from services.table_index import IndexedTable, OccupancyIndex
+
+
+def table(id, size, occupied=False, number=None):
+    return IndexedTable(id, number or f"T{id}", size, occupied, datetime(2024, 1, 1))
+
+
+def ids(tables):
+    return [t.id for t in tables]
+
+
+def index():
+    # by (size, number): 2-seaters 1, 5; 4-seaters 2 (occupied), 3; 6-seater 4
+    return OccupancyIndex([
+        table(1, 2), table(2, 4, occupied=True), table(3, 4), table(4, 6), table(5, 2),
+    ])
+
+
+def test_best_fit_takes_the_smallest_free_table_that_seats_the_party():
+    occupancy = index()
+    assert occupancy.best_fit(1).id == 1
+    assert occupancy.best_fit(3).id == 3
+    assert occupancy.best_fit(5).id == 4
+    assert occupancy.best_fit(7) is None
+
+
+def test_lookups_by_size():
+    occupancy = index()
+    assert ids(occupancy.free_at_least(3)) == [3, 4]
+    assert ids(occupancy.free_of_size(4)) == [3]
+    assert ids(occupancy.free_of_size(3)) == []
+    assert ids(occupancy.occupied()) == [2]
+
+
+def test_set_occupied_flips_one_table():
+    occupancy = index()
+    assert occupancy.set_occupied(3, True)
+    assert occupancy.best_fit(3).id == 4
+    assert ids(occupancy.occupied()) == [2, 3]
+    assert occupancy.page(0, 10)[2].is_occupied
+
+    assert occupancy.set_occupied(2, False)
+    assert occupancy.best_fit(3).id == 2
+    assert not occupancy.set_occupied(99, True)
+
+
+def test_page_by_offset_and_by_id():
+    occupancy = index()
+    assert ids(occupancy.page(1, 2)) == [2, 3]
+    assert ids(occupancy.page(0, 2, after_id=3)) == [4, 5]
+    assert occupancy.page(0, 2, after_id=5) == []
+
+
+def test_empty_index():
+    occupancy = OccupancyIndex([])
+    assert occupancy.best_fit(2) is None
+    assert occupancy.free_at_least(1) == []
+    assert occupancy.occupied() == []
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from core import dependencies
+from core.dependencies import TokenCache
+from core.security import ALGORITHM, SECRET_KEY
+
+
+def payload(seconds=60, **claims):
+    return {"sub": "1", "role": "staff", "exp": time.time() + seconds, **claims}
+
+
+def test_hit_and_miss():
+    cache = TokenCache(2)
+    assert cache.get("a") is None
+    cache.put("a", payload())
+    assert cache.get("a")["sub"] == "1"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_is_evicted():
+    cache = TokenCache(2)
+    cache.put("a", payload())
+    cache.put("b", payload())
+    cache.get("a")
+    cache.put("c", payload())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_dropped():
+    cache = TokenCache(2)
+    cache.put("a", payload(seconds=-1))
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["size"], stats["misses"], stats["expirations"]) == (0, 1, 1)
+
+
+def test_tokens_without_exp_or_zero_size_are_not_cached():
+    cache = TokenCache(2)
+    cache.put("a", {"sub": "1"})
+    assert cache.get("a") is None
+    disabled = TokenCache(0)
+    disabled.put("a", payload())
+    assert disabled.get("a") is None
+
+
+def test_get_current_user_verifies_once(monkeypatch):
+    monkeypatch.setattr(dependencies, "token_cache", TokenCache(4))
+    token = jwt.encode(payload(), SECRET_KEY, algorithm=ALGORITHM)
+    calls = []
+    decode = jwt.decode
+    monkeypatch.setattr(dependencies.jwt, "decode", lambda *a, **kw: calls.append(1) or decode(*a, **kw))
+
+    user = dependencies.get_current_user(token)
+    user["role"] = "admin"  # callers get a copy, not the cached payload
+    assert dependencies.get_current_user(token)["role"] == "staff"
+    assert len(calls) == 1
+
+    with pytest.raises(HTTPException) as error:
+        dependencies.get_current_user("not a token")
+    assert error.value.status_code == 401
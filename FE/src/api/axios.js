@@ -2,6 +2,8 @@ import axios from 'axios';
 
 const api = axios.create({
     baseURL: 'http://localhost:8000',
+    // repeat array params (?status=a&status=b), the form FastAPI reads as a list
+    paramsSerializer: { indexes: null },
 });
 
 api.interceptors.request.use((config) => {
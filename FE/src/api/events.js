@@ -0,0 +1,27 @@
+import { useEffect } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import api from './axios';
+
+// Keeps the given queries fresh from the server's event stream instead of
+// polling: any change on one of the topics (kitchen, tables, table:<id>,
+// customer:<id>) refetches them.
+export function useLiveUpdates(topics, queryKeys) {
+    const queryClient = useQueryClient();
+    const topicList = topics.join(',');
+    const keyList = JSON.stringify(queryKeys);
+
+    useEffect(() => {
+        const params = new URLSearchParams();
+        topicList.split(',').forEach(topic => params.append('topic', topic));
+        const source = new EventSource(`${api.defaults.baseURL}/events/stream?${params}`);
+
+        const refresh = () => JSON.parse(keyList).forEach(queryKey =>
+            queryClient.invalidateQueries({ queryKey })
+        );
+        source.onmessage = refresh;
+        // EventSource reconnects by itself; refetch to pick up what was missed
+        source.onopen = refresh;
+
+        return () => source.close();
+    }, [topicList, keyList, queryClient]);
+}
@@ -11,49 +11,34 @@ import {
 } from 'lucide-react';
 
 export default function AdminDashboard() {
-    // Fetch Orders
-    const { data: orders = [], isLoading: ordersLoading } = useQuery({
-        queryKey: ['orders'],
+    // Dashboard figures are aggregated by the server
+    const { data: summary, isLoading: summaryLoading } = useQuery({
+        queryKey: ['analytics', 'summary', 'today'],
         queryFn: async () => {
-            const res = await api.get('/orders/');
+            const res = await api.get('/analytics/summary', { params: { period: 'today' } });
             return res.data;
-        }
+        },
+        refetchInterval: 30000
     });
 
-    // Fetch Tables
-    const { data: tables = [], isLoading: tablesLoading } = useQuery({
-        queryKey: ['tables'],
+    // Latest orders only, newest first
+    const { data: orders = [], isLoading: ordersLoading } = useQuery({
+        queryKey: ['orders', 'recent'],
         queryFn: async () => {
-            const res = await api.get('/tables/');
+            const res = await api.get('/orders/query', { params: { limit: 5 } });
             return res.data;
         }
     });
 
-    // Fetch Payments (for revenue)
-    const { data: payments = [], isLoading: paymentsLoading } = useQuery({
-        queryKey: ['payments'],
-        queryFn: async () => {
-            // Assuming GET /payments returns all payments
-            try {
-                const res = await api.get('/payments/');
-                return res.data;
-            } catch (e) {
-                console.error("Failed to fetch payments", e);
-                return [];
-            }
-        }
-    });
-
-    // Calculate Stats
-    const activeOrders = orders.filter(o => o.status !== 'COMPLETED' && o.status !== 'CANCELLED').length;
-    const occupiedTables = tables.filter(t => t.is_occupied).length;
-    const totalRevenue = payments
-        .filter(p => p.payment_status === 'completed')
-        .reduce((sum, p) => sum + p.amount_paid, 0);
+    const totalRevenue = summary?.revenue ?? 0;
+    const activeOrders = summary?.active_orders ?? 0;
+    const occupiedTables = summary?.occupied_tables ?? 0;
+    const totalTables = summary?.tables ?? 0;
+    const ordersToday = summary?.orders ?? 0;
 
     const stats = [
         {
-            label: 'Total Revenue',
+            label: 'Revenue Today',
             value: `$${totalRevenue.toLocaleString()}`,
             icon: DollarSign,
             color: 'text-emerald-600',
@@ -68,21 +53,21 @@ export default function AdminDashboard() {
         },
         {
             label: 'Occupied Tables',
-            value: `${occupiedTables} / ${tables.length}`,
+            value: `${occupiedTables} / ${totalTables}`,
             icon: Utensils,
             color: 'text-blue-600',
             bg: 'bg-blue-100'
         },
         {
             label: 'Total Orders today',
-            value: orders.length, // Simplified for now, really should filter by date
+            value: ordersToday,
             icon: TrendingUp,
             color: 'text-indigo-600',
             bg: 'bg-indigo-100'
         },
     ];
 
-    if (ordersLoading || tablesLoading || paymentsLoading) {
+    if (summaryLoading || ordersLoading) {
         return (
             <div className="flex items-center justify-center h-96">
                 <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-primary"></div>
@@ -130,7 +115,7 @@ export default function AdminDashboard() {
                         </div>
                     ) : (
                         <div className="space-y-4">
-                            {orders.slice(-5).reverse().map(order => (
+                            {orders.map(order => (
                                 <div key={order.id} className="flex items-center justify-between p-4 rounded-xl bg-gray-50 hover:bg-gray-100 transition-colors">
                                     <div className="flex items-center gap-4">
                                         <div className="p-2 bg-white rounded-lg border border-gray-200">
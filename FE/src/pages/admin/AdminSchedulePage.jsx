@@ -19,11 +19,11 @@ export default function AdminSchedulePage() {
 
     const queryClient = useQueryClient();
 
-    // Fetch Schedules
-    const { data: schedules = [], isLoading: schedulesLoading } = useQuery({
-        queryKey: ['schedules'],
+    // Fetch the week coverage grid (one cell per day and shift, staff included)
+    const { data: matrix = [], isLoading: schedulesLoading } = useQuery({
+        queryKey: ['schedules', 'matrix'],
         queryFn: async () => {
-            const res = await api.get('/staff-schedules/');
+            const res = await api.get('/staff-schedules/matrix');
             return res.data;
         }
     });
@@ -185,8 +185,8 @@ export default function AdminSchedulePage() {
                             /* Group by Shift */
                             <div className="space-y-6">
                                 {SHIFTS.map(shift => {
-                                    // Filter schedules for current day and shift
-                                    const currentSchedules = schedules.filter(s => s.work_day === selectedDay && s.work_shift === shift);
+                                    const cell = matrix.find(c => c.work_day === selectedDay && c.work_shift === shift);
+                                    const currentSchedules = cell ? cell.staff : [];
 
                                     return (
                                         <div key={shift} className="border-b border-gray-100 pb-4 last:border-0 last:pb-0">
@@ -200,15 +200,12 @@ export default function AdminSchedulePage() {
                                             ) : (
                                                 <div className="flex flex-wrap gap-3 pl-4">
                                                     {currentSchedules.map(schedule => {
-                                                        const staffMember = staffList.find(s => s.id === schedule.staff_id);
-                                                        const staffName = staffMember ? staffMember.full_name : `Staff #${schedule.staff_id}`;
-
                                                         return (
-                                                            <div key={schedule.id} className={`flex items-center gap-2 px-3 py-1.5 rounded-lg border ${getShiftColor(shift)}`}>
+                                                            <div key={schedule.schedule_id} className={`flex items-center gap-2 px-3 py-1.5 rounded-lg border ${getShiftColor(shift)}`}>
                                                                 <User className="w-3 h-3 opacity-50" />
-                                                                <span className="text-sm font-medium">{staffName}</span>
+                                                                <span className="text-sm font-medium">{schedule.full_name}</span>
                                                                 <button
-                                                                    onClick={() => handleDelete(schedule.id)}
+                                                                    onClick={() => handleDelete(schedule.schedule_id)}
                                                                     className="ml-1 p-0.5 hover:bg-black/10 rounded"
                                                                 >
                                                                     <XCircle className="w-3 h-3" />
@@ -25,15 +25,15 @@ export default function CustomerCartPage() {
     const { data: activeOrder } = useQuery({
         queryKey: ['myActiveOrder'],
         queryFn: async () => {
-            // In a real app, endpoint should be /orders/active/me
-            // Here we fetch all and filter client side for demo
-            const res = await api.get('/orders/');
-            const myOrders = res.data.filter(o => o.customer_id === user.id);
-            // Find most recent active order
-            const active = myOrders
-                .sort((a, b) => new Date(b.created_at) - new Date(a.created_at))
-                .find(o => o.status !== 'paid' && o.status !== 'cancelled' && o.status !== 'completed');
-            return active || null;
+            // Most recent order of mine that is still open
+            const res = await api.get('/orders/query', {
+                params: {
+                    customer_id: user.id,
+                    status: ['pending', 'preparing', 'ready', 'served'],
+                    limit: 1
+                }
+            });
+            return res.data[0] || null;
         }
     });
 
@@ -49,31 +49,28 @@ export default function CustomerCartPage() {
 
     const placeOrderMutation = useMutation({
         mutationFn: async () => {
-            let orderId = activeOrder?.id;
-
-            // 1. If NO active order, create one
-            if (!orderId) {
-                if (!selectedTable) throw new Error("Please select a table.");
-
-                const orderRes = await api.post('/orders/', {
-                    customer_id: user.id,
-                    table_id: parseInt(selectedTable),
-                    staff_id: null,
-                    notes: 'Customer mobile order'
-                });
-                orderId = orderRes.data.id;
+            const items = cart.map((cartItem) => ({
+                menu_item_id: cartItem.item.id,
+                quantity: cartItem.quantity,
+                special_instructions: cartItem.notes || null
+            }));
+
+            // Append to the active order, all lines in one request
+            if (activeOrder?.id) {
+                await api.post(`/orders/${activeOrder.id}/items:batch`, { items });
+                return activeOrder.id;
             }
 
-            // 2. Add Items
-            for (const cartItem of cart) {
-                await api.post('/order-items/', {
-                    order_id: orderId,
-                    menu_item_id: cartItem.item.id,
-                    quantity: cartItem.quantity,
-                    notes: cartItem.notes || ''
-                });
-            }
-            return orderId;
+            // Otherwise create the order together with its items
+            if (!selectedTable) throw new Error("Please select a table.");
+            const orderRes = await api.post('/orders/with-items', {
+                customer_id: user.id,
+                table_id: parseInt(selectedTable),
+                staff_id: null,
+                notes: 'Customer mobile order',
+                items
+            });
+            return orderRes.data.id;
         },
         onSuccess: () => {
             clearCart();
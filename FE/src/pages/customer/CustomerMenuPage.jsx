@@ -12,16 +12,14 @@ export default function CustomerMenuPage() {
     const { addToCart } = useCart();
 
     // Fetch Menu
-    const { data: menuItems = [], isLoading } = useQuery({
-        queryKey: ['menuItems'],
+    const { data: availableItems = [], isLoading } = useQuery({
+        queryKey: ['menuItems', 'available'],
         queryFn: async () => {
-            const res = await api.get('/menu-items/');
-            return res.data; // Filter by is_available?
+            const res = await api.get('/menu-items/available');
+            return res.data;
         }
     });
 
-    const availableItems = menuItems.filter(item => item.is_available);
-
     const filteredMenu = availableItems.filter(item => {
         const matchesType = selectedCategory === 'ALL' || item.item_type === selectedCategory;
         const matchesSearch = item.item_name.toLowerCase().includes(searchQuery.toLowerCase());
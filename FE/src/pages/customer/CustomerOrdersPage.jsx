@@ -13,14 +13,14 @@ export default function CustomerOrdersPage() {
     const { data: allOrders = [], isLoading } = useQuery({
         queryKey: ['myOrders'],
         queryFn: async () => {
-            // Filter logic client side for demo
-            const res = await api.get('/orders/');
+            const res = await api.get('/orders/query', {
+                params: { customer_id: user.id, limit: 500 }
+            });
             return res.data;
         }
     });
 
     const myOrders = allOrders
-        .filter(o => o.customer_id === user.id)
         .sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
 
     // Calculate Total Spent (only paid or completed)
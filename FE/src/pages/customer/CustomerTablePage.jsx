@@ -1,5 +1,6 @@
 import { useQuery } from '@tanstack/react-query';
 import api from '../../api/axios';
+import { useLiveUpdates } from '../../api/events';
 import { Users, UtensilsCrossed } from 'lucide-react';
 
 export default function CustomerTablePage() {
@@ -8,9 +9,9 @@ export default function CustomerTablePage() {
         queryFn: async () => {
             const res = await api.get('/tables/');
             return res.data;
-        },
-        refetchInterval: 10000 // Auto-refresh to see availability
+        }
     });
+    useLiveUpdates(['tables'], [['tables']]);
 
     if (isLoading) return <div className="text-center py-20">Loading tables...</div>;
 
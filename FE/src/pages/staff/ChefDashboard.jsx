@@ -1,5 +1,6 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import api from '../../api/axios';
+import { useLiveUpdates } from '../../api/events';
 import {
     ChefHat,
     Clock,
@@ -16,11 +17,13 @@ export default function ChefDashboard() {
     const { data: orders = [], isLoading } = useQuery({
         queryKey: ['orders'],
         queryFn: async () => {
-            const res = await api.get('/orders/');
+            const res = await api.get('/orders/query', {
+                params: { status: ['pending', 'preparing'] }
+            });
             return res.data;
-        },
-        refetchInterval: 10000 // Refresh every 10s
+        }
     });
+    useLiveUpdates(['kitchen'], [['orders'], ['orderItems']]);
 
     // Filter for Chef relevant active orders
     const activeOrders = orders.filter(o =>
@@ -1,6 +1,7 @@
 import { useNavigate } from 'react-router-dom';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import api from '../../api/axios';
+import { useLiveUpdates } from '../../api/events';
 import { Clock, DollarSign, Utensils, ArrowRight, CheckCircle } from 'lucide-react';
 
 export default function WaiterActiveOrdersPage() {
@@ -10,11 +11,11 @@ export default function WaiterActiveOrdersPage() {
     const { data: orders = [], isLoading } = useQuery({
         queryKey: ['activeOrders'], // Keeping key name for consistency or cache
         queryFn: async () => {
-            const res = await api.get('/orders/');
+            const res = await api.get('/orders/query', { params: { limit: 200 } });
             return res.data;
-        },
-        refetchInterval: 10000
+        }
     });
+    useLiveUpdates(['kitchen'], [['activeOrders']]);
 
     // Sort by newest first, show ALL orders as requested
     const allOrders = orders.sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
@@ -63,31 +63,27 @@ export default function WaiterOrderEntry() {
     // Create Order Mutation (New or Update)
     const placeOrderMutation = useMutation({
         mutationFn: async (orderData) => {
-            let workingOrderId = existingOrderId;
+            const items = orderData.items.map((cartItem) => ({
+                menu_item_id: cartItem.item.id,
+                quantity: cartItem.quantity,
+                special_instructions: cartItem.notes || null
+            }));
 
-            // 1. If NO existing order, create one (POST /orders/)
-            if (!workingOrderId) {
-                const orderRes = await api.post('/orders/', {
-                    customer_id: orderData.customer_id,
-                    table_id: parseInt(tableId),
-                    staff_id: user.id,
-                    notes: 'Created by waiter'
-                });
-                workingOrderId = orderRes.data.id;
+            // 1. Existing order: add all new items in one request
+            if (existingOrderId) {
+                await api.post(`/orders/${existingOrderId}/items:batch`, { items });
+                return existingOrderId;
             }
 
-            // 2. Add New Items (POST /order-items/)
-            // We iterate and post each item. 
-            for (const cartItem of orderData.items) {
-                await api.post('/order-items/', {
-                    order_id: workingOrderId,
-                    menu_item_id: cartItem.item.id,
-                    quantity: cartItem.quantity,
-                    notes: cartItem.notes || ''
-                });
-            }
-
-            return workingOrderId;
+            // 2. New order: create it together with its items
+            const orderRes = await api.post('/orders/with-items', {
+                customer_id: orderData.customer_id,
+                table_id: parseInt(tableId),
+                staff_id: user.id,
+                notes: 'Created by waiter',
+                items
+            });
+            return orderRes.data.id;
         },
         onSuccess: () => {
             alert(existingOrderId ? 'Items added to order!' : 'Order placed successfully!');